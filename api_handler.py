@@ -1,16 +1,116 @@
-import requests
+import random
 import threading
-from typing import Optional, Callable, Dict
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Optional, Callable, Deque, Dict, List, Set, Tuple
 from exceptions import APIError
+from quote_cache import QuoteCache
+
+if TYPE_CHECKING:
+    # requests and concurrent.futures are slow to import, so they are only loaded once a quote
+    # is actually fetched
+    from concurrent.futures import Future, ThreadPoolExecutor
+    import requests
+
+DEFAULT_QUOTE_APIS = [
+    "https://zenquotes.io/api/random",
+    "https://api.quotable.io/random"
+]
+
+# Weight of the newest sample in each endpoint's moving-average latency
+LATENCY_SMOOTHING = 0.3
+# Recent successful latencies kept per endpoint for the hedge deadline
+LATENCY_SAMPLES = 50
+# Hedge deadline for an endpoint with no latency samples yet
+DEFAULT_HEDGE_DELAY = 1.0
+
+# How _fetch_quote tries the endpoints: one after another, all at once, or one at a time with
+# the next started once the current one runs past its usual latency (see hedge_delay)
+FETCH_MODES = ('sequential', 'race', 'hedge')
+
+class CircuitBreaker:
+    
+    # Opens after ``failure_threshold`` failures in a row, so the endpoint is skipped instead of
+    # waited on. After ``reset_timeout`` seconds it lets a single trial request through
+    # (half-open): a success closes it, a failed trial opens it again for twice as long, up to
+    # ``max_reset_timeout``. Failures of requests that were not the trial, such as ones still in
+    # flight when it opened, do not push recovery back.
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, max_reset_timeout: float = 600.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._open_for = reset_timeout
+        # Thread running the half-open trial, if one is out
+        self._trial: Optional[int] = None
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            return 'open' if time.monotonic() < self._opened_at + self._open_for else 'half-open'
+    
+    def allow(self) -> bool:
+        # Call right before the request, on the thread that reports its outcome: when half-open
+        # this claims the one trial, and callers after it are refused until it reports back
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial is not None or time.monotonic() < self._opened_at + self._open_for:
+                return False
+            self._trial = threading.get_ident()
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._open_for = self.reset_timeout
+            self._trial = None
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is None:
+                if self._failures >= self.failure_threshold:
+                    self._opened_at = time.monotonic()
+            elif self._trial == threading.get_ident():
+                self._trial = None
+                self._open_for = min(self._open_for * 2, self.max_reset_timeout)
+                self._opened_at = time.monotonic()
 
 class APIHandler:
     
-    def __init__(self):
-        self.quote_apis = [
-            "https://zenquotes.io/api/random",
-            "https://api.quotable.io/random"
-        ]
-        self.timeout = 5
+    # One pooled requests.Session serves every call, so repeat requests reuse keep-alive
+    # connections instead of paying a new TCP and TLS handshake. Endpoints are tried fastest
+    # first by their recorded latency, where a failure counts as a full timeout; hedge deadlines
+    # only look at successful requests. With a
+    # ``cache_filename`` quotes are prefetched in the background and served without waiting.
+    # Each endpoint has a CircuitBreaker, and endpoints it has opened are not tried at all.
+    # The session (and requests itself) is only set up by the first fetch.
+    
+    def __init__(self, quote_apis: Optional[List[str]] = None, connect_timeout: float = 3.05,
+                 read_timeout: float = 5, pool_size: int = 4, session: Optional['requests.Session'] = None,
+                 cache_filename: Optional[str] = None, cache_size: int = 20, fetch_mode: str = "sequential",
+                 hedge_percentile: float = 0.9):
+        if fetch_mode not in FETCH_MODES:
+            raise APIError(f"Unknown fetch mode: {fetch_mode}")
+        self.quote_apis = list(quote_apis or DEFAULT_QUOTE_APIS)
+        # (connect, read) as requests takes it
+        self.timeout = (connect_timeout, read_timeout)
+        self._session = session
+        self.fetch_mode = fetch_mode
+        self.hedge_percentile = hedge_percentile
+        self.latencies: Dict[str, float] = {}
+        self._samples: Dict[str, Deque[float]] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._latency_lock = threading.Lock()
+        self._pool_size = pool_size
+        self._executor: Optional['ThreadPoolExecutor'] = None
         self.fallback_quotes = [
             "The way to get started is to quit talking and begin doing. - Walt Disney",
             "Innovation distinguishes between a leader and a follower. - Steve Jobs",
@@ -19,8 +119,18 @@ class APIHandler:
             "It is during our darkest moments that we must focus to see the light. - Aristotle",
             "Success is not final, failure is not fatal: it is the courage to continue that counts. - Winston Churchill"
         ]
+        self.cache = QuoteCache(self._fetch_quote, cache_filename, cache_size) if cache_filename else None
     
     def get_motivational_quote(self, callback: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        if self.cache is not None:
+            # Served from the cache, or a fallback while it is empty; the callback runs right away
+            # on the calling thread
+            quote = self.cache.take() or random.choice(self.fallback_quotes)
+            if callback:
+                callback(quote)
+                return None
+            return quote
+        
         if callback:
             thread = threading.Thread(target=self._async_get_quote, args=(callback,))
             thread.daemon = True
@@ -30,35 +140,162 @@ class APIHandler:
             return self._get_quote_sync()
     
     def _get_quote_sync(self) -> str:
-        for api_url in self.quote_apis:
-            try:
-                response = requests.get(api_url, timeout=self.timeout)
-                response.raise_for_status()
-                
-                quote_data = response.json()
-                quote_text = self._parse_quote_response(quote_data, api_url)
-                
+        # Fallback quote if all APIs fail
+        return self._fetch_quote() or random.choice(self.fallback_quotes)
+    
+    def _fetch_quote(self) -> Optional[str]:
+        # None at once when every endpoint's breaker is open
+        endpoints = [api_url for api_url in self.endpoints_by_latency() if self.breaker(api_url).state != 'open']
+        if self.fetch_mode == 'sequential':
+            for api_url in endpoints:
+                quote_text = self._fetch_from(api_url)
                 if quote_text:
                     return quote_text
-                    
-            except Exception as e:
-                continue
+            return None
+        return self._fetch_staggered(endpoints, hedge=self.fetch_mode == 'hedge')
+    
+    def _fetch_from(self, api_url: str) -> Optional[str]:
+        breaker = self.breaker(api_url)
+        if not breaker.allow():
+            # Opened meanwhile, or another request is the half-open trial
+            return None
+        try:
+            response, seconds = self._get(api_url)
+            response.raise_for_status()
+            
+            quote_data = response.json()
+            quote_text = self._parse_quote_response(quote_data, api_url)
+            
+            if quote_text:
+                self.record_latency(api_url, seconds)
+                breaker.record_success()
+                return quote_text
+        except Exception as e:
+            pass
+        self.record_failure(api_url)
+        return None
+    
+    def _fetch_staggered(self, endpoints: List[str], hedge: bool) -> Optional[str]:
+        # Starts the endpoints in order on the pool: racing starts them all at once, hedging
+        # starts the next one when the running ones fail or outlast the last one's hedge delay.
+        # The first quote wins; requests not yet sent are cancelled and answers still in flight
+        # are dropped (they only update the latency and breaker records).
+        from concurrent.futures import FIRST_COMPLETED, wait
         
-        # Fallback quote if all APIs fail
-        import random
-        return random.choice(self.fallback_quotes)
+        executor = self._get_executor()
+        remaining = list(endpoints)
+        pending: Set['Future'] = set()
+        try:
+            while remaining or pending:
+                delay = None
+                if remaining:
+                    api_url = remaining.pop(0)
+                    pending.add(executor.submit(self._fetch_from, api_url))
+                    if remaining:
+                        delay = self.hedge_delay(api_url) if hedge else 0
+                done, pending = wait(pending, timeout=delay, return_when=FIRST_COMPLETED)
+                for future in done:
+                    quote_text = future.result()
+                    if quote_text:
+                        return quote_text
+        finally:
+            for future in pending:
+                future.cancel()
+        return None
     
     def _async_get_quote(self, callback: Callable[[str], None]):
         try:
             quote = self._get_quote_sync()
             callback(quote)
         except Exception as e:
-            import random
             callback(random.choice(self.fallback_quotes))
     
+    def breaker(self, api_url: str) -> CircuitBreaker:
+        with self._latency_lock:
+            breaker = self.breakers.get(api_url)
+            if breaker is None:
+                breaker = self.breakers[api_url] = CircuitBreaker()
+            return breaker
+    
+    def hedge_delay(self, api_url: str) -> float:
+        # The endpoint's ``hedge_percentile`` latency over its recent successful requests
+        with self._latency_lock:
+            samples = sorted(self._samples.get(api_url, ()))
+        if not samples:
+            return DEFAULT_HEDGE_DELAY
+        return samples[min(int(len(samples) * self.hedge_percentile), len(samples) - 1)]
+    
+    def endpoints_by_latency(self) -> List[str]:
+        # Fastest first; endpoints not measured yet go first, in configured order, to get measured
+        with self._latency_lock:
+            latencies = dict(self.latencies)
+        order = {api_url: index for index, api_url in enumerate(self.quote_apis)}
+        return sorted(self.quote_apis, key=lambda api_url: (latencies.get(api_url, 0.0), order[api_url]))
+    
+    def record_latency(self, api_url: str, seconds: float):
+        # A successful request
+        with self._latency_lock:
+            self._smooth_latency(api_url, seconds)
+            self._samples.setdefault(api_url, deque(maxlen=LATENCY_SAMPLES)).append(seconds)
+    
+    def record_failure(self, api_url: str):
+        # Errors and unusable answers count as a full timeout in the ranking, pushing the
+        # endpoint back, but stay out of the hedge samples
+        with self._latency_lock:
+            self._smooth_latency(api_url, sum(self.timeout))
+        self.breaker(api_url).record_failure()
+    
+    def _smooth_latency(self, api_url: str, seconds: float):
+        previous = self.latencies.get(api_url)
+        if previous is None:
+            self.latencies[api_url] = seconds
+        else:
+            self.latencies[api_url] = previous + LATENCY_SMOOTHING * (seconds - previous)
+    
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._latency_lock:
+            if self._session is not None:
+                self._session.close()
+    
+    def _get_executor(self) -> 'ThreadPoolExecutor':
+        from concurrent.futures import ThreadPoolExecutor
+        
+        with self._latency_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._pool_size, thread_name_prefix="quote-fetch")
+            return self._executor
+    
+    @property
+    def session(self) -> 'requests.Session':
+        with self._latency_lock:
+            if self._session is None:
+                self._session = self._create_session(self._pool_size)
+            return self._session
+    
+    def _create_session(self, pool_size: int) -> 'requests.Session':
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    def _get(self, api_url: str) -> Tuple['requests.Response', float]:
+        # The response and the seconds it took
+        start = time.perf_counter()
+        response = self.session.get(api_url, timeout=self.timeout)
+        return response, time.perf_counter() - start
+    
     def _parse_quote_response(self, data, api_url: str) -> Optional[str]:
+        # Recognized by the shape of the payload, so mirrors and local test servers parse too
         try:
-            if "zenquotes.io" in api_url:
+            if "zenquotes.io" in api_url or isinstance(data, list):
                 if isinstance(data, list) and len(data) > 0:
                     quote = data[0].get('q', '')
                     author = data[0].get('a', '')
@@ -66,7 +303,7 @@ class APIHandler:
                         return f"{quote} - {author}"
                     return quote
             
-            elif "quotable.io" in api_url:
+            elif "quotable.io" in api_url or isinstance(data, dict):
                 if isinstance(data, dict):
                     quote = data.get('content', '')
                     author = data.get('author', '')
@@ -83,8 +320,13 @@ class APIHandler:
         results = {}
         for api_url in self.quote_apis:
             try:
-                response = requests.get(api_url, timeout=self.timeout)
+                response, seconds = self._get(api_url)
                 results[api_url] = response.status_code == 200
             except Exception:
                 results[api_url] = False
+            if results[api_url]:
+                self.record_latency(api_url, seconds)
+                self.breaker(api_url).record_success()
+            else:
+                self.record_failure(api_url)
         return results
\ No newline at end of file
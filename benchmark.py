@@ -0,0 +1,366 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from task_manager import Task, TaskManager
+from task_table import TaskTable
+from task_formats import FORMATS, iter_records, write_records
+from durability import DURABILITY_LEVELS, snapshot_file
+from file_handler import FileHandler, JournalFileHandler
+from search_index import SearchIndex
+
+PRIORITIES = ["High", "Medium", "Low"]
+# Matches fetched per limited search, about a screenful of results
+SEARCH_LIMIT = 50
+
+# Modules each startup import must not load: only code paths past startup need them
+DEFERRED_IMPORTS = {
+    'task_manager': ['multiprocessing', 'argparse', 'numpy'],
+    'api_handler': ['requests', 'concurrent.futures'],
+    'gui': ['requests', 'multiprocessing', 'argparse', 'numpy', 'concurrent.futures']
+}
+
+class LegacyTask:
+    
+    # The Task class before the __slots__ representation, kept as the memory baseline
+    
+    def __init__(self, task_id: Optional[str] = None, task_name: str = "", due_date: Optional[str] = None,
+                 due_time: Optional[str] = None, priority: str = "Medium", completed: bool = False,
+                 created_at: Optional[str] = None, completed_at: Optional[str] = None):
+        self.id = task_id or str(uuid.uuid4())
+        self.task_name = task_name
+        self.due_date = due_date
+        self.due_time = due_time
+        self.priority = priority
+        self.completed = completed
+        self.created_at = created_at or datetime.now().isoformat()
+        self.completed_at = completed_at
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'task_name': self.task_name,
+            'due_date': self.due_date,
+            'due_time': self.due_time,
+            'priority': self.priority,
+            'completed': self.completed,
+            'created_at': self.created_at,
+            'completed_at': self.completed_at
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LegacyTask':
+        task_data = data.copy()
+        if 'id' in task_data:
+            task_data['task_id'] = task_data.pop('id')
+        return cls(**task_data)
+
+def sample_task_dicts(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    # An archive-like mix: mostly completed, most tasks dated, timestamps spread over two years
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    tasks = []
+    for number in range(count):
+        created = start + timedelta(seconds=rng.randrange(2 * 365 * 24 * 3600), microseconds=rng.randrange(1000000))
+        due = created + timedelta(days=rng.randrange(30)) if rng.random() < 0.8 else None
+        completed = rng.random() < 0.9
+        tasks.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'task_name': f"Task {number} {rng.choice(['call', 'email', 'review', 'buy', 'write'])} something",
+            'due_date': due.date().isoformat() if due else None,
+            'due_time': f"{rng.randrange(24):02d}:{rng.choice(['00', '15', '30', '45'])}" if due and rng.random() < 0.5 else None,
+            'priority': rng.choice(PRIORITIES),
+            'completed': completed,
+            'created_at': created.isoformat(),
+            'completed_at': (created + timedelta(hours=rng.randrange(1, 500))).isoformat() if completed else None
+        })
+    return tasks
+
+def measure_memory(task_class: Callable, raw: str) -> Dict[str, float]:
+    # Decoding happens under the tracer and the dicts are dropped afterwards, so the figure is
+    # what a loaded task list keeps alive: the objects plus every string they hold on to
+    gc.collect()
+    tracemalloc.start()
+    task_dicts = json.loads(raw)
+    tasks = [task_class.from_dict(task_dict) for task_dict in task_dicts]
+    count = len(task_dicts)
+    del task_dicts
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    
+    # Timings come from a second, untraced pass
+    task_dicts = json.loads(raw)
+    start = time.perf_counter()
+    tasks = [task_class.from_dict(task_dict) for task_dict in task_dicts]
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for task in tasks:
+        task.to_dict()
+    dump_seconds = time.perf_counter() - start
+    return {'bytes_per_task': current / count, 'load_seconds': load_seconds, 'dump_seconds': dump_seconds}
+
+def run_memory(args):
+    raw = json.dumps(sample_task_dicts(args.count))
+    print(f"{args.count} tasks")
+    print(f"{'class':<12}{'bytes/task':>12}{'from_dict s':>14}{'to_dict s':>12}")
+    for name, task_class in (('legacy', LegacyTask), ('slots', Task)):
+        result = measure_memory(task_class, raw)
+        print(f"{name:<12}{result['bytes_per_task']:>12.0f}{result['load_seconds']:>14.3f}{result['dump_seconds']:>12.3f}")
+
+def best_of(function: Callable, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run_table(args):
+    tasks = [Task.from_dict(task_dict) for task_dict in sample_task_dicts(args.count)]
+    table = TaskTable()
+    table.rebuild(tasks)
+    
+    def count_by_priority():
+        counts = {}
+        for task in tasks:
+            counts[task.priority] = counts.get(task.priority, 0) + 1
+        return counts
+    
+    def count_by_due_day():
+        counts = {}
+        for task in tasks:
+            if task.due_start is not None:
+                day = task.due_start.date().isoformat()
+                counts[day] = counts.get(day, 0) + 1
+        return counts
+    
+    # (name, per-object loop, column store)
+    cases = [
+        ('pending tasks', lambda: [task for task in tasks if not task.completed],
+         lambda: table.tasks_where(completed=False)),
+        ('by priority', lambda: [task for task in tasks if task.priority == 'High'],
+         lambda: table.tasks_where(priority='High')),
+        ('count pending high', lambda: sum(1 for task in tasks if not task.completed and task.priority == 'High'),
+         lambda: table.count_where(completed=False, priority='High')),
+        ('group by priority', count_by_priority, lambda: table.count_by('priority')),
+        ('group by due day', count_by_due_day, lambda: table.count_by('due_date')),
+    ]
+    print(f"{args.count} tasks, numpy {'on' if 'numpy' in sys.modules else 'off'}")
+    print(f"{'query':<22}{'loop ms':>10}{'table ms':>10}{'speedup':>10}")
+    for name, loop, column in cases:
+        loop_seconds = best_of(loop)
+        column_seconds = best_of(column)
+        print(f"{name:<22}{loop_seconds * 1000:>10.2f}{column_seconds * 1000:>10.2f}{loop_seconds / column_seconds:>9.1f}x")
+
+def run_formats(args):
+    tasks = sample_task_dicts(args.count)
+    print(f"{args.count} tasks")
+    print(f"{'format':<10}{'size MB':>10}{'save s':>10}{'load s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for format in FORMATS:
+            path = os.path.join(directory, f"tasks.{format}")
+            
+            def save():
+                with open(path, 'wb') as file:
+                    write_records(file, tasks, format)
+            
+            save_seconds = best_of(save, args.repeat)
+            load_seconds = best_of(lambda: list(iter_records(path)), args.repeat)
+            size = os.path.getsize(path) / (1024 * 1024)
+            print(f"{format:<10}{size:>10.1f}{save_seconds:>10.3f}{load_seconds:>10.3f}")
+
+def run_durability(args):
+    # Per-save cost of each durability level, for a full snapshot save and a one-task journal append
+    tasks = sample_task_dicts(args.count)
+    print(f"{args.count} tasks, {args.repeat} saves per level")
+    print(f"{'level':<12}{'save ms':>10}{'append ms':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for durability in DURABILITY_LEVELS:
+            handler = FileHandler(os.path.join(directory, f"{durability}.json"), durability=durability)
+            save_seconds = best_of(lambda: handler.save_tasks(tasks), args.repeat)
+            journal = JournalFileHandler(os.path.join(directory, f"{durability}-journal.json"),
+                                         compact_threshold=2 ** 62, durability=durability)
+            append_seconds = best_of(lambda: journal.upsert_tasks(tasks[:1]), args.repeat)
+            print(f"{durability:<12}{save_seconds * 1000:>10.2f}{append_seconds * 1000:>12.2f}")
+        
+        # Backups: the previous load-and-rewrite against a snapshot of the saved file
+        path = os.path.join(directory, "fsync.json")
+        backup_path = f"{path}.backup"
+        
+        def reserialize():
+            with open(backup_path, 'wb') as file:
+                write_records(file, list(iter_records(path)), 'json')
+        
+        reserialize_seconds = best_of(reserialize, args.repeat)
+        method = snapshot_file(path, backup_path)
+        snapshot_seconds = best_of(lambda: snapshot_file(path, backup_path), args.repeat)
+        print(f"backup: reserialize {reserialize_seconds * 1000:.3f} ms, {method} {snapshot_seconds * 1000:.3f} ms")
+
+def run_search(args):
+    # Search-as-you-type: every prefix of each query, scanned vs. through the index
+    tasks = [Task.from_dict(task_dict) for task_dict in sample_task_dicts(args.count)]
+    start = time.perf_counter()
+    index = SearchIndex()
+    index.rebuild(tasks)
+    build_seconds = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.json.index")
+        index.save(path, None)
+        load_seconds = best_of(lambda: SearchIndex.load(path, None), 3)
+    print(f"{args.count} tasks: index build {build_seconds:.2f} s, load {load_seconds:.2f} s")
+    
+    # The last column fetches only the first SEARCH_LIMIT matches, as a result page does
+    print(f"{'query':<16}{'matches':>9}{'scan ms':>10}{'index ms':>10}{f'first {SEARCH_LIMIT}':>10}")
+    for query in ("review", "task 1234", "ing some", "9 b"):
+        for length in range(1, len(query) + 1):
+            typed = query[:length]
+            scan_seconds = best_of(lambda: [task for task in tasks if typed.lower() in task.task_name.lower()])
+            index_seconds = best_of(lambda: index.search(typed))
+            limited_seconds = best_of(lambda: index.search(typed, SEARCH_LIMIT))
+            print(f"{typed!r:<16}{len(index.search(typed)):>9}{scan_seconds * 1000:>10.2f}"
+                  f"{index_seconds * 1000:>10.3f}{limited_seconds * 1000:>10.3f}")
+    for query in ("rev som", "task 12"):
+        ranked_seconds = best_of(lambda: index.search_ranked(query, SEARCH_LIMIT))
+        all_seconds = best_of(lambda: index.search_ranked(query))
+        print(f"ranked {query!r}: first {SEARCH_LIMIT} {ranked_seconds * 1000:.2f} ms, all {all_seconds * 1000:.2f} ms")
+
+def import_times(module: str) -> Optional[List[Tuple[int, str, int, int]]]:
+    # (depth, name, self us, cumulative us) per module loaded by ``import module`` in a fresh
+    # interpreter, in -X importtime order (children before their parent); None if it fails
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+def run_startup(args):
+    # Cold import time of each startup module, what its direct imports cost, and a check that
+    # deferred modules stay out of startup. Exits non-zero on a regression.
+    failures = []
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        if None in runs:
+            print(f"{module}: cannot be imported here, skipped")
+            continue
+        
+        def total(entries):
+            return next(cumulative for depth, name, _, cumulative in entries if depth == 0 and name == module)
+        entries = min(runs, key=total)
+        print(f"{module}: {total(entries) / 1000:.1f} ms (best of {args.repeat})")
+        
+        # Direct imports are the depth-1 entries listed just before the module itself
+        position = next(i for i, (depth, name, _, _) in enumerate(entries) if depth == 0 and name == module)
+        children = []
+        for depth, name, _, cumulative in reversed(entries[:position]):
+            if depth == 0:
+                break
+            if depth == 1:
+                children.append((cumulative, name))
+        for cumulative, name in sorted(children, reverse=True)[:args.top]:
+            print(f"  {name:<32}{cumulative / 1000:>8.1f} ms")
+        
+        loaded = {name for _, name, _, _ in entries}
+        for deferred in DEFERRED_IMPORTS.get(module, []):
+            if deferred in loaded:
+                failures.append(f"{module} loads {deferred} at import")
+        if args.budget_ms is not None and total(entries) / 1000 > args.budget_ms:
+            failures.append(f"{module} takes {total(entries) / 1000:.1f} ms, over the {args.budget_ms} ms budget")
+    
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    if failures:
+        sys.exit(1)
+
+def lock_worker(path: str, storage: str, count: int, results):
+    manager = TaskManager(path, storage=storage)
+    for number in range(count):
+        manager.add_task(f"Task {number} from {os.getpid()}")
+    manager.close()
+    results.put(manager.file_handler.lock.stats())
+
+def run_locking(args):
+    # Processes adding tasks to one file at once: how long each waited on the others' locks
+    print(f"{args.processes} processes x {args.count} tasks, {args.storage} storage")
+    print(f"{'process':<10}{'contended':>11}{'mean ms':>10}{'max ms':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.json")
+        TaskManager(path, storage=args.storage).close()
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=lock_worker, args=(path, args.storage, args.count, results))
+                     for _ in range(args.processes)]
+        for process in processes:
+            process.start()
+        stats = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        
+        for number, lock_stats in enumerate(stats):
+            print(f"{number:<10}{lock_stats['contended']:>11}{lock_stats['mean_wait'] * 1000:>10.2f}"
+                  f"{lock_stats['max_wait'] * 1000:>10.2f}")
+        manager = TaskManager(path, storage=args.storage)
+        print(f"{len(manager.tasks)} of {args.processes * args.count} tasks saved")
+        manager.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Smart To-Do List benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    memory = subparsers.add_parser("memory", help="Task memory footprint: current class vs. the legacy one")
+    memory.add_argument("--count", type=int, default=200000)
+    memory.set_defaults(func=run_memory)
+    
+    table = subparsers.add_parser("table", help="Filters and group-bys: per-object loops vs. TaskTable")
+    table.add_argument("--count", type=int, default=200000)
+    table.set_defaults(func=run_table)
+    
+    formats = subparsers.add_parser("formats", help="File size, save and load time of each storage format")
+    formats.add_argument("--count", type=int, default=200000)
+    formats.add_argument("--repeat", type=int, default=3)
+    formats.set_defaults(func=run_formats)
+    
+    durability = subparsers.add_parser("durability", help="Save and backup cost of each durability level")
+    durability.add_argument("--count", type=int, default=10000)
+    durability.add_argument("--repeat", type=int, default=10)
+    durability.set_defaults(func=run_durability)
+    
+    search = subparsers.add_parser("search", help="Search-as-you-type: substring scan vs. SearchIndex")
+    search.add_argument("--count", type=int, default=100000)
+    search.set_defaults(func=run_search)
+    
+    locking = subparsers.add_parser("locking", help="Lock waits of processes saving to one task file")
+    locking.add_argument("--processes", type=int, default=4)
+    locking.add_argument("--count", type=int, default=200)
+    locking.add_argument("--storage", choices=["json", "journal", "sqlite"], default="json")
+    locking.set_defaults(func=run_locking)
+    
+    startup = subparsers.add_parser("startup", help="Cold import time of the startup modules (-X importtime)")
+    startup.add_argument("--modules", nargs="+", default=["task_manager", "api_handler", "gui"])
+    startup.add_argument("--repeat", type=int, default=5)
+    startup.add_argument("--top", type=int, default=8)
+    startup.add_argument("--budget-ms", type=float, default=None, help="Fail when a module takes longer")
+    startup.set_defaults(func=run_startup)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
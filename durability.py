@@ -0,0 +1,122 @@
+import errno
+import itertools
+import os
+import shutil
+from typing import BinaryIO, Callable
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# How hard a save works to survive a crash or power loss, cheapest first:
+#   none       rewrite the file in place; a crash mid-save can leave it torn
+#   flush      write a temporary file and rename it over the target; the rename is atomic, but
+#              the data may still sit in the OS cache when the power goes
+#   fsync      as flush, with the temporary file fsynced before the rename
+#   fsync+dir  as fsync, with the directory fsynced after the rename so the new entry is durable
+DURABILITY_LEVELS = ('none', 'flush', 'fsync', 'fsync+dir')
+# Stricter than the original saves, which rewrote the file in place without syncing ('none')
+DEFAULT_DURABILITY = 'fsync'
+
+# Linux ioctl that clones a file's extents (a copy-on-write copy on btrfs, XFS and friends)
+FICLONE = 0x40049409
+
+_temp_names = itertools.count()
+
+def check_durability(durability: str):
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"Unknown durability level: {durability}")
+
+def atomic_write(path: str, write: Callable[[BinaryIO], None], durability: str = DEFAULT_DURABILITY):
+    # Calls ``write`` with a binary file whose contents replace ``path`` at ``durability``
+    check_durability(durability)
+    if durability == 'none' and not _is_linked(path):
+        with open(path, 'wb') as file:
+            write(file)
+        return
+    
+    temp_path = _temp_path(path)
+    try:
+        with open(temp_path, 'xb') as file:
+            write(file)
+            _sync(file, durability)
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    if durability == 'fsync+dir':
+        fsync_directory(path)
+
+def snapshot_file(source: str, destination: str, durability: str = DEFAULT_DURABILITY) -> str:
+    # Makes ``destination`` a point-in-time copy of ``source`` without parsing it: a hard link
+    # where possible, else a copy-on-write clone, else a plain copy. Returns the method used.
+    # A link is only a snapshot because saves never write a linked file in place (see atomic_write).
+    check_durability(durability)
+    temp_path = _temp_path(destination)
+    try:
+        try:
+            os.link(source, temp_path)
+            method = 'link'
+        except OSError:
+            method = _copy(source, temp_path)
+            with open(temp_path, 'rb+') as file:
+                _sync(file, durability)
+        os.replace(temp_path, destination)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    # rename() leaves both names in place when they already link the same file
+    _remove_quietly(temp_path)
+    if durability == 'fsync+dir':
+        fsync_directory(destination)
+    return method
+
+def fsync_directory(path: str):
+    # Persists the directory entry of ``path``; a no-op where directories cannot be opened
+    if os.name == 'nt':
+        return
+    descriptor = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    except OSError as e:
+        # Some filesystems do not support syncing a directory
+        if e.errno not in (errno.EINVAL, errno.ENOTSUP):
+            raise
+    finally:
+        os.close(descriptor)
+
+def _sync(file: BinaryIO, durability: str):
+    file.flush()
+    if durability in ('fsync', 'fsync+dir'):
+        os.fsync(file.fileno())
+
+def _copy(source: str, destination: str) -> str:
+    if fcntl is not None and hasattr(fcntl, 'ioctl'):
+        try:
+            with open(source, 'rb') as source_file, open(destination, 'xb') as destination_file:
+                fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+            shutil.copymode(source, destination)
+            return 'reflink'
+        except OSError:
+            _remove_quietly(destination)
+    shutil.copy2(source, destination)
+    return 'copy'
+
+def _is_linked(path: str) -> bool:
+    try:
+        return os.stat(path).st_nlink > 1
+    except FileNotFoundError:
+        return False
+
+def _temp_path(path: str) -> str:
+    # Unique per process and call, next to ``path`` so the final rename stays on one filesystem
+    return f"{path}.{os.getpid()}-{next(_temp_names)}.tmp"
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
\ No newline at end of file
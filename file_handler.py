@@ -1,48 +1,107 @@
 import json
 import os
-from typing import List, Dict, Any
+import threading
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 from exceptions import FileOperationError
+from durability import DEFAULT_DURABILITY, DURABILITY_LEVELS, fsync_directory, snapshot_file
+from file_lock import FileLock
+from task_formats import FORMATS, iter_records, write_records_atomic
 
 class FileHandler:
     
-    def __init__(self, filename: str = "tasks.json"):
+    # Full-snapshot handlers rewrite the whole file; incremental ones can persist single records
+    incremental = False
+    
+    def __init__(self, filename: str = "tasks.json", format: str = "json", durability: str = DEFAULT_DURABILITY):
+        # ``format`` is the layout written on save (see task_formats); loads detect it from the file.
+        # ``durability`` is how far each save is synced to disk (see durability).
+        if format not in FORMATS:
+            raise FileOperationError(f"Unknown file format: {format}")
+        if durability not in DURABILITY_LEVELS:
+            raise FileOperationError(f"Unknown durability level: {durability}")
         self.filename = filename
+        self.format = format
+        self.durability = durability
+        # Held exclusively around every write and shared around multi-file reads, so processes
+        # sharing the file never interleave their read-modify-write cycles
+        self.lock = FileLock(f"{filename}.lock")
         self.ensure_file_exists()
     
     def ensure_file_exists(self):
-        if not os.path.exists(self.filename):
-            try:
-                self.save_tasks([])
-            except Exception as e:
-                raise FileOperationError(f"Failed to create tasks file: {str(e)}")
+        try:
+            with self.lock:
+                if not os.path.exists(self.filename):
+                    self.save_tasks([])
+        except Exception as e:
+            raise FileOperationError(f"Failed to create tasks file: {str(e)}")
     
     def load_tasks(self) -> List[Dict[str, Any]]:
+        return list(FileHandler.iter_tasks(self))
+    
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        # Streams task records one at a time, so memory stays bounded by one read chunk
         try:
-            with open(self.filename, 'r', encoding='utf-8') as file:
-                content = file.read().strip()
-                if not content:
-                    return []
-                return json.loads(content)
+            yield from iter_records(self.filename)
         except json.JSONDecodeError as e:
             raise FileOperationError(f"Invalid JSON in tasks file: {str(e)}")
+        except ValueError as e:
+            raise FileOperationError(f"Invalid tasks file: {str(e)}")
         except FileNotFoundError:
-            return []
+            return
         except Exception as e:
             raise FileOperationError(f"Failed to load tasks: {str(e)}")
     
     def save_tasks(self, tasks: List[Dict[str, Any]]):
         try:
-            with open(self.filename, 'w', encoding='utf-8') as file:
-                json.dump(tasks, file, indent=2, ensure_ascii=False)
+            # Written to a temporary file and swapped in, so a crash never leaves a torn file
+            with self.lock:
+                write_records_atomic(self.filename, tasks, self.format, self.durability)
         except Exception as e:
             raise FileOperationError(f"Failed to save tasks: {str(e)}")
     
+    def signature(self) -> Any:
+        # Changes whenever any process saves; compared to notice saves made by other processes
+        return stat_signature(self.filename)
+    
+    def changes_since(self, signature: Any, blocking: bool = True
+                      ) -> Optional[Tuple[Any, List[Dict[str, Any]], Optional[List[str]]]]:
+        # (current signature, changed tasks, deleted ids) since ``signature`` was taken. Deleted ids
+        # of None mean the tasks are the complete list and anything missing from it was deleted.
+        # None when ``blocking`` is off and another writer holds the lock.
+        try:
+            if not self.lock.acquire(shared=True, blocking=blocking):
+                return None
+            try:
+                return self._read_changes(signature)
+            finally:
+                self.lock.release()
+        except FileOperationError:
+            raise
+        except Exception as e:
+            raise FileOperationError(f"Failed to check for changes: {str(e)}")
+    
+    def _read_changes(self, signature: Any) -> Tuple[Any, List[Dict[str, Any]], Optional[List[str]]]:
+        current = self.signature()
+        if current == signature:
+            return current, [], []
+        return current, self.load_tasks(), None
+    
+    def upsert_tasks(self, tasks: List[Dict[str, Any]]):
+        raise FileOperationError(f"{type(self).__name__} does not support incremental saves")
+    
+    def delete_tasks(self, task_ids: Iterable[str]):
+        raise FileOperationError(f"{type(self).__name__} does not support incremental saves")
+    
+    def close(self):
+        self.lock.close()
+    
     def backup_tasks(self) -> str:
+        # Every save replaces the file whole, so the current file is already a consistent
+        # snapshot: the backup is a hard link (or copy) of it rather than a reserialization
         backup_filename = f"{self.filename}.backup"
         try:
-            tasks = self.load_tasks()
-            with open(backup_filename, 'w', encoding='utf-8') as file:
-                json.dump(tasks, file, indent=2, ensure_ascii=False)
+            with self.lock:
+                snapshot_file(self.filename, backup_filename, self.durability)
             return backup_filename
         except Exception as e:
             raise FileOperationError(f"Failed to create backup: {str(e)}")
@@ -52,9 +111,229 @@ class FileHandler:
             if not os.path.exists(backup_filename):
                 raise FileOperationError("Backup file not found")
             
-            with open(backup_filename, 'r', encoding='utf-8') as file:
-                tasks = json.load(file)
-            
-            self.save_tasks(tasks)
+            # Read through once so a damaged backup never replaces the tasks file
+            for _ in iter_records(backup_filename):
+                pass
+            with self.lock:
+                snapshot_file(backup_filename, self.filename, self.durability)
         except Exception as e:
-            raise FileOperationError(f"Failed to restore from backup: {str(e)}")
\ No newline at end of file
+            raise FileOperationError(f"Failed to restore from backup: {str(e)}")
+
+class JournalFileHandler(FileHandler):
+    
+    # Snapshot in ``filename`` plus an append-only log of mutations in ``<filename>.journal``,
+    # replayed on load and folded back into the snapshot in the background once it grows.
+    # Replay is idempotent and a torn trailing record is ignored, so every step survives a crash.
+    
+    incremental = True
+    
+    def __init__(self, filename: str = "tasks.json", compact_threshold: int = 1024 * 1024, format: str = "json",
+                 durability: str = DEFAULT_DURABILITY):
+        self.journal_filename = f"{filename}.journal"
+        self.rotated_filename = f"{self.journal_filename}.old"
+        self.compact_threshold = compact_threshold
+        self._snapshot_lock = threading.RLock()
+        self._append_lock = threading.Lock()
+        self._compaction_thread = None
+        super().__init__(filename, format, durability)
+    
+    def ensure_file_exists(self):
+        try:
+            with self.lock:
+                if not os.path.exists(self.filename):
+                    write_records_atomic(self.filename, [], self.format, self.durability)
+        except Exception as e:
+            raise FileOperationError(f"Failed to create tasks file: {str(e)}")
+    
+    def load_tasks(self) -> List[Dict[str, Any]]:
+        # Shared lock: another process compacting mid-read could otherwise hide records
+        with self.lock.held(shared=True), self._snapshot_lock, self._append_lock:
+            tasks = self._read_snapshot()
+            self._replay(self.rotated_filename, tasks)
+            self._replay(self.journal_filename, tasks)
+            return list(tasks.values())
+    
+    def save_tasks(self, tasks: List[Dict[str, Any]]):
+        try:
+            with self.lock, self._snapshot_lock, self._append_lock:
+                write_records_atomic(self.filename, tasks, self.format, self.durability)
+                self._discard_journals()
+        except Exception as e:
+            raise FileOperationError(f"Failed to save tasks: {str(e)}")
+    
+    def backup_tasks(self) -> str:
+        # Folds the journal into the snapshot first, so the snapshot alone is the backup
+        with self.lock, self._snapshot_lock:
+            self.compact()
+            return super().backup_tasks()
+    
+    def restore_from_backup(self, backup_filename: str):
+        with self.lock, self._snapshot_lock, self._append_lock:
+            super().restore_from_backup(backup_filename)
+            try:
+                self._discard_journals()
+            except Exception as e:
+                raise FileOperationError(f"Failed to restore from backup: {str(e)}")
+    
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        # The snapshot streams as is while no journal is pending; otherwise it is replayed first.
+        # Decided up front, so records appended later stay out of the stream.
+        if os.path.exists(self.journal_filename) or os.path.exists(self.rotated_filename):
+            return iter(self.load_tasks())
+        return super().iter_tasks()
+    
+    def signature(self) -> Any:
+        return (stat_signature(self.filename), stat_signature(self.rotated_filename),
+                stat_signature(self.journal_filename))
+    
+    def _read_changes(self, signature: Any) -> Tuple[Any, List[Dict[str, Any]], Optional[List[str]]]:
+        # When only the live journal has grown since ``signature``, just its new records are read
+        current = self.signature()
+        if current == signature:
+            return current, [], []
+        if (signature is None or current[:2] != signature[:2] or current[2] is None
+                or signature[2] is None or current[2][:2] != signature[2][:2]
+                or current[2][2] < signature[2][2]):
+            return current, self.load_tasks(), None
+        
+        changes: Dict[str, Optional[Dict[str, Any]]] = {}
+        with self._append_lock:
+            self._replay(self.journal_filename, changes, offset=signature[2][2], keep_deletes=True)
+        tasks = [task for task in changes.values() if task is not None]
+        deleted_ids = [task_id for task_id, task in changes.items() if task is None]
+        return current, tasks, deleted_ids
+    
+    def upsert_tasks(self, tasks: List[Dict[str, Any]]):
+        self._append([{'op': 'put', 'task': task} for task in tasks])
+    
+    def delete_tasks(self, task_ids: Iterable[str]):
+        self._append([{'op': 'del', 'id': task_id} for task_id in task_ids])
+    
+    def compact(self):
+        try:
+            with self.lock, self._snapshot_lock:
+                # Finish any compaction that was interrupted before rotating the live log
+                self._fold_rotated()
+                with self._append_lock:
+                    if not os.path.exists(self.journal_filename):
+                        return
+                    os.replace(self.journal_filename, self.rotated_filename)
+                self._fold_rotated()
+        except Exception as e:
+            raise FileOperationError(f"Failed to compact journal: {str(e)}")
+    
+    def close(self):
+        thread = self._compaction_thread
+        if thread and thread.is_alive():
+            thread.join()
+        super().close()
+    
+    def _append(self, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        
+        data = ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records).encode('utf-8')
+        try:
+            with self.lock, self._append_lock:
+                with open(self.journal_filename, 'a+b') as file:
+                    created = file.tell() == 0
+                    if not created:
+                        file.seek(-1, os.SEEK_END)
+                        if file.read(1) != b'\n':
+                            # Terminate a torn record left by a crash so it stays the only bad line
+                            data = b'\n' + data
+                    file.write(data)
+                    file.flush()
+                    if self.durability in ('fsync', 'fsync+dir'):
+                        os.fsync(file.fileno())
+                    size = file.tell()
+                if created and self.durability == 'fsync+dir':
+                    fsync_directory(self.journal_filename)
+        except Exception as e:
+            raise FileOperationError(f"Failed to append to journal: {str(e)}")
+        
+        if size >= self.compact_threshold:
+            self._start_compaction()
+    
+    def _start_compaction(self):
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(target=self._compact_in_background, daemon=True)
+        self._compaction_thread.start()
+    
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except FileOperationError:
+            # The journal stays authoritative; the next threshold crossing retries
+            pass
+    
+    def _fold_rotated(self):
+        if not os.path.exists(self.rotated_filename):
+            return
+        tasks = self._read_snapshot()
+        self._replay(self.rotated_filename, tasks)
+        write_records_atomic(self.filename, tasks.values(), self.format, self.durability)
+        os.remove(self.rotated_filename)
+    
+    def _discard_journals(self):
+        for path in (self.journal_filename, self.rotated_filename):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _read_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {task['id']: task for task in super().load_tasks()}
+    
+    def _replay(self, path: str, tasks: Dict[str, Optional[Dict[str, Any]]], offset: int = 0,
+                keep_deletes: bool = False):
+        # Applies the records from byte ``offset`` on; with ``keep_deletes`` a deletion maps the id to None
+        try:
+            file = open(path, 'rb')
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            raise FileOperationError(f"Failed to read journal: {str(e)}")
+        
+        with file:
+            file.seek(offset)
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode('utf-8', errors='replace'))
+                except json.JSONDecodeError:
+                    # Torn write from a crash mid-append; the record was never acknowledged
+                    continue
+                
+                if record.get('op') == 'put':
+                    task = record['task']
+                    tasks[task['id']] = task
+                elif record.get('op') == 'del':
+                    if keep_deletes:
+                        tasks[record['id']] = None
+                    else:
+                        tasks.pop(record['id'], None)
+
+def stat_signature(path: str) -> Optional[Tuple[int, int, int, int]]:
+    # (device, inode, size, mtime): an atomic replace always changes the inode, an in-place
+    # rewrite the mtime, and an append the size
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+STORAGE_HANDLERS = {
+    'json': FileHandler,
+    'journal': JournalFileHandler,
+}
+
+def create_file_handler(filename: str = "tasks.json", storage: str = "json", **options) -> FileHandler:
+    if storage == 'sqlite':
+        from sqlite_store import SQLiteTaskStore
+        return SQLiteTaskStore(filename, **options)
+    
+    handler_class = STORAGE_HANDLERS.get(storage)
+    if handler_class is None:
+        raise FileOperationError(f"Unknown storage format: {storage}")
+    return handler_class(filename, **options)
\ No newline at end of file
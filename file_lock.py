@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+class FileLock:
+    
+    # Advisory lock shared by every process working on one task file. flock() is taken on a
+    # separate ``.lock`` file, because saves replace the task file itself. Reentrant, and threads
+    # of one process exclude each other too. Without fcntl (Windows) only threads are excluded.
+    # Wait times are recorded so contention between processes can be measured (see stats).
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._descriptor: Optional[int] = None
+        self._depth = 0
+        self._shared = False
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def acquire(self, shared: bool = False, blocking: bool = True) -> bool:
+        # Returns False instead of waiting when ``blocking`` is off and the lock is taken
+        start = time.perf_counter()
+        if not self._thread_lock.acquire(blocking):
+            return False
+        try:
+            if self._depth == 0 or (self._shared and not shared):
+                # Upgrading is not atomic with flock(); callers take the exclusive lock up front
+                if not self._lock_file(shared, blocking):
+                    self._thread_lock.release()
+                    return False
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        self._depth += 1
+        if self._depth > 1:
+            return True
+        
+        wait = time.perf_counter() - start
+        self.acquisitions += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return True
+    
+    def release(self):
+        self._depth -= 1
+        try:
+            if self._depth == 0 and self._descriptor is not None:
+                fcntl.flock(self._descriptor, fcntl.LOCK_UN)
+        finally:
+            self._thread_lock.release()
+    
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.release()
+    
+    @contextmanager
+    def held(self, shared: bool = False):
+        # Shared holders only exclude exclusive ones in other processes
+        self.acquire(shared)
+        try:
+            yield self
+        finally:
+            self.release()
+    
+    def stats(self) -> Dict[str, float]:
+        return {
+            'acquisitions': self.acquisitions,
+            'contended': self.contended,
+            'total_wait': self.total_wait,
+            'max_wait': self.max_wait,
+            'mean_wait': self.total_wait / max(self.acquisitions, 1)
+        }
+    
+    def close(self):
+        with self._thread_lock:
+            if self._descriptor is not None and self._depth == 0:
+                os.close(self._descriptor)
+                self._descriptor = None
+    
+    def _lock_file(self, shared: bool, blocking: bool) -> bool:
+        if fcntl is not None:
+            if self._descriptor is None:
+                self._descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            operation = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(self._descriptor, operation | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self.contended += 1
+                if not blocking:
+                    return False
+                fcntl.flock(self._descriptor, operation)
+        self._shared = shared
+        return True
\ No newline at end of file
@@ -1,83 +1,65 @@
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox, ttk
-from typing import Optional, List, Callable
+import bisect
+from typing import Optional, List, Callable, Dict, Tuple, Set
 from task_manager import TaskManager, Task
 from api_handler import APIHandler
-from exceptions import TaskParsingError, TaskNotFoundError
+from search_worker import SearchWorker
+from tk_executor import TkExecutor
+from task_events import TaskEvent, TASK_DELETED, TASKS_LOADED
+from exceptions import TaskParsingError, TaskNotFoundError, FileOperationError
 
-# Appearance
-ctk.set_appearance_mode("system")  
-ctk.set_default_color_theme("blue") 
+# How often the UI checks for failed background saves
+SAVE_CHECK_INTERVAL_MS = 1000
+# How often tasks.json is checked for changes saved by other processes
+SYNC_INTERVAL_MS = 2000
+# Pause in typing after which the search box runs its query
+SEARCH_DEBOUNCE_MS = 200
+# Tasks parsed per event-loop turn while the task file loads
+LOAD_BATCH_SIZE = 2000
 
 class TaskFrame(ctk.CTkFrame):
     
-    def __init__(self, parent, task: Task, on_complete: Callable, on_edit: Callable, on_delete: Callable):
-        super().__init__(parent)
+    ROW_HEIGHT = 52
+    
+    def __init__(self, parent, task: Optional[Task], on_complete: Callable, on_edit: Callable, on_delete: Callable):
+        super().__init__(parent, height=self.ROW_HEIGHT)
         
-        self.task = task
+        self.task = None
         self.on_complete = on_complete
         self.on_edit = on_edit
         self.on_delete = on_delete
         
         self.create_widgets()
+        if task:
+            self.set_task(task)
     
     def create_widgets(self):
-        task_name = self.task.task_name
-        if len(task_name) > 50:
-            task_name = task_name[:50] + "..."
-        
-        status_symbol = "✓" if self.task.completed else "○"
-        priority_symbol = {"High": "!", "Medium": "-", "Low": "~"}.get(self.task.priority, "-")
+        self.bold_font = ctk.CTkFont(size=12, weight="bold")
+        self.normal_font = ctk.CTkFont(size=12, weight="normal")
         
-        display_text = f"{status_symbol} {task_name} [{priority_symbol}]"
-        
-        self.name_label = ctk.CTkLabel(
-            self, 
-            text=display_text,
-            font=ctk.CTkFont(size=12, weight="bold" if not self.task.completed else "normal"),
-            text_color="gray" if self.task.completed else None
-        )
+        self.name_label = ctk.CTkLabel(self, text="", font=self.bold_font)
         self.name_label.grid(row=0, column=0, sticky="w", padx=8, pady=(5, 1))
+        self.default_text_color = self.name_label.cget("text_color")
         
-        info_parts = []
-        if self.task.due_date:
-            due_text = self.task.due_date
-            if self.task.due_time:
-                due_text += f" {self.task.due_time}"
-            color = "red" if self.task.is_overdue() and not self.task.completed else "gray"
-            info_parts.append((f"Due: {due_text}", color))
-        
-        priority_color = {"High": "red", "Medium": "orange", "Low": "green"}.get(self.task.priority, "gray")
-        info_parts.append((f"{self.task.priority}", priority_color))
-        
-        if info_parts:
-            info_text = " | ".join([part[0] for part in info_parts])
-            text_color = info_parts[0][1] if len(info_parts) > 1 else priority_color
-            
-            self.info_label = ctk.CTkLabel(
-                self, 
-                text=info_text,
-                font=ctk.CTkFont(size=10),
-                text_color=text_color
-            )
-            self.info_label.grid(row=1, column=0, sticky="w", padx=8, pady=1)
+        self.info_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=10))
+        self.info_label.grid(row=1, column=0, sticky="w", padx=8, pady=1)
         
         buttons_frame = ctk.CTkFrame(self, fg_color="transparent")
         buttons_frame.grid(row=0, column=1, sticky="e", padx=8, pady=2)
         
-        if not self.task.completed:
-            self.complete_btn = ctk.CTkButton(
-                buttons_frame,
-                text="✓",
-                command=self.complete_task,
-                width=20,
-                height=20,
-                fg_color="green",
-                hover_color="darkgreen",
-                font=ctk.CTkFont(size=10)
-            )
-            self.complete_btn.pack(side="right", padx=(2, 0))
+        self.complete_btn = ctk.CTkButton(
+            buttons_frame,
+            text="✓",
+            command=self.complete_task,
+            width=20,
+            height=20,
+            fg_color="green",
+            hover_color="darkgreen",
+            font=ctk.CTkFont(size=10)
+        )
+        self.complete_btn.pack(side="right", padx=(2, 0))
         
         self.edit_btn = ctk.CTkButton(
             buttons_frame,
@@ -104,6 +86,44 @@ class TaskFrame(ctk.CTkFrame):
         self.delete_btn.pack(side="right", padx=(2, 2))
         
         self.grid_columnconfigure(1, weight=1)
+        # Fixed row height lets TaskListView map scroll offsets to rows
+        self.grid_propagate(False)
+    
+    def set_task(self, task: Task):
+        self.task = task
+        
+        task_name = task.task_name
+        if len(task_name) > 50:
+            task_name = task_name[:50] + "..."
+        
+        status_symbol = "✓" if task.completed else "○"
+        priority_symbol = {"High": "!", "Medium": "-", "Low": "~"}.get(task.priority, "-")
+        
+        self.name_label.configure(
+            text=f"{status_symbol} {task_name} [{priority_symbol}]",
+            font=self.normal_font if task.completed else self.bold_font,
+            text_color="gray" if task.completed else self.default_text_color
+        )
+        
+        info_parts = []
+        if task.due_date:
+            due_text = task.due_date
+            if task.due_time:
+                due_text += f" {task.due_time}"
+            color = "red" if task.is_overdue() and not task.completed else "gray"
+            info_parts.append((f"Due: {due_text}", color))
+        
+        priority_color = {"High": "red", "Medium": "orange", "Low": "green"}.get(task.priority, "gray")
+        info_parts.append((f"{task.priority}", priority_color))
+        
+        info_text = " | ".join([part[0] for part in info_parts])
+        text_color = info_parts[0][1] if len(info_parts) > 1 else priority_color
+        self.info_label.configure(text=info_text, text_color=text_color)
+        
+        if task.completed:
+            self.complete_btn.pack_forget()
+        elif not self.complete_btn.winfo_manager():
+            self.complete_btn.pack(side="right", padx=(2, 0), before=self.edit_btn)
     
     def complete_task(self):
         self.on_complete(self.task.id)
@@ -116,6 +136,228 @@ class TaskFrame(ctk.CTkFrame):
         if result:
             self.on_delete(self.task.id)
 
+class TaskListView(ctk.CTkFrame):
+    
+    # Virtualized list: a pool of TaskFrame rows sized to the viewport is rebound to whichever
+    # tasks are in view, so inserts, updates, removals and scrolling only touch on-screen rows.
+    # A match set (see set_matches) narrows the shown tasks without re-sorting them; the
+    # filtered order can be built off the Tk thread with filter_order.
+    
+    def __init__(self, parent, on_complete: Callable, on_edit: Callable, on_delete: Callable):
+        super().__init__(parent)
+        
+        self.on_complete = on_complete
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.empty_text = "No tasks found."
+        
+        self._order: List[Tuple[tuple, str]] = []
+        self._keys: Dict[str, tuple] = {}
+        self._tasks: Dict[str, Task] = {}
+        # Ids of the tasks to show (None: all), and the shown part of _order, in the same order
+        self._matches: Optional[Set[str]] = None
+        self._view = self._order
+        # Bumped at the end of every change to _order, _keys and _tasks, so a filter_order result
+        # can be checked for staleness
+        self._order_version = 0
+        self._sequence = 0
+        self._first = 0
+        self._visible_rows = 1
+        self._rows: List[TaskFrame] = []
+        
+        self.rows_frame = ctk.CTkFrame(self, fg_color="transparent")
+        self.rows_frame.pack(side="left", fill="both", expand=True)
+        self.rows_frame.grid_columnconfigure(0, weight=1)
+        
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.empty_label = ctk.CTkLabel(
+            self.rows_frame,
+            text="",
+            font=ctk.CTkFont(size=16),
+            text_color="gray"
+        )
+        
+        self.rows_frame.bind("<Configure>", self._on_resize)
+        self.bind_all("<MouseWheel>", self._on_mousewheel, add="+")
+        self.bind_all("<Button-4>", self._on_mousewheel, add="+")
+        self.bind_all("<Button-5>", self._on_mousewheel, add="+")
+    
+    def __len__(self) -> int:
+        return len(self._view)
+    
+    @staticmethod
+    def sort_key(task: Task) -> tuple:
+        priority_order = {"High": 0, "Medium": 1, "Low": 2}
+        overdue_score = 0 if task.is_overdue() and not task.completed else 1
+        due_date_score = task.due_date if task.due_date else "9999-99-99"
+        priority_score = priority_order.get(task.priority, 1)
+        return (overdue_score, due_date_score, priority_score)
+    
+    @classmethod
+    def prepare(cls, tasks: List[Task]) -> tuple:
+        # Sorts ``tasks`` for set_prepared without touching any widget, so it can run off the Tk thread
+        task_ids = [task.id for task in tasks]
+        keys = [cls.sort_key(task) + (sequence,) for sequence, task in enumerate(tasks, 1)]
+        order = sorted(zip(keys, task_ids))
+        return order, dict(zip(task_ids, keys)), dict(zip(task_ids, tasks))
+    
+    def set_tasks(self, tasks: List[Task]):
+        self.set_prepared(self.prepare(tasks))
+    
+    def set_prepared(self, prepared: tuple):
+        self._order, self._keys, self._tasks = prepared
+        self._order_version += 1
+        self._sequence = len(self._order)
+        self._view = self._filter(self._order)
+        self._first = 0
+        self._render()
+    
+    def filter_order(self, task_ids: Set[str]) -> tuple:
+        # Safe to call off the Tk thread: the shown order for match set ``task_ids``, tagged with
+        # the version of the list it was read from. The version is read first and changes bump it
+        # last, so one still under way when the version was read, or started while the result is
+        # built, leaves it tagged stale and set_matches filters again instead.
+        version = self._order_version
+        # Copied in one step, so the loop below never sees an insort half way
+        order = self._order[:]
+        if len(task_ids) * 8 < len(order):
+            # Few matches: sorting them costs less than a pass over every task
+            keys = self._keys
+            entries = sorted((key, task_id) for task_id, key in zip(task_ids, map(keys.get, task_ids))
+                             if key is not None)
+        else:
+            entries = [entry for entry in order if entry[1] in task_ids]
+        return version, entries
+    
+    def set_matches(self, task_ids: Optional[Set[str]], filtered: Optional[tuple] = None):
+        # Shows only the tasks in ``task_ids`` (all with None). ``filtered`` is filter_order's
+        # result for them; unless the list changed since, it is swapped in as is.
+        self._matches = task_ids
+        if filtered is not None and filtered[0] == self._order_version:
+            self._view = filtered[1]
+        else:
+            self._view = self._filter(self._order)
+        self._first = 0
+        self._render()
+    
+    def upsert(self, task: Task, matched: Optional[bool] = None):
+        # ``matched`` updates whether the task belongs to the current match set
+        if self._matches is not None and matched is not None:
+            if matched:
+                self._matches.add(task.id)
+            else:
+                self._matches.discard(task.id)
+        
+        old_key = self._keys.get(task.id)
+        if old_key is not None:
+            self._remove_entry(task.id, old_key)
+            # Keep the original position among otherwise equal tasks
+            sequence = old_key[-1]
+        else:
+            sequence = self._next_sequence()
+        
+        key = self.sort_key(task) + (sequence,)
+        self._keys[task.id] = key
+        self._tasks[task.id] = task
+        bisect.insort(self._order, (key, task.id))
+        if self._view is not self._order and task.id in self._matches:
+            bisect.insort(self._view, (key, task.id))
+        self._order_version += 1
+        self._render()
+    
+    def remove(self, task_id: str):
+        key = self._keys.pop(task_id, None)
+        if key is None:
+            return
+        self._remove_entry(task_id, key)
+        del self._tasks[task_id]
+        self._order_version += 1
+        self._render()
+    
+    def _next_sequence(self) -> int:
+        self._sequence += 1
+        return self._sequence
+    
+    def _filter(self, entries: List[Tuple[tuple, str]]) -> List[Tuple[tuple, str]]:
+        if self._matches is None:
+            return self._order
+        matches = self._matches
+        return [entry for entry in entries if entry[1] in matches]
+    
+    def _remove_entry(self, task_id: str, key: tuple):
+        self._discard(self._order, (key, task_id))
+        if self._view is not self._order:
+            self._discard(self._view, (key, task_id))
+    
+    @staticmethod
+    def _discard(entries: List[Tuple[tuple, str]], entry: Tuple[tuple, str]):
+        position = bisect.bisect_left(entries, entry)
+        if position < len(entries) and entries[position] == entry:
+            del entries[position]
+    
+    def _render(self):
+        total = len(self._view)
+        self._first = max(0, min(self._first, total - self._visible_rows))
+        
+        if not total:
+            self.empty_label.configure(text=self.empty_text)
+            self.empty_label.grid(row=0, column=0, pady=50)
+        else:
+            self.empty_label.grid_remove()
+        
+        for offset, row in enumerate(self._rows):
+            index = self._first + offset
+            if offset < self._visible_rows and index < total:
+                row.set_task(self._tasks[self._view[index][1]])
+                if not row.winfo_manager():
+                    row.grid(row=offset, column=0, sticky="ew", pady=1, padx=5)
+            elif row.winfo_manager():
+                row.grid_remove()
+        
+        if total:
+            self.scrollbar.set(self._first / total, min(1.0, (self._first + self._visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _scroll_to(self, first: int):
+        first = max(0, min(first, len(self._view) - self._visible_rows))
+        if first != self._first:
+            self._first = first
+            self._render()
+    
+    def _on_scrollbar(self, action: str, amount: str, unit: Optional[str] = None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * len(self._view)))
+        elif action == "scroll":
+            step = self._visible_rows if unit == "pages" else 1
+            self._scroll_to(self._first + int(amount) * step)
+    
+    def _on_mousewheel(self, event):
+        try:
+            widget = self.winfo_containing(event.x_root, event.y_root)
+        except (KeyError, tk.TclError):
+            return
+        # The scrollbar handles its own wheel events
+        if widget is None or not str(widget).startswith(str(self)) or str(widget).startswith(str(self.scrollbar)):
+            return
+        if event.num == 4:
+            delta = -1
+        elif event.num == 5:
+            delta = 1
+        else:
+            delta = -1 if event.delta > 0 else 1
+        self._scroll_to(self._first + delta * 3)
+    
+    def _on_resize(self, event):
+        visible_rows = max(1, event.height // (TaskFrame.ROW_HEIGHT + 2))
+        while len(self._rows) < visible_rows:
+            self._rows.append(TaskFrame(self.rows_frame, None, self.on_complete, self.on_edit, self.on_delete))
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self._render()
+
 class AddTaskDialog(ctk.CTkToplevel):
     
     def __init__(self, parent, task: Optional[Task] = None):
@@ -332,13 +574,35 @@ class SmartToDoGUI(ctk.CTk):
         y = (self.winfo_screenheight() // 2) - (700 // 2)
         self.geometry(f"1000x700+{x}+{y}")
         
-        self.task_manager = TaskManager()
-        self.api_handler = APIHandler()
+        # Saves happen on a background worker so edits never wait on disk I/O, and the search
+        # index keeps search-as-you-type fast on large lists. Tasks load once the window is up.
+        self.task_manager = TaskManager(autoload=False, autosave=True, search_index=True)
+        self._task_loader = None
+        self._loaded_count = 0
+        self._reported_save_error = None
+        # Quotes are prefetched and kept on disk, so showing one never waits on the network
+        self.api_handler = APIHandler(cache_filename="quote_cache.json", fetch_mode="hedge")
+        # Parsing, list rebuilds and other blocking work run on a pool; results come back here
+        self.executor = TkExecutor(self, on_busy=self.show_busy)
         
         self.current_filter = "all"
+        # Changes to apply on top of a list rebuild still running (task id -> task, None if deleted)
+        self._refresh_generation = 0
+        self._changed_during_refresh: Optional[Dict[str, Optional[Task]]] = None
+        # Queries run off the Tk thread; the list shows the results of ``shown_query``
+        self.search_worker = SearchWorker(
+            self.find_task_ids,
+            lambda *result: self.executor.call_soon(self.show_search_results, *result)
+        )
+        self.search_query = ""
+        self.shown_query = ""
+        self._search_after = None
         
         self.create_widgets()
-        self.refresh_tasks()
+        self.task_manager.subscribe(self.on_task_events)
+        self.after_idle(self.start_loading)
+        self.after(SAVE_CHECK_INTERVAL_MS, self.check_save_errors)
+        self.after(SYNC_INTERVAL_MS, self.check_external_changes)
     
     def create_widgets(self):
         main_frame = ctk.CTkFrame(self)
@@ -412,7 +676,16 @@ class SmartToDoGUI(ctk.CTk):
             fg_color="purple",
             hover_color="#800080"
         )
-        self.stats_btn.pack(side="left")
+        self.stats_btn.pack(side="left", padx=(0, 10))
+        
+        self.search_entry = ctk.CTkEntry(
+            buttons_left,
+            placeholder_text="Search tasks...",
+            width=200
+        )
+        self.search_entry.pack(side="left")
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
+        self.search_entry.bind("<Escape>", lambda e: self.clear_search())
         
         filter_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
         filter_frame.pack(side="right", padx=15, pady=15)
@@ -442,8 +715,9 @@ class SmartToDoGUI(ctk.CTk):
         tasks_container = ctk.CTkFrame(main_frame)
         tasks_container.pack(fill="both", expand=True, padx=20)
         
-        self.tasks_scroll = ctk.CTkScrollableFrame(tasks_container, height=300)
-        self.tasks_scroll.pack(fill="both", expand=True, padx=15, pady=15)
+        self.task_list = TaskListView(tasks_container, self.complete_task, self.edit_task, self.delete_task)
+        self.task_list.configure(height=300)
+        self.task_list.pack(fill="both", expand=True, padx=15, pady=15)
         
         self.status_label = ctk.CTkLabel(
             main_frame,
@@ -452,6 +726,43 @@ class SmartToDoGUI(ctk.CTk):
             text_color="gray"
         )
         self.status_label.pack(pady=(10, 20))
+        
+        # Shown below the list while background work is running
+        self.progress_bar = ctk.CTkProgressBar(main_frame, mode="indeterminate", height=6)
+    
+    def start_loading(self):
+        self._task_loader = self.task_manager.load_progressively(LOAD_BATCH_SIZE)
+        self.load_tasks()
+    
+    def load_tasks(self):
+        # One batch per event-loop turn, so the window stays responsive while a large file
+        # loads. The first batch is shown right away; TASKS_LOADED refreshes the full list.
+        try:
+            batch = next(self._task_loader, None)
+        except FileOperationError as e:
+            self._task_loader = None
+            messagebox.showerror("Error", f"Could not load tasks: {e}")
+            self.destroy()
+            return
+        if batch is None:
+            self._task_loader = None
+            return
+        
+        first_batch = not self._loaded_count
+        self._loaded_count += len(batch)
+        if self.task_manager.loading:
+            if first_batch:
+                self.refresh_tasks()
+            self.update_status(f"Loading tasks... {self._loaded_count} so far")
+        self.after(1, self.load_tasks)
+    
+    def show_busy(self, busy: bool):
+        if busy:
+            self.progress_bar.pack(fill="x", padx=35, pady=(10, 0), before=self.status_label)
+            self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
     
     def add_task_quick(self):
         input_text = self.task_entry.get().strip()
@@ -459,14 +770,27 @@ class SmartToDoGUI(ctk.CTk):
             messagebox.showwarning("Warning", "Please enter a task.")
             return
         
-        try:
-            task = self.task_manager.add_task_from_text(input_text)
+        # Parsing runs on the executor; the task is added back on the Tk thread
+        self.executor.submit(
+            self.task_manager.parse_task_text,
+            input_text,
+            on_done=lambda parsed_data: self.finish_add_task(input_text, parsed_data),
+            on_error=self.show_add_error
+        )
+    
+    def finish_add_task(self, input_text: str, parsed_data: Dict[str, Optional[str]]):
+        task = self.task_manager.add_parsed_task(parsed_data)
+        # Text typed since the task was submitted stays in the entry
+        if self.task_entry.get().strip() == input_text:
             self.task_entry.delete(0, "end")
-            self.refresh_tasks()
-            self.show_motivational_quote()
-            self.update_status(f"Task '{task.task_name}' added successfully!")
-        except TaskParsingError as e:
-            messagebox.showerror("Error", str(e))
+        self.show_motivational_quote()
+        self.update_status(f"Task '{task.task_name}' added successfully!")
+    
+    def show_add_error(self, error: Exception):
+        if isinstance(error, TaskParsingError):
+            messagebox.showerror("Error", str(error))
+        else:
+            raise error
     
     def add_task_detailed(self):
         dialog = AddTaskDialog(self)
@@ -474,14 +798,12 @@ class SmartToDoGUI(ctk.CTk):
         
         if dialog.result:
             task = self.task_manager.add_task(**dialog.result)
-            self.refresh_tasks()
             self.show_motivational_quote()
             self.update_status(f"Task '{task.task_name}' added successfully!")
     
     def complete_task(self, task_id: str):
         try:
             task = self.task_manager.complete_task(task_id)
-            self.refresh_tasks()
             self.show_motivational_quote()
             self.update_status(f"Task '{task.task_name}' completed!")
         except TaskNotFoundError as e:
@@ -495,7 +817,6 @@ class SmartToDoGUI(ctk.CTk):
             
             if dialog.result:
                 updated_task = self.task_manager.update_task(task_id, **dialog.result)
-                self.refresh_tasks()
                 self.update_status(f"Task '{updated_task.task_name}' updated!")
         except TaskNotFoundError as e:
             messagebox.showerror("Error", str(e))
@@ -504,7 +825,6 @@ class SmartToDoGUI(ctk.CTk):
         try:
             task = self.task_manager.get_task(task_id)
             self.task_manager.delete_task(task_id)
-            self.refresh_tasks()
             self.update_status(f"Task '{task.task_name}' deleted!")
         except TaskNotFoundError as e:
             messagebox.showerror("Error", str(e))
@@ -515,53 +835,122 @@ class SmartToDoGUI(ctk.CTk):
         
         pass
     
+    def filtered_tasks(self, filter_type: Optional[str] = None) -> List[Task]:
+        # Filters a snapshot of the tasks, so it is safe on the executor while the Tk thread
+        # keeps editing them
+        return [task for task in self.task_manager.get_all_tasks() if self.matches_filter(task, filter_type)]
+    
+    def matches_filter(self, task: Task, filter_type: Optional[str] = None) -> bool:
+        filter_type = filter_type or self.current_filter
+        if filter_type == "pending":
+            return not task.completed
+        elif filter_type == "completed":
+            return task.completed
+        elif filter_type == "overdue":
+            return task.is_overdue()
+        elif filter_type == "today":
+            return task.is_due_today()
+        return True
+    
+    def prepare_tasks(self, filter_type: str) -> tuple:
+        # Runs on the executor
+        return TaskListView.prepare(self.filtered_tasks(filter_type))
+    
     def refresh_tasks(self):
-        for widget in self.tasks_scroll.winfo_children():
-            widget.destroy()
-        
-        if self.current_filter == "all":
-            tasks = self.task_manager.get_all_tasks()
-        elif self.current_filter == "pending":
-            tasks = self.task_manager.get_pending_tasks()
-        elif self.current_filter == "completed":
-            tasks = self.task_manager.get_completed_tasks()
-        elif self.current_filter == "overdue":
-            tasks = self.task_manager.get_overdue_tasks()
-        elif self.current_filter == "today":
-            tasks = self.task_manager.get_today_tasks()
-        else:
-            tasks = self.task_manager.get_all_tasks()
-        
-        def sort_key(task):
-            priority_order = {"High": 0, "Medium": 1, "Low": 2}
-            overdue_score = 0 if task.is_overdue() and not task.completed else 1
-            due_date_score = task.due_date if task.due_date else "9999-99-99"
-            priority_score = priority_order.get(task.priority, 1)
-            return (overdue_score, due_date_score, priority_score)
-        
-        tasks.sort(key=sort_key)
-        
-        if not tasks:
-            no_tasks_label = ctk.CTkLabel(
-                self.tasks_scroll,
-                text=f"No {self.current_filter} tasks found.",
-                font=ctk.CTkFont(size=16),
-                text_color="gray"
-            )
-            no_tasks_label.pack(pady=50)
+        # The list is filtered and sorted on the executor; changes made meanwhile are recorded
+        # and applied on top once it is shown
+        self._refresh_generation += 1
+        generation = self._refresh_generation
+        self._changed_during_refresh = {}
+        self.executor.submit(
+            self.prepare_tasks,
+            self.current_filter,
+            on_done=lambda prepared: self.show_tasks(generation, prepared)
+        )
+    
+    def show_tasks(self, generation: int, prepared: tuple):
+        if generation != self._refresh_generation:
+            # A newer refresh is on its way
+            return
+        changes, self._changed_during_refresh = self._changed_during_refresh, None
+        self.task_list.empty_text = f"No {self.current_filter} tasks found."
+        self.task_list.set_prepared(prepared)
+        for task_id, task in changes.items():
+            if task is None:
+                self.task_list.remove(task_id)
+            else:
+                self.apply_task_change(task)
+        
+        if self.search_query:
+            # The old matches stay in place until the query has run against the new tasks
+            self.shown_query = ""
+            self.start_search()
+            return
+        filter_name = self.current_filter.capitalize()
+        self.update_status(f"Showing {len(self.task_list)} {filter_name} task(s)")
+    
+    def apply_task_change(self, task: Task):
+        if self._changed_during_refresh is not None:
+            self._changed_during_refresh[task.id] = task
+        if self.matches_filter(task):
+            matched = self.shown_query.lower() in task.task_name.lower() if self.shown_query else None
+            self.task_list.upsert(task, matched)
         else:
-            for task in tasks:
-                task_frame = TaskFrame(
-                    self.tasks_scroll,
-                    task,
-                    self.complete_task,
-                    self.edit_task,
-                    self.delete_task
-                )
-                task_frame.pack(fill="x", pady=1, padx=5)
+            self.task_list.remove(task.id)
+    
+    def find_task_ids(self, query: str) -> Tuple[Set[str], tuple]:
+        # Runs on the search worker, which also orders the matches the way the list shows them
+        task_ids = {task.id for task in self.task_manager.search_tasks(query)}
+        return task_ids, self.task_list.filter_order(task_ids)
+    
+    def on_search_changed(self, event=None):
+        # Every keystroke restarts the debounce, so only a pause in typing runs a query
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+        self._search_after = self.after(SEARCH_DEBOUNCE_MS, self.start_search)
+    
+    def start_search(self):
+        self._search_after = None
+        query = self.search_entry.get().strip()
+        if query == self.search_query == self.shown_query:
+            return
+        self.search_query = query
+        if not query:
+            self.search_worker.cancel()
+            self.shown_query = ""
+            self.task_list.empty_text = f"No {self.current_filter} tasks found."
+            self.task_list.set_matches(None)
+            return
         
-        filter_name = self.current_filter.capitalize()
-        self.update_status(f"Showing {len(tasks)} {filter_name} task(s)")
+        self.search_worker.submit(query)
+    
+    def show_search_results(self, query: str, result: Optional[Tuple[Set[str], tuple]], error: Optional[Exception]):
+        if query != self.search_query:
+            # Superseded after the worker finished it
+            return
+        if error is not None:
+            self.update_status(f"Search failed: {error}")
+            return
+        task_ids, filtered = result
+        self.shown_query = query
+        self.task_list.empty_text = f"No {self.current_filter} tasks match '{query}'."
+        self.task_list.set_matches(task_ids, filtered)
+        self.update_status(f"Found {len(self.task_list)} {self.current_filter.capitalize()} task(s) matching '{query}'")
+    
+    def clear_search(self):
+        self.search_entry.delete(0, "end")
+        self.start_search()
+    
+    def on_task_events(self, events: List[TaskEvent]):
+        for event in events:
+            if event.kind == TASKS_LOADED:
+                self.refresh_tasks()
+            elif event.kind == TASK_DELETED:
+                if self._changed_during_refresh is not None:
+                    self._changed_during_refresh[event.task_id] = None
+                self.task_list.remove(event.task_id)
+            else:
+                self.apply_task_change(event.task)
     
     def show_motivational_quote(self):
         """Show a motivational quote in a dialog."""
@@ -571,10 +960,11 @@ class SmartToDoGUI(ctk.CTk):
             except:
                 pass  
         
-        self.api_handler.get_motivational_quote(callback=show_quote)
+        # Without a cache the handler calls back on its fetch thread, which must not touch Tk
+        self.api_handler.get_motivational_quote(callback=lambda quote: self.executor.call_soon(show_quote, quote))
     
     def show_statistics(self):
-        stats = self.task_manager.get_task_stats()
+        stats = self.task_manager.stats.as_dict()
         
         stats_text = f"""Task Statistics
         
@@ -591,13 +981,57 @@ Completion Rate: {(stats['completed'] / max(stats['total'], 1) * 100):.1f}%"""
     def update_status(self, message: str):
         self.status_label.configure(text=message)
         self.after(5000, lambda: self.status_label.configure(text="Ready"))
+    
+    def check_save_errors(self):
+        # Background save failures can't touch Tk from the worker thread, so they are polled here
+        error = self.task_manager.save_error
+        if error is not None and error is not self._reported_save_error:
+            self.update_status(f"Saving failed, will retry: {error}")
+        self._reported_save_error = error
+        self.after(SAVE_CHECK_INTERVAL_MS, self.check_save_errors)
+    
+    def check_external_changes(self):
+        # Picks up tasks other processes saved. Reading and parsing them runs on the executor and
+        # only the merge runs here; it arrives through on_task_events. A read that would wait on
+        # another writer is skipped, and the next check is scheduled once this one is back.
+        self.executor.submit(self.task_manager.read_changes, False, on_done=self.apply_external_changes,
+                             on_error=self.external_changes_failed, background=True)
+    
+    def apply_external_changes(self, changes):
+        try:
+            if changes is not None and self.task_manager.apply_changes(changes):
+                self.update_status("Tasks changed elsewhere were loaded")
+        except FileOperationError as e:
+            self.update_status(f"Could not check for outside changes: {e}")
+        self.after(SYNC_INTERVAL_MS, self.check_external_changes)
+    
+    def external_changes_failed(self, error: Exception):
+        self.after(SYNC_INTERVAL_MS, self.check_external_changes)
+        if not isinstance(error, FileOperationError):
+            raise error
+        self.update_status(f"Could not check for outside changes: {error}")
 
 def main():
+    # Appearance is set up here rather than on import, so importing this module stays cheap
+    ctk.set_appearance_mode("system")
+    ctk.set_default_color_theme("blue")
+    
+    app = None
     try:
         app = SmartToDoGUI()
         app.mainloop()
     except Exception as e:
         print(f"Application error: {e}")
+    finally:
+        if app is not None:
+            app.search_worker.close()
+            app.executor.close()
+            # Flush anything autosave still has queued before the process exits
+            try:
+                app.task_manager.close()
+            except FileOperationError as e:
+                print(f"Could not save tasks: {e}")
+            app.api_handler.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
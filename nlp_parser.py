@@ -1,11 +1,29 @@
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+from itertools import islice
+from typing import Dict, Optional, List, Iterable, Iterator, Tuple
 from exceptions import TaskParsingError, InvalidDateTimeError
 
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+MONTHS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12
+}
+
+# Token sets used to skip patterns that cannot match; DIGIT marks input containing any digit
+DIGIT = '<digit>'
+RELATIVE_WORDS = frozenset(['today', 'tomorrow'])
+WEEKDAY_WORDS = frozenset(WEEKDAYS)
+MONTH_WORDS = frozenset(MONTHS)
+PRIORITY_WORDS = frozenset(['high', 'urgent', 'important', 'priority', 'low', 'minor', 'medium', 'normal'])
+
 class NLPParser:
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
         # Time
         self.time_patterns = [
             r'at (\d{1,2}):(\d{2})\s*(am|pm)',
@@ -34,6 +52,58 @@ class NLPParser:
         
         # Common task
         self.action_words = ['submit', 'call', 'meet', 'finish', 'complete', 'buy', 'send', 'write', 'read', 'study', 'work', 'visit']
+        
+        self._compile()
+        
+        # LRU of normalized input -> (result, depends on the current date)
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_day = None
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def _compile(self):
+        weekdays = '|'.join(WEEKDAYS)
+        months = '|'.join(MONTHS)
+        
+        self._time_regexes = [re.compile(pattern, re.IGNORECASE) for pattern in self.time_patterns]
+        self._date_regexes = [re.compile(pattern, re.IGNORECASE) for pattern in self.date_patterns[3:]]
+        self._priority_regexes = [
+            (re.compile(r'\b(high|urgent|important|priority)\b', re.IGNORECASE), 'High'),
+            (re.compile(r'\b(low|minor)\b', re.IGNORECASE), 'Low'),
+            (re.compile(r'\b(medium|normal)\b', re.IGNORECASE), 'Medium')
+        ]
+        
+        # Removal patterns for the task name, each with the words it needs (any one) and whether it needs a digit
+        self._removal_regexes = [
+            (re.compile(pattern, re.IGNORECASE), words, needs_digit) for pattern, words, needs_digit in [
+                (r'\bat \d{1,2}:?\d{0,2}\s*(am|pm)?\b', None, True),
+                (r'\b(today|tomorrow)\b', RELATIVE_WORDS, False),
+                (rf'\b({weekdays})\b', WEEKDAY_WORDS, False),
+                (r'\b\d{1,2}/\d{1,2}/\d{2,4}\b', None, True),
+                (r'\b\d{1,2}-\d{1,2}-\d{2,4}\b', None, True),
+                (rf'\b({months})\s+\d{{1,2}}\b', MONTH_WORDS, True),
+                (rf'\b\d{{1,2}}\s+({months})\b', MONTH_WORDS, True),
+                (r'\b(high|urgent|important|priority|low|minor|medium|normal)\b', PRIORITY_WORDS, False),
+                (r'\bby\b', frozenset(['by']), False),
+                (r'\bon\b', frozenset(['on']), False)
+            ]
+        ]
+        self._whitespace = re.compile(r'\s+')
+        
+        # Single tokenizing pass: the set of \w+ words decides which patterns can match at all.
+        # Every keyword pattern is \b-delimited, so a pattern whose words are absent is skipped;
+        # removing text never creates new words because each removal starts at a word boundary.
+        self._word_scanner = re.compile(r'\w+')
+        self._digit = re.compile(r'\d')
+    
+    def _scan(self, text: str) -> set:
+        # Casefolded because the patterns are IGNORECASE, which also matches forms like 'ſ' for 's'
+        tokens = set(self._word_scanner.findall(text.casefold()))
+        if self._digit.search(text):
+            tokens.add(DIGIT)
+        return tokens
     
     def parse_task(self, input_text: str) -> Dict[str, Optional[str]]:
         try:
@@ -41,32 +111,120 @@ class NLPParser:
                 raise TaskParsingError("Empty input text")
             
             input_text = input_text.strip().lower()
+            if not self.cache_size:
+                return self._parse(input_text)[0]
             
-            # time
-            time_info = self._extract_time(input_text)
-            
-            # date
-            date_info = self._extract_date(input_text)
-            
-            # priority
-            priority = self._extract_priority(input_text)
+            with self._cache_lock:
+                today = datetime.now().date()
+                if today != self._cache_day:
+                    self._expire_relative_entries()
+                    self._cache_day = today
+                
+                cached = self._cache.get(input_text)
+                if cached is not None:
+                    self._cache.move_to_end(input_text)
+                    self.cache_hits += 1
+                    return dict(cached[0])
+                self.cache_misses += 1
             
-            # Task name (remove time, date, and priority keywords)
-            task_name = self._extract_task_name(input_text, time_info, date_info, priority)
-            
-            return {
-                'task_name': task_name,
-                'due_date': date_info,
-                'due_time': time_info,
-                'priority': priority
-            }
+            result, date_dependent = self._parse(input_text)
+            with self._cache_lock:
+                # Skip results that may have been computed across a day rollover
+                if not date_dependent or self._cache_day == today:
+                    self._cache[input_text] = (result, date_dependent)
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            return dict(result)
             
         except Exception as e:
             raise TaskParsingError(f"Failed to parse task: {str(e)}")
     
-    def _extract_time(self, text: str) -> Optional[str]:
-        for pattern in self.time_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._cache),
+            'max_size': self.cache_size
+        }
+    
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+            self.cache_hits = 0
+            self.cache_misses = 0
+    
+    def _expire_relative_entries(self):
+        stale = [text for text, (_, date_dependent) in self._cache.items() if date_dependent]
+        for text in stale:
+            del self._cache[text]
+    
+    def _parse(self, input_text: str) -> Tuple[Dict[str, Optional[str]], bool]:
+        # ``input_text`` is already stripped and lowercased
+        tokens = self._scan(input_text)
+        
+        # Relative words, weekdays and month names resolve against today's date (month names
+        # also pick the year), so those results must not outlive the day they were parsed on
+        date_dependent = ('today' in input_text or 'tomorrow' in input_text
+                          or any(day in input_text for day in WEEKDAYS)
+                          or (DIGIT in tokens and not tokens.isdisjoint(MONTH_WORDS)))
+        
+        # time
+        time_info = self._extract_time(input_text, tokens)
+        
+        # date
+        date_info = self._extract_date(input_text, tokens)
+        
+        # priority
+        priority = self._extract_priority(input_text, tokens)
+        
+        # Task name (remove time, date, and priority keywords)
+        task_name = self._extract_task_name(input_text, time_info, date_info, priority, tokens)
+        
+        return {
+            'task_name': task_name,
+            'due_date': date_info,
+            'due_time': time_info,
+            'priority': priority
+        }, date_dependent
+    
+    def parse_many(self, lines: Iterable[str], processes: Optional[int] = None,
+                   chunk_size: int = 1000) -> Iterator[Tuple[int, Optional[Dict[str, Optional[str]]], Optional[str]]]:
+        # Yields (index, parsed, error) in input order; a failing line reports its error and the
+        # batch carries on. With processes > 1, chunks are parsed in a process pool with a bounded
+        # number in flight, so arbitrarily long streams are never held in memory at once.
+        lines = iter(lines)
+        if not processes or processes <= 1:
+            for index, line in enumerate(lines):
+                yield (index,) + _parse_or_error(self, line)
+            return
+        
+        # Imported here: multiprocessing is costly to load and only bulk imports need it
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            pending = []
+            index = 0
+            while True:
+                while len(pending) < processes * 2:
+                    chunk = list(islice(lines, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append((index, executor.submit(_parse_chunk, chunk)))
+                    index += len(chunk)
+                if not pending:
+                    return
+                start, future = pending.pop(0)
+                for offset, (parsed, error) in enumerate(future.result()):
+                    yield start + offset, parsed, error
+    
+    def _extract_time(self, text: str, tokens: Optional[set] = None) -> Optional[str]:
+        if tokens is None:
+            tokens = self._scan(text)
+        if DIGIT not in tokens:
+            return None
+        
+        for regex in self._time_regexes:
+            match = regex.search(text)
             if match:
                 groups = match.groups()
                 if len(groups) == 3:  # Hour, minute, am/pm
@@ -85,7 +243,9 @@ class NLPParser:
                     return groups[0]
         return None
     
-    def _extract_date(self, text: str) -> Optional[str]:
+    def _extract_date(self, text: str, tokens: Optional[set] = None) -> Optional[str]:
+        if tokens is None:
+            tokens = self._scan(text)
         today = datetime.now()
         
         if 'today' in text:
@@ -93,8 +253,7 @@ class NLPParser:
         elif 'tomorrow' in text:
             return (today + timedelta(days=1)).strftime('%Y-%m-%d')
         
-        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        for i, day in enumerate(days):
+        for i, day in enumerate(WEEKDAYS):
             if day in text:
                 days_ahead = i - today.weekday()
                 if days_ahead <= 0:  
@@ -102,8 +261,11 @@ class NLPParser:
                 target_date = today + timedelta(days=days_ahead)
                 return target_date.strftime('%Y-%m-%d')
         
-        for pattern in self.date_patterns[3:]:  
-            match = re.search(pattern, text, re.IGNORECASE)
+        if DIGIT not in tokens:
+            return None
+        
+        for regex in self._date_regexes:  
+            match = regex.search(text)
             if match:
                 try:
                     return self._parse_date_match(match, today)
@@ -123,18 +285,12 @@ class NLPParser:
             return date.strftime('%Y-%m-%d')
         
         elif len(groups) == 2:
-            months = {
-                'january': 1, 'february': 2, 'march': 3, 'april': 4,
-                'may': 5, 'june': 6, 'july': 7, 'august': 8,
-                'september': 9, 'october': 10, 'november': 11, 'december': 12
-            }
-            
             if groups[0].isdigit():  
                 day, month_name = groups
-                month = months.get(month_name.lower())
+                month = MONTHS.get(month_name.lower())
             else:  
                 month_name, day = groups
-                month = months.get(month_name.lower())
+                month = MONTHS.get(month_name.lower())
             
             if month:
                 year = today.year
@@ -145,36 +301,43 @@ class NLPParser:
         
         return None
     
-    def _extract_priority(self, text: str) -> Optional[str]:
-        if re.search(r'\b(high|urgent|important|priority)\b', text, re.IGNORECASE):
-            return 'High'
-        elif re.search(r'\b(low|minor)\b', text, re.IGNORECASE):
-            return 'Low'
-        elif re.search(r'\b(medium|normal)\b', text, re.IGNORECASE):
-            return 'Medium'
+    def _extract_priority(self, text: str, tokens: Optional[set] = None) -> Optional[str]:
+        if tokens is None:
+            tokens = self._scan(text)
+        if not tokens.isdisjoint(PRIORITY_WORDS):
+            for regex, priority in self._priority_regexes:
+                if regex.search(text):
+                    return priority
         return 'Medium'  # Default priority
     
     def _extract_task_name(self, text: str, time_info: Optional[str], 
-                          date_info: Optional[str], priority: Optional[str]) -> str:
-        keywords_to_remove = [
-            r'\bat \d{1,2}:?\d{0,2}\s*(am|pm)?\b',
-            r'\b(today|tomorrow)\b',
-            r'\b(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b',
-            r'\b\d{1,2}/\d{1,2}/\d{2,4}\b',
-            r'\b\d{1,2}-\d{1,2}-\d{2,4}\b',
-            r'\b(january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}\b',
-            r'\b\d{1,2}\s+(january|february|march|april|may|june|july|august|september|october|november|december)\b',
-            r'\b(high|urgent|important|priority|low|minor|medium|normal)\b',
-            r'\bby\b',
-            r'\bon\b'
-        ]
+                          date_info: Optional[str], priority: Optional[str],
+                          tokens: Optional[set] = None) -> str:
+        if tokens is None:
+            tokens = self._scan(text)
         
         cleaned_text = text
-        for pattern in keywords_to_remove:
-            cleaned_text = re.sub(pattern, '', cleaned_text, flags=re.IGNORECASE)
+        has_digit = DIGIT in tokens
+        for regex, words, needs_digit in self._removal_regexes:
+            if (has_digit or not needs_digit) and (words is None or not tokens.isdisjoint(words)):
+                cleaned_text = regex.sub('', cleaned_text)
         
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
+        cleaned_text = self._whitespace.sub(' ', cleaned_text).strip()
         if cleaned_text:
             return cleaned_text.capitalize()
         
-        return "New task"
\ No newline at end of file
+        return "New task"
+
+_worker_parser = None
+
+def _parse_or_error(parser: NLPParser, line: str) -> Tuple[Optional[Dict[str, Optional[str]]], Optional[str]]:
+    try:
+        return parser.parse_task(line), None
+    except TaskParsingError as e:
+        return None, str(e)
+
+def _parse_chunk(lines: List[str]) -> List[Tuple[Optional[Dict[str, Optional[str]]], Optional[str]]]:
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = NLPParser()
+    return [_parse_or_error(_worker_parser, line) for line in lines]
\ No newline at end of file
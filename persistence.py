@@ -0,0 +1,99 @@
+import atexit
+import threading
+import time
+from typing import Callable, Optional
+
+class PersistenceScheduler:
+
+    # Coalesces save requests. mark_dirty() only records that something changed; a background
+    # worker calls ``save`` once changes have paused for ``debounce`` seconds, and never later
+    # than ``max_latency`` seconds after the oldest unsaved change. Saves never overlap, and a
+    # failed save is retried after ``max_latency`` (or on the next flush).
+
+    def __init__(self, save: Callable[[], None], debounce: float = 0.5, max_latency: float = 5.0,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self._save = save
+        self.debounce = debounce
+        self.max_latency = max_latency
+        # Called on the worker thread when a background save fails
+        self.on_error = on_error
+        self.last_error: Optional[Exception] = None
+        self._condition = threading.Condition()
+        self._save_lock = threading.Lock()
+        self._first_change: Optional[float] = None
+        self._last_change: Optional[float] = None
+        self._retry_at = 0.0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="task-persistence", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    @property
+    def dirty(self) -> bool:
+        return self._first_change is not None
+
+    def mark_dirty(self):
+        with self._condition:
+            now = time.monotonic()
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+            self._condition.notify()
+
+    def flush(self):
+        # Saves pending changes on the calling thread, waiting out a save already in progress.
+        # Errors are raised to the caller.
+        self._save_pending(raise_errors=True)
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+        atexit.unregister(self.close)
+        self._save_pending(raise_errors=True)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    delay = self._delay()
+                    if delay is not None and delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                if self._closed:
+                    return
+            self._save_pending(raise_errors=False)
+
+    def _delay(self) -> Optional[float]:
+        if self._first_change is None:
+            return None
+        due = min(self._last_change + self.debounce, self._first_change + self.max_latency)
+        return max(due, self._retry_at) - time.monotonic()
+
+    def _save_pending(self, raise_errors: bool):
+        with self._save_lock:
+            with self._condition:
+                if self._first_change is None:
+                    return
+                # Changes made while the save runs mark the store dirty again
+                self._first_change = self._last_change = None
+
+            try:
+                self._save()
+            except Exception as e:
+                with self._condition:
+                    now = time.monotonic()
+                    if self._first_change is None:
+                        self._first_change = self._last_change = now
+                    self._retry_at = now + self.max_latency
+                self.last_error = e
+                if raise_errors:
+                    raise
+                if self.on_error:
+                    self.on_error(e)
+            else:
+                self._retry_at = 0.0
+                self.last_error = None
\ No newline at end of file
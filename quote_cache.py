@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+from durability import atomic_write
+
+class QuoteCache:
+    
+    # Bounded queue of quotes fetched ahead of demand. take() never waits on the network: a
+    # background worker refills the queue to ``capacity`` whenever it drops below ``low_water``,
+    # backing off while fetches fail. The queue is saved to ``filename`` after each refill and
+    # on close, so a later start has quotes at hand even without a network.
+    
+    def __init__(self, fetch: Callable[[], Optional[str]], filename: Optional[str] = "quote_cache.json",
+                 capacity: int = 20, low_water: int = 5, retry_delay: float = 30.0, max_retry_delay: float = 600.0):
+        self._fetch = fetch
+        self.filename = filename
+        self.capacity = capacity
+        self.low_water = min(low_water, capacity)
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._quotes = deque(self._load(), maxlen=capacity)
+        self._condition = threading.Condition()
+        self._failures = 0
+        self._retry_at = 0.0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="quote-prefetch", daemon=True)
+        self._worker.start()
+    
+    def __len__(self) -> int:
+        return len(self._quotes)
+    
+    def take(self) -> Optional[str]:
+        # The oldest cached quote, or None when the cache is empty
+        with self._condition:
+            quote = self._quotes.popleft() if self._quotes else None
+            self._condition.notify()
+        return quote
+    
+    def close(self):
+        # Does not wait for a fetch in flight; the worker is a daemon and exits with the process
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._save()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed:
+                    delay = self._retry_at - time.monotonic()
+                    if len(self._quotes) < self.low_water and delay <= 0:
+                        break
+                    self._condition.wait(delay if delay > 0 else None)
+                if self._closed:
+                    return
+            self._refill()
+    
+    def _refill(self):
+        # Bounded attempts, since an endpoint may keep answering with quotes already cached
+        for _ in range(2 * self.capacity):
+            if len(self._quotes) >= self.capacity or self._closed:
+                break
+            try:
+                quote = self._fetch()
+            except Exception:
+                quote = None
+            if not quote:
+                break
+            with self._condition:
+                if quote not in self._quotes:
+                    self._quotes.append(quote)
+        
+        if len(self._quotes) < self.low_water and not self._closed:
+            # Failing or repeating endpoints: wait longer before each further round
+            self._failures += 1
+            delay = min(self.retry_delay * 2 ** (self._failures - 1), self.max_retry_delay)
+            self._retry_at = time.monotonic() + delay
+        else:
+            self._failures = 0
+        self._save()
+    
+    def _load(self) -> list:
+        if not self.filename:
+            return []
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as file:
+                quotes = json.load(file)
+        except (OSError, ValueError):
+            return []
+        return [quote for quote in quotes if isinstance(quote, str)] if isinstance(quotes, list) else []
+    
+    def _save(self):
+        if not self.filename:
+            return
+        with self._condition:
+            quotes = list(self._quotes)
+        data = json.dumps(quotes, indent=2, ensure_ascii=False).encode('utf-8')
+        try:
+            # A lost cache only costs a refill, so the write is atomic but not fsynced
+            atomic_write(self.filename, lambda file: file.write(data), durability='flush')
+        except OSError:
+            pass
\ No newline at end of file
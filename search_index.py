@@ -0,0 +1,305 @@
+import heapq
+import json
+import math
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+from durability import atomic_write
+from task_formats import TaskKey, format_uuid, task_key
+
+INDEX_MAGIC = b'STDLIDX\x01'
+INDEX_VERSION = 2
+
+_TOKEN = re.compile(r'\w+')
+# Superseded documents are dropped once they outnumber the live ones (and past this floor)
+_COMPACT_FLOOR = 1024
+# Documents a limited ranked search walks through postings before switching to set operations
+_WALK_BUDGET = 1024
+
+class SearchIndex:
+    
+    # Inverted index over lowercased task names. Every name is a document with an integer id;
+    # postings for every substring of one to three characters serve substring queries, and
+    # word-token postings (plus a sorted vocabulary for prefix ranges) serve ranked multi-term
+    # queries. Postings are append-only int arrays:
+    # a changed name gets a new document and the old one is only marked dead, so updates never
+    # rewrite postings. Results come back as task keys in the order tasks were first added.
+    
+    def __init__(self):
+        self.rebuild([])
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+    
+    def rebuild(self, tasks: Iterable[Any]):
+        self._keys: List[Optional[TaskKey]] = []
+        self._names: List[str] = []
+        self._docs: Dict[TaskKey, int] = {}
+        self._positions: Dict[TaskKey, int] = {}
+        self._next_position = 0
+        self._grams: Dict[str, array] = {}
+        self._tokens: Dict[str, array] = {}
+        self._vocabulary: List[str] = []
+        # Document ids follow task order until a name changes
+        self._in_order = True
+        for task in tasks:
+            self.add(task)
+    
+    def add(self, task: Any):
+        # Indexes a new task or re-indexes one whose name changed
+        key = task.key
+        name = (task.task_name or '').lower()
+        doc = self._docs.get(key)
+        if doc is not None:
+            if self._names[doc] == name:
+                return
+            self._drop(doc)
+            self._in_order = False
+        else:
+            self._positions[key] = self._next_position
+            self._next_position += 1
+        self._append(key, name)
+        self._maybe_compact()
+    
+    def remove(self, key: TaskKey):
+        doc = self._docs.pop(key, None)
+        if doc is not None:
+            del self._positions[key]
+            self._drop(doc)
+            self._maybe_compact()
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[TaskKey]:
+        # Keys of tasks whose name contains ``query``, case-insensitively; with ``limit`` only the
+        # first ones, which for short queries means only that many postings are read
+        query = query.lower()
+        if not query:
+            docs = range(len(self._keys))
+        elif len(query) <= 3:
+            # Short queries have postings of their own, and they are the answer
+            docs = self._grams.get(query, ())
+        else:
+            postings = [self._grams.get(gram) for gram in _trigrams(query)]
+            if None in postings:
+                return []
+            names = self._names
+            # Every match is in the rarest trigram's postings; the substring test weeds out the rest
+            docs = (doc for doc in min(postings, key=len) if query in names[doc])
+        return self._keys_in_order(docs, limit)
+    
+    def search_ranked(self, query: str, limit: Optional[int] = None) -> List[TaskKey]:
+        # Tasks with a word starting with every query word, best first: rarer words and whole-word
+        # matches score higher, ties keep task order
+        terms = set(_TOKEN.findall(query.lower()))
+        if not terms:
+            return []
+        
+        prefixed = {term: self._prefixed(term) for term in terms}
+        if not all(prefixed.values()):
+            return []
+        if all(len(tokens) == 1 for tokens in prefixed.values()):
+            # One word per term: every match scores the same, so the matches come in task order
+            postings = sorted((self._tokens[tokens[0]] for tokens in prefixed.values()), key=len)
+            if len(postings) == 1:
+                return self._keys_in_order(postings[0], limit)
+            if limit is not None and self._in_order:
+                found = self._first_common(postings, limit)
+                if found is not None:
+                    return found
+        
+        # A document's weight for a term is that of its best word starting with the term, so each
+        # term splits its documents into tiers of equal weight
+        live = max(len(self._docs), 1)
+        term_tiers = []
+        for term, tokens in prefixed.items():
+            by_weight: Dict[float, List[array]] = {}
+            for token in tokens:
+                docs = self._tokens[token]
+                by_weight.setdefault(math.log(1 + live / len(docs)) * len(term) / len(token), []).append(docs)
+            tiers = []
+            matched = set()
+            weights = sorted(by_weight, reverse=True)
+            for weight in weights:
+                docs = set().union(*by_weight[weight])
+                if tiers:
+                    docs -= matched
+                if weight != weights[-1]:
+                    matched |= docs
+                tiers.append((weight, docs))
+            term_tiers.append((sum(len(docs) for _, docs in tiers), tiers))
+        
+        # Intersecting the tiers of every term groups the matches by score, all in set operations;
+        # within a group only task order counts. Rarest terms go first to keep the groups small.
+        term_tiers.sort(key=lambda entry: entry[0])
+        groups = [(weight, docs) for weight, docs in term_tiers[0][1]]
+        for _, tiers in term_tiers[1:]:
+            groups = [(score + weight, matched & docs) for score, matched in groups for weight, docs in tiers]
+            groups = [(score, docs) for score, docs in groups if docs]
+            if not groups:
+                return []
+        by_score: Dict[float, set] = {}
+        for score, docs in groups:
+            by_score[score] = by_score[score] | docs if score in by_score else docs
+        
+        result: List[TaskKey] = []
+        for score in sorted(by_score, reverse=True):
+            wanted = None if limit is None else limit - len(result)
+            if wanted is not None and wanted <= 0:
+                break
+            result.extend(self._keys_in_order(sorted(by_score[score]), wanted))
+        return result
+    
+    def save(self, path: str, signature: Any):
+        # Writes the index tagged with the storage ``signature`` it matches (see load)
+        self._compact()
+        header = {
+            'version': INDEX_VERSION,
+            'byteorder': sys.byteorder,
+            'signature': signature,
+            'ids': [format_uuid(key) if type(key) is bytes else key for key in self._keys],
+            'names': self._names,
+            'grams': [[gram, len(docs)] for gram, docs in self._grams.items()],
+            'tokens': [[token, len(docs)] for token, docs in self._tokens.items()]
+        }
+        encoded = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        
+        def write(file):
+            file.write(INDEX_MAGIC)
+            file.write(struct.pack('<Q', len(encoded)))
+            file.write(encoded)
+            for postings in (self._grams, self._tokens):
+                for docs in postings.values():
+                    docs.tofile(file)
+        
+        atomic_write(path, write, durability='flush')
+    
+    @classmethod
+    def load(cls, path: str, signature: Any) -> Optional['SearchIndex']:
+        # The saved index, or None if it is missing, damaged or was saved for other storage contents
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            if not data.startswith(INDEX_MAGIC):
+                return None
+            offset = len(INDEX_MAGIC)
+            (length,) = struct.unpack_from('<Q', data, offset)
+            offset += 8
+            header = json.loads(data[offset:offset + length].decode('utf-8'))
+            offset += length
+            if header.get('version') != INDEX_VERSION or header.get('signature') != json.loads(json.dumps(signature)):
+                return None
+            
+            index = cls()
+            index._keys = [task_key(task_id) for task_id in header['ids']]
+            index._names = header['names']
+            index._docs = {key: doc for doc, key in enumerate(index._keys)}
+            index._positions = {key: doc for doc, key in enumerate(index._keys)}
+            index._next_position = len(index._keys)
+            itemsize = array('i').itemsize
+            for postings, entries in ((index._grams, header['grams']), (index._tokens, header['tokens'])):
+                for name, count in entries:
+                    docs = array('i')
+                    docs.frombytes(data[offset:offset + count * itemsize])
+                    if len(docs) != count:
+                        return None
+                    if header['byteorder'] != sys.byteorder:
+                        docs.byteswap()
+                    postings[name] = docs
+                    offset += count * itemsize
+            index._vocabulary = sorted(index._tokens)
+            return index
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            return None
+    
+    def _append(self, key: TaskKey, name: str):
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._names.append(name)
+        self._docs[key] = doc
+        for gram in _substrings(name):
+            docs = self._grams.get(gram)
+            if docs is None:
+                docs = self._grams[gram] = array('i')
+            docs.append(doc)
+        for token in set(_TOKEN.findall(name)):
+            docs = self._tokens.get(token)
+            if docs is None:
+                docs = self._tokens[token] = array('i')
+                insort(self._vocabulary, token)
+            docs.append(doc)
+    
+    def _drop(self, doc: int):
+        # Dead documents keep their postings until compaction; an empty name matches no query
+        self._keys[doc] = None
+        self._names[doc] = ''
+    
+    def _prefixed(self, term: str) -> List[str]:
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, term)
+        end = start
+        while end < len(vocabulary) and vocabulary[end].startswith(term):
+            end += 1
+        return vocabulary[start:end]
+    
+    def _first_common(self, postings: List[array], limit: int) -> Optional[List[TaskKey]]:
+        # Keys of the first ``limit`` live documents in every one of the ascending ``postings``,
+        # walking the first and bisecting the others; None once the walk has run past
+        # _WALK_BUDGET documents, when matches are too sparse for it to beat set operations
+        keys = self._keys
+        first, others = postings[0], postings[1:]
+        starts = [0] * len(others)
+        found: List[TaskKey] = []
+        for walked, doc in enumerate(first):
+            if walked == _WALK_BUDGET:
+                return None
+            for number, docs in enumerate(others):
+                index = bisect_left(docs, doc, starts[number])
+                starts[number] = index
+                if index == len(docs) or docs[index] != doc:
+                    break
+            else:
+                key = keys[doc]
+                if key is not None:
+                    found.append(key)
+                    if len(found) == limit:
+                        break
+        return found
+    
+    def _keys_in_order(self, docs: Iterable[int], limit: Optional[int] = None) -> List[TaskKey]:
+        # Keys of the live documents among ``docs`` (ascending), in task order
+        keys = self._keys
+        found = map(keys.__getitem__, docs)
+        if len(keys) != len(self._docs):
+            found = (key for key in found if key is not None)
+        if not self._in_order:
+            if limit is None:
+                return sorted(found, key=self._positions.__getitem__)
+            return heapq.nsmallest(limit, found, key=self._positions.__getitem__)
+        return list(islice(found, limit))
+    
+    def _maybe_compact(self):
+        dead = len(self._keys) - len(self._docs)
+        if dead > _COMPACT_FLOOR and dead > len(self._docs):
+            self._compact()
+    
+    def _compact(self):
+        # Renumbers the live documents in task order, which also restores the in-order fast path
+        if self._in_order and len(self._keys) == len(self._docs):
+            return
+        live = sorted(self._docs, key=self._positions.__getitem__)
+        names = {key: self._names[self._docs[key]] for key in live}
+        self.rebuild([])
+        for key in live:
+            self._positions[key] = self._next_position
+            self._next_position += 1
+            self._append(key, names[key])
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _substrings(text: str) -> set:
+    # Every substring of one to three characters
+    return {text[i:i + size] for size in (1, 2, 3) for i in range(len(text) - size + 1)}
\ No newline at end of file
@@ -0,0 +1,60 @@
+import threading
+from typing import Any, Callable, Optional
+
+class SearchWorker:
+    
+    # Runs queries on a background thread, always for the newest query only. submit() replaces a
+    # query that has not started yet, and the result of a query superseded while it ran is
+    # dropped, so a burst of keystrokes costs at most one search in flight plus the latest one.
+    # ``on_result(query, result, error)`` is called on the worker thread, so a GUI has to hand
+    # it over to its own thread (see TkExecutor.call_soon).
+    
+    def __init__(self, search: Callable[[str], Any],
+                 on_result: Callable[[str, Any, Optional[Exception]], None]):
+        self._search = search
+        self._on_result = on_result
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._query: Optional[str] = None
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="task-search", daemon=True)
+        self._worker.start()
+    
+    def submit(self, query: str):
+        with self._condition:
+            self._generation += 1
+            self._query = query
+            self._condition.notify()
+    
+    def cancel(self):
+        # Forgets the pending query and the result of one in flight
+        with self._condition:
+            self._generation += 1
+            self._query = None
+    
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._query = None
+            self._condition.notify()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._query is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                query, self._query = self._query, None
+                generation = self._generation
+            
+            result, error = None, None
+            try:
+                result = self._search(query)
+            except Exception as e:
+                error = e
+            
+            with self._condition:
+                current = generation == self._generation and not self._closed
+            if current:
+                self._on_result(query, result, error)
\ No newline at end of file
@@ -0,0 +1,231 @@
+import os
+import sqlite3
+import threading
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+from durability import DEFAULT_DURABILITY
+from file_handler import FileHandler, stat_signature
+from task_formats import iter_records
+from exceptions import FileOperationError
+
+# Rows fetched per query when streaming the table
+PAGE_SIZE = 1000
+
+# PRAGMA synchronous per durability level; EXTRA also syncs the directory of the rollback journal
+SYNCHRONOUS = {'none': 'OFF', 'flush': 'OFF', 'fsync': 'FULL', 'fsync+dir': 'EXTRA'}
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+
+COLUMNS = ['id', 'task_name', 'due_date', 'due_time', 'priority', 'completed', 'created_at', 'completed_at']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    task_name TEXT NOT NULL,
+    due_date TEXT,
+    due_time TEXT,
+    priority TEXT,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed_due ON tasks (completed, due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON tasks (created_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('changes', 0);
+"""
+
+# Run inside every write transaction, so the counter tells apart any two committed states
+BUMP_CHANGES = "UPDATE meta SET value = value + 1 WHERE key = 'changes'"
+
+UPSERT = f"""
+INSERT INTO tasks ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)})
+ON CONFLICT(id) DO UPDATE SET {', '.join(f'{column} = excluded.{column}' for column in COLUMNS[1:])}
+"""
+
+class SQLiteTaskStore(FileHandler):
+    
+    # Rows keep their insertion order through ``seq`` so results match the JSON list order.
+    # Query methods return task ids; TaskManager maps them back to its Task objects.
+    
+    incremental = True
+    indexed = True
+    
+    def __init__(self, filename: str = "tasks.json", db_filename: Optional[str] = None, format: str = "json",
+                 durability: str = DEFAULT_DURABILITY):
+        # ``format`` applies to the JSON file a new database is imported from
+        self.json_filename = filename
+        db_filename = db_filename or f"{os.path.splitext(filename)[0]}.db"
+        self._lock = threading.Lock()
+        self._connection = None
+        super().__init__(db_filename, format, durability)
+    
+    def ensure_file_exists(self):
+        is_new = not os.path.exists(self.filename)
+        try:
+            self._connection = sqlite3.connect(self.filename, check_same_thread=False)
+            self._connection.execute(f"PRAGMA synchronous = {SYNCHRONOUS[self.durability]}")
+            self._connection.executescript(SCHEMA)
+        except Exception as e:
+            raise FileOperationError(f"Failed to open task database: {str(e)}")
+        
+        if is_new and os.path.exists(self.json_filename):
+            self._import_json(self.json_filename)
+    
+    def load_tasks(self) -> List[Dict[str, Any]]:
+        return self._select(f"SELECT {', '.join(COLUMNS)} FROM tasks ORDER BY seq")
+    
+    def iter_tasks(self) -> Iterator[Dict[str, Any]]:
+        # Rows added after this call are left out: the caller already holds those tasks
+        end_seq = self._select("SELECT COALESCE(MAX(seq), 0) AS seq FROM tasks")[0]['seq']
+        return self._iter_rows(end_seq)
+    
+    def _iter_rows(self, end_seq: int) -> Iterator[Dict[str, Any]]:
+        # Pages through the table by seq so the lock is never held while the caller works
+        last_seq = 0
+        while True:
+            rows = self._select(f"SELECT seq, {', '.join(COLUMNS)} FROM tasks WHERE seq > ? AND seq <= ? "
+                                f"ORDER BY seq LIMIT ?", (last_seq, end_seq, PAGE_SIZE))
+            for row in rows:
+                last_seq = row.pop('seq')
+                yield row
+            if len(rows) < PAGE_SIZE:
+                return
+    
+    def save_tasks(self, tasks: List[Dict[str, Any]]):
+        try:
+            with self._lock, self._connection:
+                self._connection.execute("DELETE FROM tasks")
+                self._connection.executemany(UPSERT, [_task_row(task) for task in tasks])
+                self._connection.execute(BUMP_CHANGES)
+        except Exception as e:
+            raise FileOperationError(f"Failed to save tasks: {str(e)}")
+    
+    def upsert_tasks(self, tasks: List[Dict[str, Any]]):
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany(UPSERT, [_task_row(task) for task in tasks])
+                self._connection.execute(BUMP_CHANGES)
+        except Exception as e:
+            raise FileOperationError(f"Failed to save tasks: {str(e)}")
+    
+    def delete_tasks(self, task_ids: Iterable[str]):
+        try:
+            with self._lock, self._connection:
+                self._connection.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in task_ids])
+                self._connection.execute(BUMP_CHANGES)
+        except Exception as e:
+            raise FileOperationError(f"Failed to delete tasks: {str(e)}")
+    
+    def signature(self) -> Any:
+        # The change counter moves with every write transaction, from any process, even when a
+        # commit leaves the file's size and mtime as they were. The stat data covers the file being
+        # replaced. (PRAGMA data_version would only cover other connections and resets with each
+        # connection, so it could not validate data saved alongside the database, like the search
+        # index.)
+        return self._changes(), stat_signature(self.filename)
+    
+    def _changes(self) -> int:
+        rows = self._select("SELECT value FROM meta WHERE key = 'changes'")
+        return rows[0]['value'] if rows else 0
+    
+    def backup_tasks(self) -> str:
+        # SQLite updates the database in place, so it cannot be linked; the online backup API
+        # copies its pages into a consistent snapshot instead
+        backup_filename = f"{self.filename}.backup"
+        try:
+            target = sqlite3.connect(backup_filename)
+            try:
+                with self._lock:
+                    self._connection.backup(target)
+            finally:
+                target.close()
+            return backup_filename
+        except Exception as e:
+            raise FileOperationError(f"Failed to create backup: {str(e)}")
+    
+    def restore_from_backup(self, backup_filename: str):
+        try:
+            if not os.path.exists(backup_filename):
+                raise FileOperationError("Backup file not found")
+            with open(backup_filename, 'rb') as file:
+                is_database = file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+            
+            if is_database:
+                # The backup brings its own, older change count; the restored state gets a new one
+                changes = self._changes()
+                source = sqlite3.connect(backup_filename)
+                try:
+                    with self._lock:
+                        source.backup(self._connection)
+                        with self._connection:
+                            self._connection.executescript(SCHEMA)
+                            self._connection.execute("UPDATE meta SET value = ? WHERE key = 'changes'",
+                                                     (changes + 1,))
+                finally:
+                    source.close()
+            else:
+                # A task file backup, as written before backups were database copies
+                self.save_tasks(list(iter_records(backup_filename)))
+        except Exception as e:
+            raise FileOperationError(f"Failed to restore from backup: {str(e)}")
+    
+    def close(self):
+        if self._connection is not None:
+            with self._lock:
+                self._connection.close()
+                self._connection = None
+        super().close()
+    
+    def ids_by_completed(self, completed: bool) -> List[str]:
+        return self._select_ids("WHERE completed = ?", (int(completed),))
+    
+    def ids_by_priority(self, priority: str) -> List[str]:
+        return self._select_ids("WHERE priority = ?", (priority,))
+    
+    def _select_ids(self, where: str, params: tuple) -> List[str]:
+        return [row['id'] for row in self._select(f"SELECT id FROM tasks {where} ORDER BY seq", params)]
+    
+    def _select(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        try:
+            with self._lock:
+                cursor = self._connection.execute(query, params)
+                names = [column[0] for column in cursor.description]
+                rows = cursor.fetchall()
+        except Exception as e:
+            raise FileOperationError(f"Failed to query tasks: {str(e)}")
+        
+        tasks = []
+        for row in rows:
+            task = dict(zip(names, row))
+            if 'completed' in task:
+                task['completed'] = bool(task['completed'])
+            tasks.append(task)
+        return tasks
+    
+    def _import_json(self, json_filename: str):
+        try:
+            tasks = list(iter_records(json_filename))
+        except Exception as e:
+            raise FileOperationError(f"Failed to migrate {json_filename}: {str(e)}")
+        self.save_tasks(tasks)
+
+def migrate_json_to_sqlite(json_filename: str = "tasks.json", db_filename: Optional[str] = None) -> int:
+    store = SQLiteTaskStore(json_filename, db_filename)
+    try:
+        if not store.load_tasks():
+            store._import_json(json_filename)
+        return len(store.load_tasks())
+    finally:
+        store.close()
+
+def _task_row(task: Dict[str, Any]) -> tuple:
+    row = [task.get(column) for column in COLUMNS]
+    row[COLUMNS.index('completed')] = int(bool(task.get('completed')))
+    row[COLUMNS.index('task_name')] = task.get('task_name') or ''
+    return tuple(row)
\ No newline at end of file
@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+TASK_ADDED = "added"
+TASK_UPDATED = "updated"
+TASK_COMPLETED = "completed"
+TASK_DELETED = "deleted"
+TASKS_LOADED = "loaded"
+
+class TaskEvent:
+    
+    def __init__(self, kind: str, task=None, task_id: Optional[str] = None,
+                 changes: Optional[Dict[str, Tuple[Any, Any]]] = None):
+        self.kind = kind
+        self.task = task
+        self.task_id = task_id or (task.id if task is not None else None)
+        # Field name -> (old value, new value) for updated and completed events
+        self.changes = changes or {}
+    
+    def __repr__(self) -> str:
+        return f"TaskEvent({self.kind!r}, task_id={self.task_id!r}, changes={self.changes!r})"
+
+def coalesce_events(events: List[TaskEvent]) -> List[TaskEvent]:
+    # Collapse a burst into at most one event per task, in order of first appearance.
+    # A bulk load supersedes everything before it.
+    merged: Dict[str, TaskEvent] = {}
+    head: List[TaskEvent] = []
+    
+    for event in events:
+        if event.kind == TASKS_LOADED:
+            head = [event]
+            merged = {}
+            continue
+        
+        previous = merged.get(event.task_id)
+        if previous is None:
+            merged[event.task_id] = event
+        elif event.kind == TASK_DELETED:
+            if previous.kind == TASK_ADDED:
+                del merged[event.task_id]
+            else:
+                merged[event.task_id] = event
+        elif previous.kind == TASK_ADDED:
+            merged[event.task_id] = TaskEvent(TASK_ADDED, event.task)
+        elif previous.kind == TASK_DELETED:
+            merged[event.task_id] = event
+        else:
+            changes = dict(previous.changes)
+            for field, (old, new) in event.changes.items():
+                old = changes[field][0] if field in changes else old
+                if old == new:
+                    # Changed and changed back within the burst
+                    changes.pop(field, None)
+                else:
+                    changes[field] = (old, new)
+            # The later kind, except that an edit after a completion still reports the completion
+            # as long as the task ends up completed
+            kind = event.kind
+            if kind == TASK_UPDATED and previous.kind == TASK_COMPLETED and event.task.completed:
+                kind = TASK_COMPLETED
+            merged[event.task_id] = TaskEvent(kind, event.task, changes=changes)
+    
+    return head + list(merged.values())
\ No newline at end of file
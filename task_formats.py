@@ -0,0 +1,402 @@
+import codecs
+import json
+import mmap
+import os
+import re
+import struct
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from durability import DEFAULT_DURABILITY, atomic_write
+
+# On-disk layouts for task lists. Every reader streams records, and load auto-detects the format:
+#   json    a pretty-printed top-level array (the original tasks.json layout)
+#   ndjson  one compact JSON object per line
+#   binary  BINARY_MAGIC followed by blocks of records stored column by column
+FORMATS = ('json', 'ndjson', 'binary')
+BINARY_MAGIC = b'STDLBIN\x02'
+
+READ_CHUNK_SIZE = 1024 * 1024
+# Files at least this large are read through a memory map
+MMAP_THRESHOLD = 64 * 1024 * 1024
+# Tasks encoded per json.dumps call, and records per binary block
+JSON_CHUNK_SIZE = 1000
+BINARY_BLOCK_SIZE = 1000
+
+FIELDS = ('id', 'task_name', 'due_date', 'due_time', 'priority', 'completed', 'created_at', 'completed_at')
+
+TaskKey = Union[bytes, str]
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def task_key(task_id: Any) -> TaskKey:
+    # Canonical lowercase UUID strings are keyed by their 16 raw bytes; any other id is kept as is
+    if type(task_id) is str and len(task_id) == 36 and task_id[8] == task_id[13] == task_id[18] == task_id[23] == '-':
+        digits = task_id.replace('-', '')
+        try:
+            raw = bytes.fromhex(digits)
+        except ValueError:
+            return task_id
+        if len(raw) == 16 and raw.hex() == digits:
+            return raw
+    return task_id
+
+def format_uuid(raw: bytes) -> str:
+    digits = raw.hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+def pack_timestamp(value: Any) -> Any:
+    # Timestamps laid out exactly as naive datetime.isoformat() writes them are stored as
+    # integer microseconds since the epoch; anything else is kept verbatim
+    if (type(value) is str and len(value) in (19, 26) and value[10] == 'T'
+            and value[4] == value[7] == '-' and value[13] == value[16] == ':'):
+        if len(value) == 26 and (value[19] != '.' or value.endswith('.000000')):
+            return value
+        try:
+            return (datetime.fromisoformat(value) - _EPOCH) // _MICROSECOND
+        except (ValueError, TypeError):
+            return value
+    return value
+
+def unpack_timestamp(value: Any) -> Any:
+    if type(value) is int:
+        return (_EPOCH + timedelta(0, 0, value)).isoformat()
+    return value
+
+def timestamp_micros(moment: datetime) -> int:
+    return (moment - _EPOCH) // _MICROSECOND
+
+def iter_json_array(path: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    # Yields the elements of a top-level JSON array as they are decoded, holding one chunk plus
+    # at most one partial element. An empty file is an empty array.
+    decoder = json.JSONDecoder()
+    chunks = _read_text_chunks(path, chunk_size)
+    buffer = ''
+    position = 0
+    exhausted = False
+    # '[' before the array, 'first'/'value' where an element may start, ',' after one, 'end' after ']'
+    expect = '['
+    
+    # Whether the current buffer may still hold a run of whole elements for _decode_run
+    run_pending = True
+    
+    def read_more() -> bool:
+        nonlocal buffer, position, exhausted, run_pending
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        run_pending = True
+        return True
+    
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position == len(buffer):
+            if read_more():
+                continue
+            break
+        
+        char = buffer[position]
+        if expect == '[':
+            if char != '[':
+                raise json.JSONDecodeError("Expecting a top-level array", buffer, position)
+            position += 1
+            expect = 'first'
+        elif expect == 'first' and char == ']':
+            position += 1
+            expect = 'end'
+        elif expect in ('first', 'value'):
+            if run_pending:
+                run_pending = False
+                values, end = _decode_run(buffer, position)
+                if values:
+                    position = end
+                    expect = 'value'
+                    yield from values
+                    continue
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Most likely an element cut off by the chunk boundary
+                if read_more():
+                    continue
+                raise
+            following = _WHITESPACE.match(buffer, end).end()
+            if (following == len(buffer) or buffer[following] not in ',]') and not exhausted and read_more():
+                # A number cut by the chunk boundary decodes early; wait until its delimiter is in view
+                continue
+            position = end
+            expect = ','
+            yield value
+        elif expect == ',':
+            if char not in ',]':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+            position += 1
+            expect = 'value' if char == ',' else 'end'
+        else:
+            raise json.JSONDecodeError("Extra data", buffer, position)
+    
+    if expect not in ('[', 'end'):
+        raise json.JSONDecodeError("Unterminated array", buffer, position)
+
+def _decode_run(buffer: str, position: int, attempts: int = 2) -> Tuple[List[Any], int]:
+    # Decodes every whole element from ``position`` up to the last "}," or "]," in one
+    # json.loads call, returning the values and the offset past that comma. A cut below the top
+    # level or inside a string leaves the slice unbalanced and fails to decode, so a successful
+    # decode always splits on a real element boundary.
+    end = len(buffer)
+    for _ in range(attempts):
+        close = max(buffer.rfind('}', position, end), buffer.rfind(']', position, end))
+        if close < 0:
+            break
+        end = close
+        cut = _WHITESPACE.match(buffer, close + 1).end()
+        if cut == len(buffer) or buffer[cut] != ',':
+            continue
+        try:
+            return json.loads(f"[{buffer[position:close + 1]}]"), cut + 1
+        except json.JSONDecodeError:
+            continue
+    return [], position
+
+def _read_text_chunks(path: str, chunk_size: int) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, 'madvise'):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                for offset in range(0, size, chunk_size):
+                    yield decoder.decode(mapped[offset:offset + chunk_size])
+        else:
+            for block in iter(lambda: file.read(chunk_size), b''):
+                yield decoder.decode(block)
+    yield decoder.decode(b'', final=True)
+
+def detect_format(path: str) -> str:
+    # The binary magic, else the first significant byte: '{' starts NDJSON, anything else JSON
+    with open(path, 'rb') as file:
+        head = file.read(4096)
+    if head.startswith(BINARY_MAGIC[:-1]):
+        # Any version, so an unsupported one fails with a clear error rather than as bad JSON
+        return 'binary'
+    stripped = head.lstrip(b' \t\r\n')
+    return 'ndjson' if stripped.startswith(b'{') else 'json'
+
+def iter_records(path: str, format: Optional[str] = None, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    format = format or detect_format(path)
+    if format == 'json':
+        yield from iter_json_array(path, chunk_size)
+    elif format == 'ndjson':
+        yield from _iter_ndjson(path, chunk_size)
+    elif format == 'binary':
+        yield from _iter_binary(path)
+    else:
+        raise ValueError(f"Unknown file format: {format}")
+
+def write_records(file: BinaryIO, tasks: Iterable[Dict[str, Any]], format: str = 'json'):
+    # Streams ``tasks`` into a binary file object; the json layout matches json.dump(indent=2)
+    if format == 'json':
+        _write_json(file, tasks)
+    elif format == 'ndjson':
+        _write_ndjson(file, tasks)
+    elif format == 'binary':
+        _write_binary(file, tasks)
+    else:
+        raise ValueError(f"Unknown file format: {format}")
+
+def write_records_atomic(path: str, tasks: Iterable[Dict[str, Any]], format: str = 'json',
+                         durability: str = DEFAULT_DURABILITY):
+    # Replaces ``path`` through a temporary file at the given durability level (see durability)
+    atomic_write(path, lambda file: write_records(file, tasks, format), durability)
+
+def convert_tasks_file(source: str, destination: Optional[str] = None, format: str = 'ndjson') -> int:
+    # Rewrites ``source`` (any format) as ``format``, in place unless ``destination`` is given.
+    # Records stream straight through and the result replaces the destination atomically.
+    count = 0
+    
+    def counted(records: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        nonlocal count
+        for record in records:
+            count += 1
+            yield record
+    
+    write_records_atomic(destination or source, counted(iter_records(source)), format)
+    return count
+
+def _write_json(file: BinaryIO, tasks: Iterable[Dict[str, Any]]):
+    # Encoded JSON_CHUNK_SIZE tasks per json.dumps call, each chunk's array brackets trimmed off,
+    # so the output is byte for byte what json.dump(indent=2) writes without holding it all
+    tasks = iter(tasks)
+    separator = b'[\n'
+    while True:
+        chunk = list(islice(tasks, JSON_CHUNK_SIZE))
+        if not chunk:
+            break
+        file.write(separator)
+        file.write(json.dumps(chunk, indent=2, ensure_ascii=False)[2:-2].encode('utf-8'))
+        separator = b',\n'
+    file.write(b'[]' if separator == b'[\n' else b'\n]')
+
+def _write_ndjson(file: BinaryIO, tasks: Iterable[Dict[str, Any]]):
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    lines = []
+    for task in tasks:
+        lines.append(encode(task))
+        if len(lines) >= 1000:
+            file.write(('\n'.join(lines) + '\n').encode('utf-8'))
+            lines = []
+    if lines:
+        file.write(('\n'.join(lines) + '\n').encode('utf-8'))
+
+def _iter_ndjson(path: str, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    line_number = 0
+    with open(path, 'rb') as file:
+        while True:
+            lines = file.readlines(chunk_size)
+            if not lines:
+                return
+            numbered = [(line_number + offset, line) for offset, line in enumerate(lines, 1) if line.strip()]
+            line_number += len(lines)
+            if not numbered:
+                continue
+            
+            # One decode for the whole batch; the count check catches a line holding two values
+            try:
+                records = json.loads(b'[' + b','.join(line for _, line in numbered) + b']')
+            except json.JSONDecodeError:
+                records = None
+            if records is not None and len(records) == len(numbered):
+                yield from records
+                continue
+            
+            for number, line in numbered:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid JSON on line {number}: {e.msg}")
+
+# Binary files hold blocks of up to BINARY_BLOCK_SIZE records, each behind a little-endian
+# (kind, record count, body length) header. A column block stores the records field by field:
+# one byte per completed flag, then every other field of every record as UTF-8 text joined by
+# NUL, None written as _NULL, so a block decodes with one decode() and one split(). Blocks with
+# records that do not fit that shape (extra keys, non-string values, NUL or _NULL in a value)
+# are stored as a compact JSON array instead.
+_BLOCK = struct.Struct('<BII')
+_BLOCK_COLUMNS = 0
+_BLOCK_JSON = 1
+_NULL = '\x01'
+_TEXT_FIELDS = tuple(field for field in FIELDS if field != 'completed')
+
+def _encode_columns(tasks: List[Dict[str, Any]]) -> Optional[bytes]:
+    flags = bytearray()
+    for task in tasks:
+        if tuple(task) != FIELDS or type(task['completed']) is not bool:
+            return None
+        flags.append(task['completed'])
+    
+    values = []
+    nulls = 0
+    for field in _TEXT_FIELDS:
+        for task in tasks:
+            value = task[field]
+            if value is None:
+                values.append(_NULL)
+                nulls += 1
+            elif type(value) is str:
+                values.append(value)
+            else:
+                return None
+    text = '\x00'.join(values)
+    if text.count('\x00') != len(values) - 1 or text.count(_NULL) != nulls:
+        return None
+    return bytes(flags) + text.encode('utf-8')
+
+def _encode_block(tasks: List[Dict[str, Any]]) -> bytes:
+    body = _encode_columns(tasks)
+    kind = _BLOCK_COLUMNS
+    if body is None:
+        body = json.dumps(tasks, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        kind = _BLOCK_JSON
+    return _BLOCK.pack(kind, len(tasks), len(body)) + body
+
+def _decode_columns(body: bytes, count: int) -> List[Dict[str, Any]]:
+    text = body[count:].decode('utf-8')
+    values = text.split('\x00')
+    if len(values) != count * len(_TEXT_FIELDS):
+        raise ValueError("Corrupt binary task file: field count mismatch")
+    if _NULL in text:
+        values = [None if value == _NULL else value for value in values]
+    ids, names, due_dates, due_times, priorities, created, completed_at = (
+        values[index * count:(index + 1) * count] for index in range(len(_TEXT_FIELDS)))
+    return [{'id': task_id, 'task_name': name, 'due_date': due_date, 'due_time': due_time,
+             'priority': priority, 'completed': flag == 1, 'created_at': created_at,
+             'completed_at': completed}
+            for task_id, name, due_date, due_time, priority, flag, created_at, completed
+            in zip(ids, names, due_dates, due_times, priorities, body[:count], created, completed_at)]
+
+def _write_binary(file: BinaryIO, tasks: Iterable[Dict[str, Any]]):
+    file.write(BINARY_MAGIC)
+    tasks = iter(tasks)
+    while True:
+        block = list(islice(tasks, BINARY_BLOCK_SIZE))
+        if not block:
+            break
+        file.write(_encode_block(block))
+
+def _iter_binary(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, 'rb') as file:
+        magic = file.read(len(BINARY_MAGIC))
+        if magic[:-1] != BINARY_MAGIC[:-1]:
+            raise ValueError("Not a binary task file")
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"Unsupported binary task file version {magic[-1]}")
+        while True:
+            header = file.read(_BLOCK.size)
+            if not header:
+                return
+            if len(header) < _BLOCK.size:
+                raise ValueError("Truncated binary task file")
+            kind, count, size = _BLOCK.unpack(header)
+            body = file.read(size)
+            if len(body) < size:
+                raise ValueError("Truncated binary task file")
+            if kind == _BLOCK_COLUMNS:
+                records = _decode_columns(body, count)
+            elif kind == _BLOCK_JSON:
+                records = json.loads(body)
+                if len(records) != count:
+                    raise ValueError("Corrupt binary task file: record count mismatch")
+            else:
+                raise ValueError(f"Corrupt binary task file: unknown block kind {kind}")
+            yield from records
+
+def main():
+    # Only the command line needs argparse, so importing this module does not load it
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Inspect and convert task files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    detect = subparsers.add_parser("detect", help="Print the format of a task file")
+    detect.add_argument("path")
+    
+    convert = subparsers.add_parser("convert", help="Rewrite a task file in another format")
+    convert.add_argument("source")
+    convert.add_argument("destination", nargs="?", help="Defaults to converting in place")
+    convert.add_argument("--to", dest="format", choices=FORMATS, required=True)
+    
+    args = parser.parse_args()
+    if args.command == "detect":
+        print(detect_format(args.path))
+    else:
+        count = convert_tasks_file(args.source, args.destination, args.format)
+        print(f"Wrote {count} tasks to {args.destination or args.source} as {args.format}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
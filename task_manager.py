@@ -1,104 +1,807 @@
+import bisect
+import sys
+import threading
 import uuid
+from collections import deque
+from itertools import islice
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from file_handler import FileHandler
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable, Iterator, Union, TextIO
+from file_handler import create_file_handler
+from persistence import PersistenceScheduler
+from task_formats import TaskKey, task_key, format_uuid, pack_timestamp, unpack_timestamp, timestamp_micros
 from nlp_parser import NLPParser
-from exceptions import TaskNotFoundError, TaskParsingError
+from search_index import SearchIndex
+from task_events import (TaskEvent, coalesce_events, TASK_ADDED, TASK_UPDATED, TASK_COMPLETED,
+                         TASK_DELETED, TASKS_LOADED)
+from exceptions import TaskNotFoundError, TaskParsingError, FileOperationError
+
+# Task fields update_task sets; other keys, like the id (the index key) or derived properties
+# such as due_start, are ignored
+EDITABLE_FIELDS = frozenset(('task_name', 'due_date', 'due_time', 'priority', 'completed',
+                             'created_at', 'completed_at'))
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
 
 class Task:
     
+    # Compact representation for large archives: no per-instance __dict__, UUIDs as raw bytes,
+    # timestamps as integers and shared strings for the small vocabularies of priorities and
+    # due dates/times. String and dict forms are produced on access.
+    __slots__ = ('_key', 'task_name', '_due_date', '_due_time', '_priority', 'completed',
+                 '_created_at', '_completed_at', '_due_parsed', '_due_start', '_due_at')
+    
     def __init__(self, task_id: Optional[str] = None, task_name: str = "", due_date: Optional[str] = None, 
                  due_time: Optional[str] = None, priority: str = "Medium", completed: bool = False,
                  created_at: Optional[str] = None, completed_at: Optional[str] = None):
-        self.id = task_id or str(uuid.uuid4())
+        self._key = task_key(task_id) if task_id else uuid.uuid4().bytes
         self.task_name = task_name
-        self.due_date = due_date
-        self.due_time = due_time
-        self.priority = priority
+        self._due_date = _intern(due_date)
+        self._due_time = _intern(due_time)
+        self._due_parsed = False
+        self._priority = _intern(priority)
         self.completed = completed
-        self.created_at = created_at or datetime.now().isoformat()
-        self.completed_at = completed_at
+        if created_at:
+            self._created_at = pack_timestamp(created_at)
+        else:
+            self._created_at = timestamp_micros(datetime.now())
+        self._completed_at = pack_timestamp(completed_at)
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             'id': self.id,
             'task_name': self.task_name,
-            'due_date': self.due_date,
-            'due_time': self.due_time,
-            'priority': self.priority,
+            'due_date': self._due_date,
+            'due_time': self._due_time,
+            'priority': self._priority,
             'completed': self.completed,
-            'created_at': self.created_at,
-            'completed_at': self.completed_at
+            'created_at': unpack_timestamp(self._created_at),
+            'completed_at': unpack_timestamp(self._completed_at)
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Task':
-        task_data = data.copy()
-        if 'id' in task_data:
-            task_data['task_id'] = task_data.pop('id')
-        return cls(**task_data)
+        return cls(data.get('id'), data.get('task_name', ""), data.get('due_date'), data.get('due_time'),
+                   data.get('priority', "Medium"), data.get('completed', False),
+                   data.get('created_at'), data.get('completed_at'))
+    
+    @property
+    def key(self) -> TaskKey:
+        # Compact form of the id used by TaskManager's indexes
+        return self._key
+    
+    @property
+    def id(self) -> str:
+        key = self._key
+        return format_uuid(key) if type(key) is bytes else key
+    
+    @id.setter
+    def id(self, value: str):
+        self._key = task_key(value)
+    
+    @property
+    def priority(self) -> str:
+        return self._priority
+    
+    @priority.setter
+    def priority(self, value: str):
+        self._priority = _intern(value)
+    
+    @property
+    def created_at(self) -> Optional[str]:
+        return unpack_timestamp(self._created_at)
+    
+    @created_at.setter
+    def created_at(self, value: Optional[str]):
+        self._created_at = pack_timestamp(value)
+    
+    @property
+    def completed_at(self) -> Optional[str]:
+        return unpack_timestamp(self._completed_at)
+    
+    @completed_at.setter
+    def completed_at(self, value: Optional[str]):
+        self._completed_at = pack_timestamp(value)
+    
+    @property
+    def due_date(self) -> Optional[str]:
+        return self._due_date
+    
+    @due_date.setter
+    def due_date(self, value: Optional[str]):
+        self._due_date = _intern(value)
+        self._due_parsed = False
+    
+    @property
+    def due_time(self) -> Optional[str]:
+        return self._due_time
+    
+    @due_time.setter
+    def due_time(self, value: Optional[str]):
+        self._due_time = _intern(value)
+        self._due_parsed = False
+    
+    @property
+    def due_start(self) -> Optional[datetime]:
+        if not self._due_parsed:
+            self._parse_due()
+        return self._due_start
+    
+    @property
+    def due_datetime(self) -> Optional[datetime]:
+        if not self._due_parsed:
+            self._parse_due()
+        return self._due_at
     
-    def is_overdue(self) -> bool:
+    def _parse_due(self):
+        # Cached until due_date or due_time is reassigned
+        self._due_start = None
+        self._due_at = None
+        if self._due_date:
+            try:
+                self._due_start = datetime.fromisoformat(self._due_date)
+                if self._due_start.tzinfo is not None:
+                    # Compared with naive local datetimes everywhere, so an offset becomes local time
+                    self._due_start = self._due_start.astimezone().replace(tzinfo=None)
+                due_datetime = self._due_start
+                if self._due_time:
+                    time_str = self._due_time.replace(' ', '')
+                    if time_str.upper().endswith(('AM', 'PM')):
+                        due_datetime = datetime.strptime(f"{self._due_date} {self._due_time}", 
+                                                       "%Y-%m-%d %I:%M %p")
+                    else:
+                        due_datetime = datetime.strptime(f"{self._due_date} {self._due_time}", 
+                                                       "%Y-%m-%d %H:%M")
+                self._due_at = due_datetime
+            except (ValueError, TypeError):
+                pass
+        self._due_parsed = True
+    
+    def is_overdue(self, now: Optional[datetime] = None) -> bool:
         if not self.due_date or self.completed:
             return False
         
-        try:
-            due_datetime = datetime.fromisoformat(self.due_date)
-            if self.due_time:
-                time_str = self.due_time.replace(' ', '')
-                if time_str.upper().endswith(('AM', 'PM')):
-                    due_datetime = datetime.strptime(f"{self.due_date} {self.due_time}", 
-                                                   "%Y-%m-%d %I:%M %p")
-                else:
-                    due_datetime = datetime.strptime(f"{self.due_date} {self.due_time}", 
-                                                   "%Y-%m-%d %H:%M")
-            return due_datetime < datetime.now()
-        except (ValueError, TypeError):
-            return False
+        due_datetime = self.due_datetime
+        return due_datetime is not None and due_datetime < (now or datetime.now())
     
-    def is_due_today(self) -> bool:
-        if not self.due_date:
-            return False
+    def is_due_today(self, now: Optional[datetime] = None) -> bool:
+        due_start = self.due_start
+        return due_start is not None and due_start.date() == (now or datetime.now()).date()
+
+class DeadlineIndex:
+    
+    # Sorted (key, ordinal, task key) entries with at most one entry per task. Raw-UUID and
+    # string task keys don't order against each other, so ties break on a unique ordinal instead.
+    
+    def __init__(self):
+        self._entries: List[Tuple[Any, int, TaskKey]] = []
+        self._keys: Dict[TaskKey, Tuple[Any, int]] = {}
+        self._next_ordinal = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def rebuild(self, pairs: List[Tuple[Any, TaskKey]]):
+        self._entries = sorted((key, ordinal, task_key) for ordinal, (key, task_key) in enumerate(pairs))
+        self._keys = {task_key: (key, ordinal) for key, ordinal, task_key in self._entries}
+        self._next_ordinal = len(pairs)
+    
+    def add(self, task_key: TaskKey, key: Any):
+        self.discard(task_key)
+        ordinal = self._next_ordinal
+        self._next_ordinal += 1
+        bisect.insort(self._entries, (key, ordinal, task_key))
+        self._keys[task_key] = (key, ordinal)
+    
+    def discard(self, task_key: TaskKey) -> Optional[Any]:
+        entry = self._keys.pop(task_key, None)
+        if entry is None:
+            return None
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position][:2] == entry:
+            del self._entries[position]
+        return entry[0]
+    
+    def count_before(self, bound: Any) -> int:
+        return bisect.bisect_left(self._entries, (bound, -1))
+    
+    def count_between(self, start: Any, end: Any) -> int:
+        return max(0, self.count_before(end) - self.count_before(start))
+    
+    def keys_between(self, start: Optional[Any], end: Any) -> List[TaskKey]:
+        low = 0 if start is None else bisect.bisect_left(self._entries, (start, -1))
+        high = bisect.bisect_left(self._entries, (end, -1))
+        return [task_key for _, _, task_key in self._entries[low:high]]
+
+class TaskStats:
+    
+    # Running counters updated in O(1) per mutation. The overdue and due-today counts are
+    # relative to a clock watermark and roll forward along the deadline indexes on read.
+    
+    def __init__(self, deadlines: DeadlineIndex, due_days: DeadlineIndex):
+        self._deadlines = deadlines
+        self._due_days = due_days
+        self.reset()
+    
+    def reset(self, total: int = 0, completed_ids: Optional[set] = None):
+        self.total = total
+        self._completed_ids = completed_ids or set()
+        self._overdue = 0
+        self._overdue_until: Optional[datetime] = None
+        self._due_today = 0
+        self._today = None
+    
+    @property
+    def completed(self) -> int:
+        return len(self._completed_ids)
+    
+    @property
+    def pending(self) -> int:
+        return self.total - self.completed
+    
+    def set_completed(self, key: TaskKey, completed: bool):
+        if completed:
+            self._completed_ids.add(key)
+        else:
+            self._completed_ids.discard(key)
+    
+    def deadline_added(self, due_datetime: datetime):
+        if self._overdue_until is not None and due_datetime < self._overdue_until:
+            self._overdue += 1
+    
+    def deadline_removed(self, due_datetime: datetime):
+        if self._overdue_until is not None and due_datetime < self._overdue_until:
+            self._overdue -= 1
+    
+    def due_day_added(self, day):
+        if day == self._today:
+            self._due_today += 1
+    
+    def due_day_removed(self, day):
+        if day == self._today:
+            self._due_today -= 1
+    
+    def roll_over(self, now: datetime):
+        if self._overdue_until is None or now < self._overdue_until:
+            self._overdue = self._deadlines.count_before(now)
+        else:
+            # Only deadlines that passed since the last read need counting
+            self._overdue += self._deadlines.count_between(self._overdue_until, now)
+        self._overdue_until = now
         
-        try:
-            due_date = datetime.fromisoformat(self.due_date).date()
-            return due_date == datetime.now().date()
-        except (ValueError, TypeError):
-            return False
+        today = now.date()
+        if today != self._today:
+            self._due_today = self._due_days.count_between(today, today + timedelta(days=1))
+            self._today = today
+    
+    def as_dict(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        self.roll_over(now or datetime.now())
+        return {
+            'total': self.total,
+            'pending': self.pending,
+            'completed': self.completed,
+            'overdue': self._overdue,
+            'due_today': self._due_today
+        }
+
+class StorageChanges:
+    
+    # What TaskManager.read_changes() found in storage, parsed and ready to merge
+    
+    def __init__(self, base: Any, signature: Any, tasks: List['Task'], deleted_ids: Optional[List[str]],
+                 protected: set):
+        # Signature the read started from, and the one it brought storage up to
+        self.base = base
+        self.signature = signature
+        self.tasks = tasks
+        # None when ``tasks`` is the complete list, so anything missing from it was deleted
+        self.deleted_ids = deleted_ids
+        # Keys with local changes not yet written when the read started
+        self.protected = protected
 
 class TaskManager:
     
-    def __init__(self, filename: str = "tasks.json"):
-        self.file_handler = FileHandler(filename)
+    def __init__(self, filename: str = "tasks.json", storage: str = "json", columnar: bool = False,
+                 autoload: bool = True, file_format: str = "json", autosave: bool = False,
+                 debounce: float = 0.5, max_latency: float = 5.0, durability: str = "fsync",
+                 search_index: bool = False):
+        self.file_handler = create_file_handler(filename, storage, format=file_format, durability=durability)
         self.nlp_parser = NLPParser()
-        self.tasks: List[Task] = self._load_tasks()
+        # Insertion-ordered task key -> Task map: O(1) lookup and delete while keeping list order
+        self._tasks: Dict[TaskKey, Task] = {}
+        # List position of each task, so index hits can be put back in list order
+        self._positions: Dict[TaskKey, int] = {}
+        self._next_position = 0
+        # Pending tasks keyed by due datetime (with an unparseable due time: by due date),
+        # and every dated task keyed by due day
+        self._deadlines = DeadlineIndex()
+        self._loose_deadlines = DeadlineIndex()
+        self._due_days = DeadlineIndex()
+        self.stats = TaskStats(self._deadlines, self._due_days)
+        # Optional column store for counts, group-bys and priority filters over large archives
+        self._table = None
+        if columnar:
+            # Only the columnar mode needs task_table, which loads NumPy when it is installed
+            from task_table import TaskTable
+            self._table = TaskTable()
+        # Optional full-text index for search_tasks, saved next to the storage on close
+        self._search = SearchIndex() if search_index else None
+        # Guards the index, so searches may run on another thread while this one edits tasks
+        self._search_lock = threading.Lock()
+        self._search_filename = f"{self.file_handler.filename}.index"
+        self._subscribers: List[Tuple[Callable[[List[TaskEvent]], None], bool]] = []
+        self._pending_events: List[TaskEvent] = []
+        self._batch_depth = 0
+        # Storage stream of a load that is still in progress (see load_progressively)
+        self._loader = None
+        # With autosave, mutations only queue their writes and a background worker coalesces them
+        self._persistence = None
+        self._pending_lock = threading.Lock()
+        # Insertion-ordered, so new tasks reach an append-only store in list order
+        self._pending_keys: Dict[TaskKey, None] = {}
+        self._pending_deletes: List[str] = []
+        self._snapshot_pending = False
+        # Changes the worker has taken but not finished writing; sync() keeps protecting them
+        self._keys_in_flight: Dict[TaskKey, None] = {}
+        self._deletes_in_flight: List[str] = []
+        # Storage signature as of the last load, sync or in-sync write; anything else that moves
+        # it was saved by another process (see sync)
+        self._storage_signature = None
+        self._start_loading()
+        if autoload:
+            self._finish_loading()
+        if autosave:
+            self._persistence = PersistenceScheduler(self._write_pending, debounce, max_latency)
+    
+    @property
+    def tasks(self) -> List[Task]:
+        return list(self._tasks.values())
+    
+    @property
+    def loading(self) -> bool:
+        return self._loader is not None
+    
+    def reload(self):
+        self._start_loading()
+        self._finish_loading()
+    
+    def load_progressively(self, batch_size: int = 1000) -> Iterator[List[Task]]:
+        # Yields tasks in storage order as they are parsed, so a caller can show the first ones
+        # while the rest stream in. Continues a load deferred by autoload=False, otherwise starts
+        # a fresh one. Indexes, stats and TASKS_LOADED follow once the last batch is in.
+        if self._loader is None:
+            self._start_loading()
+        while self._loader is not None:
+            batch = self._load_batch(batch_size)
+            if batch:
+                yield batch
+    
+    def _start_loading(self):
+        self._tasks = {}
+        self._positions = {}
+        self._next_position = 0
+        self._storage_signature = self.file_handler.signature()
+        self._loader = iter(self.file_handler.iter_tasks())
+    
+    def _load_batch(self, batch_size: int) -> List[Task]:
+        batch = []
+        try:
+            for task_dict in islice(self._loader, batch_size):
+                task = Task.from_dict(task_dict)
+                self._tasks[task.key] = task
+                batch.append(task)
+        except Exception:
+            # Start over on the next attempt so a save can never write out a partial list
+            self._start_loading()
+            raise
+        
+        if len(batch) < batch_size:
+            self._loader = None
+            self._rebuild_indexes()
+            self._emit(TaskEvent(TASKS_LOADED))
+            if self._persistence is not None and self._snapshot_pending:
+                # A snapshot save deferred while the load was running
+                self._persistence.mark_dirty()
+        return batch
+    
+    def _finish_loading(self):
+        while self._loader is not None:
+            self._load_batch(10000)
+    
+    def subscribe(self, callback: Callable[[List[TaskEvent]], None], coalesce: bool = False) -> Callable[[], None]:
+        # Callbacks receive a list of events. Coalescing subscribers get one merged list per
+        # batch() block instead of one call per mutation.
+        subscriber = (callback, coalesce)
+        self._subscribers.append(subscriber)
+        
+        def unsubscribe():
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+        
+        return unsubscribe
+    
+    @contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush_events()
+    
+    def _emit(self, event: TaskEvent):
+        coalescing = False
+        for callback, coalesce in list(self._subscribers):
+            if coalesce:
+                coalescing = True
+            else:
+                callback([event])
+        
+        if coalescing:
+            self._pending_events.append(event)
+            if self._batch_depth == 0:
+                self._flush_events()
+    
+    def _flush_events(self):
+        events = coalesce_events(self._pending_events)
+        self._pending_events = []
+        if not events:
+            return
+        for callback, coalesce in list(self._subscribers):
+            if coalesce:
+                callback(events)
+    
+    def _rebuild_indexes(self):
+        self._positions = {key: position for position, key in enumerate(self._tasks)}
+        self._next_position = len(self._positions)
+        deadlines = []
+        loose_deadlines = []
+        due_days = []
+        completed_ids = set()
+        for task in self._tasks.values():
+            if task.completed:
+                completed_ids.add(task.key)
+            due_start = task.due_start
+            if due_start is None:
+                continue
+            due_days.append((due_start.date(), task.key))
+            if task.completed:
+                continue
+            if task.due_datetime is not None:
+                deadlines.append((task.due_datetime, task.key))
+            else:
+                loose_deadlines.append((due_start, task.key))
+        self._deadlines.rebuild(deadlines)
+        self._loose_deadlines.rebuild(loose_deadlines)
+        self._due_days.rebuild(due_days)
+        self.stats.reset(len(self._tasks), completed_ids)
+        if self._table is not None:
+            self._table.rebuild(self._tasks.values())
+        if self._search is not None:
+            # The saved index is only reused if it was saved against the storage just loaded
+            saved = SearchIndex.load(self._search_filename, self._storage_signature)
+            if saved is None or len(saved) != len(self._tasks):
+                saved = SearchIndex()
+                saved.rebuild(self._tasks.values())
+            with self._search_lock:
+                self._search = saved
+    
+    def _index_task(self, task: Task):
+        self._unindex_task(task.key)
+        self.stats.set_completed(task.key, task.completed)
+        if self._table is not None:
+            self._table.upsert(task)
+        if self._search is not None:
+            with self._search_lock:
+                self._search.add(task)
+        due_start = task.due_start
+        if due_start is None:
+            return
+        self._due_days.add(task.key, due_start.date())
+        self.stats.due_day_added(due_start.date())
+        if task.completed:
+            return
+        if task.due_datetime is not None:
+            self._deadlines.add(task.key, task.due_datetime)
+            self.stats.deadline_added(task.due_datetime)
+        else:
+            self._loose_deadlines.add(task.key, due_start)
+    
+    def _unindex_task(self, key: TaskKey):
+        due_datetime = self._deadlines.discard(key)
+        if due_datetime is not None:
+            self.stats.deadline_removed(due_datetime)
+        due_day = self._due_days.discard(key)
+        if due_day is not None:
+            self.stats.due_day_removed(due_day)
+        self._loose_deadlines.discard(key)
+    
+    def _insert_task(self, task: Task, persist: bool = True):
+        self._tasks[task.key] = task
+        self._positions[task.key] = self._next_position
+        self._next_position += 1
+        self.stats.total += 1
+        self._index_task(task)
+        if persist:
+            self._save_task(task)
+        self._emit(TaskEvent(TASK_ADDED, task))
+    
+    def _save_tasks(self, keys: Iterable[TaskKey] = (), deleted_ids: Iterable[str] = ()) -> bool:
+        # Writes a full snapshot. If another process saved since this manager last read the file,
+        # its tasks are written instead with the local changes (``keys``, ``deleted_ids``) applied
+        # on top, so neither side loses edits; True is returned and sync() merges the rest into
+        # memory. The in-memory tasks are only read, so the persistence worker can call this.
+        self._finish_loading()
+        with self._writing() as in_sync:
+            if in_sync:
+                task_dicts = [task.to_dict() for task in list(self._tasks.values())]
+            else:
+                merged = {task_key(task_dict.get('id')): task_dict for task_dict in self.file_handler.load_tasks()}
+                for key in keys:
+                    task = self._tasks.get(key)
+                    if task is not None:
+                        merged[key] = task.to_dict()
+                for task_id in deleted_ids:
+                    merged.pop(task_key(task_id), None)
+                task_dicts = list(merged.values())
+            self.file_handler.save_tasks(task_dicts)
+        return not in_sync
+    
+    @contextmanager
+    def _writing(self):
+        # Holds the storage lock across a write and yields whether storage still matched memory
+        # beforehand. Only then does the write's signature become the known one; otherwise the
+        # other process's changes are still waiting for sync().
+        with self.file_handler.lock:
+            in_sync = self.file_handler.signature() == self._storage_signature
+            yield in_sync
+            if in_sync:
+                self._storage_signature = self.file_handler.signature()
+    
+    def _save_task(self, task: Task):
+        self._save_changes([task], [])
+    
+    def _save_deleted_task(self, task_id: str):
+        self._save_changes([], [task_id])
+    
+    def _save_changes(self, tasks: List[Task], deleted_ids: List[str]):
+        if self._persistence is not None:
+            with self._pending_lock:
+                self._pending_keys.update(dict.fromkeys(task.key for task in tasks))
+                self._pending_deletes.extend(deleted_ids)
+                if not self.file_handler.incremental:
+                    self._snapshot_pending = True
+            self._persistence.mark_dirty()
+            return
+        
+        if self.file_handler.incremental:
+            with self._writing() as in_sync:
+                if tasks:
+                    self.file_handler.upsert_tasks([task.to_dict() for task in tasks])
+                if deleted_ids:
+                    self.file_handler.delete_tasks(deleted_ids)
+            merged = not in_sync
+        else:
+            merged = self._save_tasks([task.key for task in tasks], deleted_ids)
+        if merged:
+            self.sync()
+    
+    def _write_pending(self):
+        # Runs on the persistence worker. Takes the queued changes, then writes them without
+        # holding any lock the UI thread needs; on failure they are queued again.
+        with self._pending_lock:
+            if self._snapshot_pending and self._loader is not None:
+                # The snapshot must wait for the load; _load_batch re-arms the save when it ends
+                return
+            keys, self._pending_keys = self._pending_keys, {}
+            deleted_ids, self._pending_deletes = self._pending_deletes, []
+            snapshot, self._snapshot_pending = self._snapshot_pending, False
+            self._keys_in_flight = keys
+            self._deletes_in_flight = deleted_ids
+        
+        try:
+            if self.file_handler.incremental:
+                tasks = [task for task in map(self._tasks.get, keys) if task is not None]
+                with self._writing():
+                    if tasks:
+                        self.file_handler.upsert_tasks([task.to_dict() for task in tasks])
+                    if deleted_ids:
+                        self.file_handler.delete_tasks(deleted_ids)
+            if snapshot:
+                self._save_tasks(keys, deleted_ids)
+        except Exception:
+            with self._pending_lock:
+                self._pending_keys = {**keys, **self._pending_keys}
+                self._pending_deletes[:0] = deleted_ids
+                self._snapshot_pending = self._snapshot_pending or snapshot
+            raise
+        finally:
+            with self._pending_lock:
+                self._keys_in_flight = {}
+                self._deletes_in_flight = []
+    
+    def _has_unsaved_changes(self) -> bool:
+        with self._pending_lock:
+            return bool(self._pending_keys or self._pending_deletes or self._snapshot_pending
+                        or self._keys_in_flight or self._deletes_in_flight)
     
-    def _load_tasks(self) -> List[Task]:
-        task_dicts = self.file_handler.load_tasks()
-        return [Task.from_dict(task_dict) for task_dict in task_dicts]
+    def sync(self, blocking: bool = True) -> bool:
+        # Merges in what other processes saved since this manager last read or wrote its storage.
+        # Only changed tasks are touched, each with its own event, and tasks whose local changes
+        # autosave still has queued or is writing keep the local version. Returns whether
+        # anything changed; with ``blocking`` off it returns False at once while another process
+        # holds the lock.
+        changes = self.read_changes(blocking)
+        return changes is not None and self._merge_changes(changes)
     
-    def _save_tasks(self):
-        task_dicts = [task.to_dict() for task in self.tasks]
-        self.file_handler.save_tasks(task_dicts)
+    def read_changes(self, blocking: bool = True) -> Optional[StorageChanges]:
+        # The reading and parsing half of sync(), safe on a worker thread; apply_changes() merges
+        # the result. None while loading or, with ``blocking`` off, while another process holds
+        # the lock.
+        if self._loader is not None:
+            return None
+        # Taken before reading, so a change the worker writes meanwhile is still protected: the
+        # version read may predate that write
+        with self._pending_lock:
+            protected = set(self._pending_keys)
+            protected.update(self._keys_in_flight)
+            protected.update(task_key(task_id) for task_id in self._pending_deletes + self._deletes_in_flight)
+        base = self._storage_signature
+        changes = self.file_handler.changes_since(base, blocking)
+        if changes is None:
+            return None
+        signature, task_dicts, deleted_ids = changes
+        return StorageChanges(base, signature, [Task.from_dict(task_dict) for task_dict in task_dicts],
+                              deleted_ids, protected)
+    
+    def apply_changes(self, changes: StorageChanges) -> bool:
+        # Merges changes read on another thread. They are dropped when this manager has read or
+        # written storage since, or storage has moved on, as tasks changed here meanwhile could
+        # be missing from them; the next read catches up.
+        if changes.base != self._storage_signature or self._loader is not None:
+            return False
+        if self.file_handler.signature() != changes.signature:
+            return False
+        return self._merge_changes(changes)
+    
+    def _merge_changes(self, changes: StorageChanges) -> bool:
+        with self._pending_lock:
+            protected = set(changes.protected)
+            protected.update(self._pending_keys)
+            protected.update(self._keys_in_flight)
+            protected.update(task_key(task_id) for task_id in self._pending_deletes + self._deletes_in_flight)
+        
+        changed = False
+        with self.batch():
+            seen = set()
+            for incoming in changes.tasks:
+                seen.add(incoming.key)
+                if incoming.key in protected:
+                    continue
+                task = self._tasks.get(incoming.key)
+                if task is None:
+                    self._insert_task(incoming, persist=False)
+                    changed = True
+                elif self._merge_task(task, incoming):
+                    changed = True
+            
+            if changes.deleted_ids is None:
+                deleted_keys = [key for key in self._tasks if key not in seen]
+            else:
+                deleted_keys = [task_key(task_id) for task_id in changes.deleted_ids]
+            for key in deleted_keys:
+                if key in protected:
+                    continue
+                task = self._remove_task(key)
+                if task is not None:
+                    self._emit(TaskEvent(TASK_DELETED, task))
+                    changed = True
+        # Recorded last, so an in-sync snapshot never goes out before memory has caught up
+        self._storage_signature = changes.signature
+        return changed
+    
+    def _merge_task(self, task: Task, incoming: Task) -> bool:
+        # Updates ``task`` in place, keeping the object callers already hold
+        old, new = task.to_dict(), incoming.to_dict()
+        changes = {field: (old[field], new[field]) for field in new if field != 'id' and old[field] != new[field]}
+        if not changes:
+            return False
+        for field, (_, value) in changes.items():
+            setattr(task, field, value)
+        self._index_task(task)
+        kind = TASK_COMPLETED if 'completed' in changes and task.completed else TASK_UPDATED
+        self._emit(TaskEvent(kind, task, changes=changes))
+        return True
+    
+    @property
+    def save_error(self) -> Optional[Exception]:
+        # The last background save failure, cleared by the next successful save
+        return self._persistence.last_error if self._persistence is not None else None
+    
+    def flush(self):
+        # Writes out everything autosave still has queued
+        if self._persistence is not None:
+            self._finish_loading()
+            self._persistence.flush()
     
     def add_task_from_text(self, input_text: str) -> Task:
         try:
             parsed_data = self.nlp_parser.parse_task(input_text)
-            
-            task = Task(
-                task_name=parsed_data.get('task_name') or 'New task',
-                due_date=parsed_data.get('due_date'),
-                due_time=parsed_data.get('due_time'),
-                priority=parsed_data.get('priority') or 'Medium'
-            )
-            
-            self.tasks.append(task)
-            self._save_tasks()
+            task = self._task_from_parsed(parsed_data)
+            self._insert_task(task)
             return task
             
         except Exception as e:
             raise TaskParsingError(f"Failed to create task from input: {str(e)}")
     
+    def parse_task_text(self, input_text: str) -> Dict[str, Optional[str]]:
+        # The parsing half of add_task_from_text. It does not touch the tasks, so a GUI can run it
+        # on a worker thread and hand the result to add_parsed_task on its own thread.
+        try:
+            return self.nlp_parser.parse_task(input_text)
+        except Exception as e:
+            raise TaskParsingError(f"Failed to create task from input: {str(e)}")
+    
+    def add_parsed_task(self, parsed_data: Dict[str, Optional[str]]) -> Task:
+        task = self._task_from_parsed(parsed_data)
+        self._insert_task(task)
+        return task
+    
+    def add_tasks_from_text(self, lines: Iterable[str], processes: Optional[int] = None
+                            ) -> Tuple[List[Task], List[Tuple[int, str, str]]]:
+        # Bulk import: blank lines are skipped, unparseable ones are reported as
+        # (line number, line, error) and every new task is persisted in a single write.
+        tasks = []
+        errors = []
+        # Lines handed to the parser but not yet answered; results come back in order
+        in_flight = deque()
+        
+        def non_blank_lines():
+            for number, line in enumerate(lines, 1):
+                line = line.strip()
+                if line:
+                    in_flight.append((number, line))
+                    yield line
+        
+        parsed_lines = self.nlp_parser.parse_many(non_blank_lines(), processes=processes)
+        with self.batch():
+            for _, parsed_data, error in parsed_lines:
+                number, line = in_flight.popleft()
+                if error:
+                    errors.append((number, line, error))
+                    continue
+                task = self._task_from_parsed(parsed_data)
+                self._insert_task(task, persist=False)
+                tasks.append(task)
+            
+            if tasks:
+                self._save_changes(tasks, [])
+        
+        return tasks, errors
+    
+    def add_tasks_from_file(self, source: Union[str, TextIO], processes: Optional[int] = None
+                            ) -> Tuple[List[Task], List[Tuple[int, str, str]]]:
+        # ``source`` is a path, '-' for stdin, or an open text stream
+        if source == '-':
+            return self.add_tasks_from_text(sys.stdin, processes)
+        if isinstance(source, str):
+            try:
+                with open(source, 'r', encoding='utf-8') as file:
+                    return self.add_tasks_from_text(file, processes)
+            except OSError as e:
+                raise FileOperationError(f"Failed to read {source}: {str(e)}")
+        return self.add_tasks_from_text(source, processes)
+    
+    def _task_from_parsed(self, parsed_data: Dict[str, Optional[str]]) -> Task:
+        return Task(
+            task_name=parsed_data.get('task_name') or 'New task',
+            due_date=parsed_data.get('due_date'),
+            due_time=parsed_data.get('due_time'),
+            priority=parsed_data.get('priority') or 'Medium'
+        )
+    
     def add_task(self, task_name: str, due_date: Optional[str] = None, due_time: Optional[str] = None, 
                 priority: str = "Medium") -> Task:
         task = Task(
@@ -108,82 +811,201 @@ class TaskManager:
             priority=priority
         )
         
-        self.tasks.append(task)
-        self._save_tasks()
+        self._insert_task(task)
         return task
     
     def get_task(self, task_id: str) -> Task:
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
+        task = self._tasks.get(task_key(task_id))
+        if task is not None:
+            return task
         raise TaskNotFoundError(f"Task with ID {task_id} not found")
     
     def update_task(self, task_id: str, **kwargs) -> Task:
         task = self.get_task(task_id)
+        changes = {}
         
         for key, value in kwargs.items():
-            if hasattr(task, key):
+            if key in EDITABLE_FIELDS:
+                old_value = getattr(task, key)
                 setattr(task, key, value)
+                if old_value != value:
+                    changes[key] = (old_value, value)
         
-        self._save_tasks()
+        self._index_task(task)
+        self._save_task(task)
+        if changes:
+            self._emit(TaskEvent(TASK_UPDATED, task, changes=changes))
         return task
     
     def delete_task(self, task_id: str):
-        self.tasks = [task for task in self.tasks if task.id != task_id]
-        self._save_tasks()
+        task = self._remove_task(task_key(task_id))
+        self._save_deleted_task(task_id)
+        if task is not None:
+            self._emit(TaskEvent(TASK_DELETED, task))
+    
+    def _remove_task(self, key: TaskKey) -> Optional[Task]:
+        task = self._tasks.pop(key, None)
+        if task is not None:
+            # Tasks read by a load still running get their positions when it finishes
+            self._positions.pop(key, None)
+            self.stats.total -= 1
+            self.stats.set_completed(task.key, False)
+            self._unindex_task(task.key)
+            if self._table is not None:
+                self._table.remove(task.key)
+            if self._search is not None:
+                with self._search_lock:
+                    self._search.remove(task.key)
+        return task
     
     def complete_task(self, task_id: str) -> Task:
         task = self.get_task(task_id)
+        changes = {'completed': (task.completed, True), 'completed_at': (task.completed_at, None)}
         task.completed = True
         task.completed_at = datetime.now().isoformat()
-        self._save_tasks()
+        changes['completed_at'] = (changes['completed_at'][0], task.completed_at)
+        self._index_task(task)
+        self._save_task(task)
+        self._emit(TaskEvent(TASK_COMPLETED, task, changes=changes))
         return task
     
     def get_all_tasks(self) -> List[Task]:
-        return self.tasks.copy()
+        return list(self._tasks.values())
+    
+    def _indexed_store(self):
+        # Storage answers queries only while it holds every change; with autosave writes still
+        # queued or being written, queries are answered from memory instead
+        if not getattr(self.file_handler, 'indexed', False) or self._has_unsaved_changes():
+            return None
+        return self.file_handler
+    
+    def _tasks_for_ids(self, task_ids: List[str]) -> List[Task]:
+        return self._tasks_for_keys([task_key(task_id) for task_id in task_ids])
+    
+    def _tasks_in_order(self, keys: List[TaskKey]) -> List[Task]:
+        # Deadline index hits come in deadline order; results keep the task list's order instead
+        keys.sort(key=self._positions.__getitem__)
+        return self._tasks_for_keys(keys)
+    
+    def _tasks_for_keys(self, keys: List[TaskKey]) -> List[Task]:
+        tasks = map(self._tasks.get, keys)
+        return [task for task in tasks if task is not None]
     
     def get_pending_tasks(self) -> List[Task]:
-        return [task for task in self.tasks if not task.completed]
+        # No column-store path: building the result costs about as much as this loop (see TaskTable)
+        store = self._indexed_store()
+        if store:
+            return self._tasks_for_ids(store.ids_by_completed(False))
+        return [task for task in self._tasks.values() if not task.completed]
     
     def get_completed_tasks(self) -> List[Task]:
-        return [task for task in self.tasks if task.completed]
+        store = self._indexed_store()
+        if store:
+            return self._tasks_for_ids(store.ids_by_completed(True))
+        return [task for task in self._tasks.values() if task.completed]
     
     def get_overdue_tasks(self) -> List[Task]:
-        return [task for task in self.tasks if task.is_overdue()]
+        return self._tasks_in_order(self._deadlines.keys_between(None, datetime.now()))
     
     def get_today_tasks(self) -> List[Task]:
-        return [task for task in self.tasks if task.is_due_today()]
+        today = datetime.now().date()
+        return self._tasks_in_order(self._due_days.keys_between(today, today + timedelta(days=1)))
     
     def get_upcoming_tasks(self, days: int = 7) -> List[Task]:
         cutoff_date = datetime.now() + timedelta(days=days)
-        upcoming_tasks = []
-        
-        for task in self.tasks:
-            if task.completed or not task.due_date:
-                continue
-            
-            try:
-                due_date = datetime.fromisoformat(task.due_date)
-                if due_date <= cutoff_date:
-                    upcoming_tasks.append(task)
-            except (ValueError, TypeError):
-                continue
-        
-        return upcoming_tasks
+        # Deadline keys never precede the start of their due date, so this bound covers every candidate
+        day_after_cutoff = datetime.combine(cutoff_date.date() + timedelta(days=1), datetime.min.time())
+        keys = self._deadlines.keys_between(None, day_after_cutoff)
+        keys += self._loose_deadlines.keys_between(None, day_after_cutoff)
+        candidates = self._tasks_in_order(keys)
+        return [task for task in candidates if task.due_start <= cutoff_date]
     
-    def search_tasks(self, query: str) -> List[Task]:
+    def search_tasks(self, query: str, limit: Optional[int] = None) -> List[Task]:
+        # Safe to call from a background thread while this manager is edited on another one
+        if self._search is not None and self._loader is None:
+            with self._search_lock:
+                keys = self._search.search(query, limit)
+            return self._tasks_for_keys(keys)
         query_lower = query.lower()
-        return [task for task in self.tasks 
-                if query_lower in task.task_name.lower()]
+        return [task for task in list(self._tasks.values()) 
+                if query_lower in task.task_name.lower()][:limit]
+    
+    def search_tasks_ranked(self, query: str, limit: Optional[int] = None) -> List[Task]:
+        # Tasks with a word starting with each query word, best matches first
+        if self._search is not None and self._loader is None:
+            with self._search_lock:
+                keys = self._search.search_ranked(query, limit)
+        else:
+            index = SearchIndex()
+            index.rebuild(list(self._tasks.values()))
+            keys = index.search_ranked(query, limit)
+        return self._tasks_for_keys(keys)
     
     def get_tasks_by_priority(self, priority: str) -> List[Task]:
-        return [task for task in self.tasks if task.priority == priority]
+        if self._table is not None:
+            return self._table.tasks_where(priority=priority)
+        store = self._indexed_store()
+        if store:
+            return self._tasks_for_ids(store.ids_by_priority(priority))
+        return [task for task in self._tasks.values() if task.priority == priority]
+    
+    def count_tasks(self, completed: Optional[bool] = None, priority: Optional[str] = None) -> int:
+        if self._table is not None:
+            return self._table.count_where(completed, priority)
+        return sum(1 for task in self._tasks.values()
+                   if (completed is None or task.completed == completed)
+                   and (priority is None or task.priority == priority))
+    
+    def count_tasks_by(self, field: str, completed: Optional[bool] = None) -> Dict[Any, int]:
+        # Group-by counts over 'priority', 'completed' or 'due_date' (undated tasks are left out)
+        if self._table is not None:
+            return self._table.count_by(field, completed)
+        if field not in ('priority', 'completed', 'due_date'):
+            raise ValueError(f"Cannot group tasks by {field}")
+        
+        counts: Dict[Any, int] = {}
+        for task in self._tasks.values():
+            if completed is not None and task.completed != completed:
+                continue
+            if field == 'due_date':
+                if task.due_start is None:
+                    continue
+                value = task.due_start.date().isoformat()
+            else:
+                value = getattr(task, field)
+            counts[value] = counts.get(value, 0) + 1
+        if field == 'due_date':
+            counts = dict(sorted(counts.items()))
+        return counts
     
     def get_task_stats(self) -> Dict[str, int]:
-        return {
-            'total': len(self.tasks),
-            'pending': len(self.get_pending_tasks()),
-            'completed': len(self.get_completed_tasks()),
-            'overdue': len(self.get_overdue_tasks()),
-            'due_today': len(self.get_today_tasks())
-        }
\ No newline at end of file
+        return self.stats.as_dict()
+    
+    def backup_tasks(self) -> str:
+        self.flush()
+        return self.file_handler.backup_tasks()
+    
+    def restore_from_backup(self, backup_filename: str):
+        # Queued writes go out first so none of them lands on top of the restored tasks
+        self.flush()
+        self.file_handler.restore_from_backup(backup_filename)
+        self.reload()
+    
+    def close(self):
+        if self._persistence is not None:
+            self._finish_loading()
+            self._persistence.close()
+        if self._search is not None and self._loader is None:
+            self._save_search_index()
+        self.file_handler.close()
+    
+    def _save_search_index(self):
+        # Only when storage holds exactly the tasks in memory; the index is a cache, so a failed
+        # save just means a rebuild on the next start
+        signature = self.file_handler.signature()
+        if signature != self._storage_signature:
+            return
+        try:
+            self._search.save(self._search_filename, signature)
+        except OSError:
+            pass
\ No newline at end of file
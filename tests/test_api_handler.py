@@ -0,0 +1,178 @@
+import importlib.util
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from api_handler import APIHandler, CircuitBreaker
+
+needs_requests = pytest.mark.skipif(importlib.util.find_spec("requests") is None,
+                                    reason="APIHandler fetches with requests")
+
+class StubHandler(BaseHTTPRequestHandler):
+    
+    # /fast answers at once, /slow after ``slow_delay`` and /flaky with a 500 while ``failing``;
+    # every quote is numbered so the cache does not drop it as a repeat
+    
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.clients.add(self.client_address)
+            server.served += 1
+            number = server.served
+        if self.path == "/slow":
+            time.sleep(server.slow_delay)
+        if self.path == "/flaky" and server.failing:
+            self.send_error(500)
+            return
+        body = json.dumps([{'q': f"Quote {number} from {self.path}", 'a': "Stub"}]).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    stub = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    stub.daemon_threads = True
+    stub.lock = threading.Lock()
+    stub.hits = {}
+    stub.clients = set()
+    stub.served = 0
+    stub.slow_delay = 1.0
+    stub.failing = True
+    stub.url = lambda path: f"http://127.0.0.1:{stub.server_address[1]}{path}"
+    thread = threading.Thread(target=stub.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+@needs_requests
+def test_session_keeps_one_connection_and_prefers_the_fastest(server):
+    handler = APIHandler([server.url("/slow"), server.url("/fast")], read_timeout=2)
+    server.slow_delay = 0.2
+    try:
+        assert "/slow" in handler._get_quote_sync()
+        # Not measured yet, so tried next
+        assert "/fast" in handler._get_quote_sync()
+        for _ in range(3):
+            assert "/fast" in handler._get_quote_sync()
+        assert handler.endpoints_by_latency()[0] == server.url("/fast")
+        assert server.hits == {"/slow": 1, "/fast": 4}
+        # Keep-alive: both endpoints are on one host, so every request went over one connection
+        assert len(server.clients) == 1
+    finally:
+        handler.close()
+
+@needs_requests
+@pytest.mark.parametrize("fetch_mode", ["hedge", "race"])
+def test_slow_endpoint_is_overtaken(server, fetch_mode):
+    handler = APIHandler([server.url("/slow"), server.url("/fast")], read_timeout=2, fetch_mode=fetch_mode)
+    slow, fast = server.url("/slow"), server.url("/fast")
+    for _ in range(10):
+        handler.record_latency(slow, 0.05)
+        handler.record_latency(fast, 0.1)
+    # Failures rank an endpoint down but leave its hedge deadline alone
+    handler.record_failure(fast)
+    handler.record_failure(fast)
+    assert handler.endpoints_by_latency() == [slow, fast]
+    assert (handler.hedge_delay(slow), handler.hedge_delay(fast)) == (0.05, 0.1)
+    try:
+        start = time.perf_counter()
+        quote = handler._get_quote_sync()
+        assert "/fast" in quote
+        assert time.perf_counter() - start < server.slow_delay / 2
+        assert server.hits["/slow"] == 1
+    finally:
+        handler.close()
+
+@needs_requests
+def test_failing_endpoint_opens_goes_half_open_and_closes(server):
+    flaky = server.url("/flaky")
+    handler = APIHandler([flaky])
+    breaker = handler.breakers[flaky] = CircuitBreaker(failure_threshold=2, reset_timeout=0.2)
+    try:
+        assert handler._fetch_quote() is None
+        assert handler._fetch_quote() is None
+        assert breaker.state == 'open'
+        # Skipped while open, without a request
+        assert handler._fetch_quote() is None
+        assert server.hits["/flaky"] == 2
+        
+        time.sleep(0.25)
+        assert breaker.state == 'half-open'
+        assert handler._fetch_quote() is None
+        assert server.hits["/flaky"] == 3
+        assert breaker.state == 'open'
+        
+        server.failing = False
+        time.sleep(0.45)
+        assert "/flaky" in handler._fetch_quote()
+        assert breaker.state == 'closed'
+        assert handler.hedge_delay(flaky) < 0.4
+    finally:
+        handler.close()
+
+def test_breaker_admits_one_trial_and_backs_off_only_when_it_fails():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    
+    others = []
+    assert breaker.allow()
+    thread = threading.Thread(target=lambda: (others.append(breaker.allow()), breaker.record_failure()))
+    thread.start()
+    thread.join()
+    # Refused while the trial is out, and its own failure does not extend the open period
+    assert others == [False]
+    assert breaker._open_for == 0.05
+    
+    breaker.record_failure()
+    assert breaker._open_for == 0.1
+    assert not breaker.allow()
+    time.sleep(0.11)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow() and breaker.allow()
+
+@needs_requests
+def test_cache_serves_prefetched_quotes_and_saved_ones_offline(server, tmp_path):
+    cache_filename = str(tmp_path / "quote_cache.json")
+    handler = APIHandler([server.url("/fast")], cache_filename=cache_filename, cache_size=3)
+    try:
+        wait_until(lambda: len(handler.cache) == 3)
+        fetched = server.hits["/fast"]
+        quote = handler.get_motivational_quote()
+        assert quote.startswith("Quote ") and "/fast" in quote
+        # Taking one triggers a refill in the background, not a fetch on the caller
+        wait_until(lambda: len(handler.cache) == 3)
+        assert server.hits["/fast"] == fetched + 1
+    finally:
+        handler.close()
+    saved = json.load(open(cache_filename, encoding='utf-8'))
+    assert len(saved) == 3 and quote not in saved
+    
+    # A later start with every endpoint down serves the quotes saved by the earlier one
+    offline = APIHandler([server.url("/flaky")], cache_filename=cache_filename, cache_size=3)
+    try:
+        assert [offline.get_motivational_quote() for _ in saved] == saved
+        assert offline.get_motivational_quote() in offline.fallback_quotes
+    finally:
+        offline.close()
\ No newline at end of file
@@ -0,0 +1,82 @@
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from task_manager import TaskManager
+
+@pytest.mark.parametrize("storage", ["json", "journal", "sqlite"])
+def test_queries_see_changes_autosave_has_not_written(tmp_path, storage):
+    manager = TaskManager(str(tmp_path / "tasks.json"), storage=storage, autosave=True,
+                          debounce=60, max_latency=60)
+    try:
+        first = manager.add_task("Write report", priority="High")
+        second = manager.add_task("Call mom", priority="Low")
+        manager.complete_task(first.id)
+        
+        assert [task.id for task in manager.get_pending_tasks()] == [second.id]
+        assert [task.id for task in manager.get_completed_tasks()] == [first.id]
+        assert [task.id for task in manager.get_tasks_by_priority("Low")] == [second.id]
+        
+        manager.flush()
+        assert [task.id for task in manager.get_pending_tasks()] == [second.id]
+        assert [task.id for task in manager.get_completed_tasks()] == [first.id]
+    finally:
+        manager.close()
+
+@pytest.mark.parametrize("storage", ["json", "sqlite"])
+def test_sync_keeps_a_change_the_worker_is_writing(tmp_path, storage):
+    filename = str(tmp_path / "tasks.json")
+    setup = TaskManager(filename, storage=storage)
+    task_id = setup.add_task("Draft").id
+    setup.close()
+    
+    manager = TaskManager(filename, storage=storage, autosave=True, debounce=60, max_latency=60)
+    other = TaskManager(filename, storage=storage)
+    try:
+        other.update_task(task_id, task_name="External")
+        manager.update_task(task_id, task_name="Local")
+        
+        # Stop the worker after it has taken the change but before it holds the storage lock
+        taken, resume = threading.Event(), threading.Event()
+        writing = manager._writing
+        
+        @contextmanager
+        def paused_writing():
+            taken.set()
+            resume.wait(5)
+            with writing() as in_sync:
+                yield in_sync
+        
+        manager._writing = paused_writing
+        worker = threading.Thread(target=manager._write_pending)
+        worker.start()
+        assert taken.wait(5)
+        manager.sync()
+        resume.set()
+        worker.join(5)
+        
+        assert manager.get_task(task_id).task_name == "Local"
+        other.sync()
+        assert other.get_task(task_id).task_name == "Local"
+    finally:
+        other.close()
+        manager.close()
+
+@pytest.mark.parametrize("storage", ["json", "journal", "sqlite"])
+def test_changes_read_off_thread_are_dropped_after_a_local_write(tmp_path, storage):
+    filename = str(tmp_path / "tasks.json")
+    manager = TaskManager(filename, storage=storage)
+    other = TaskManager(filename, storage=storage)
+    try:
+        other.add_task("External")
+        changes = manager.read_changes()
+        # Written while the read was on its way back: missing from what it found in storage
+        manager.add_task("Local")
+        assert not manager.apply_changes(changes)
+        
+        manager.apply_changes(manager.read_changes())
+        assert sorted(task.task_name for task in manager.get_all_tasks()) == ["External", "Local"]
+    finally:
+        other.close()
+        manager.close()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import todo_cli
+from task_manager import TaskManager
+from todo_cli import TaskDaemon, default_socket, send_request
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="the daemon needs Unix sockets")
+
+def run(capsys, filename, *args):
+    assert todo_cli.main(['--file', filename, '--json', *args]) == 0
+    return json.loads(capsys.readouterr().out)
+
+def round_trip(capsys, filename):
+    added = run(capsys, filename, 'add', 'Submit report by Friday high priority')
+    run(capsys, filename, 'add', 'Call mom')
+    assert added['task_name'] == 'Submit report' and added['priority'] == 'High'
+    
+    completed = run(capsys, filename, 'complete', added['id'])
+    assert completed['completed']
+    assert [task['task_name'] for task in run(capsys, filename, 'list', '--filter', 'pending')] == ['Call mom']
+    assert [task['id'] for task in run(capsys, filename, 'search', 'REPORT')] == [added['id']]
+    stats = run(capsys, filename, 'stats')
+    assert (stats['total'], stats['pending'], stats['completed']) == (2, 1, 1)
+
+def test_commands_round_trip_without_a_daemon(tmp_path, capsys):
+    filename = str(tmp_path / "tasks.json")
+    round_trip(capsys, filename)
+    
+    manager = TaskManager(filename)
+    assert sorted(task.task_name for task in manager.get_all_tasks()) == ['Call mom', 'Submit report']
+    manager.close()
+
+def test_commands_round_trip_through_the_daemon(tmp_path, capsys):
+    filename = str(tmp_path / "tasks.json")
+    path = default_socket(filename)
+    daemon = subprocess.Popen([sys.executable, '-m', 'todo_cli', '--file', filename, 'daemon'], cwd=REPO,
+                              stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while send_request(path, {'command': 'ping'}) is None:
+            assert daemon.poll() is None and time.monotonic() < deadline
+            time.sleep(0.05)
+        
+        round_trip(capsys, filename)
+        assert todo_cli.main(['--file', filename, 'daemon', '--stop']) == 0
+        daemon.wait(10)
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+    
+    # The daemon's autosaved changes reach the file by the time it exits
+    assert not os.path.exists(path)
+    pending = run(capsys, filename, '--no-daemon', 'list', '--filter', 'pending')
+    assert [task['task_name'] for task in pending] == ['Call mom']
+
+def test_a_stalled_client_does_not_block_the_daemon(tmp_path):
+    filename = str(tmp_path / "tasks.json")
+    path = default_socket(filename)
+    manager = TaskManager(filename)
+    server = TaskDaemon(path, manager, request_timeout=0.2)
+    serving = threading.Thread(target=server.serve_until_stopped)
+    serving.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stalled:
+            stalled.connect(path)
+            started = time.monotonic()
+            assert send_request(path, {'command': 'ping'}) == {'result': os.getpid()}
+            assert time.monotonic() - started < 5
+            with stalled.makefile('rb') as stream:
+                assert 'error' in json.loads(stream.readline())
+    finally:
+        send_request(path, {'command': 'shutdown'})
+        serving.join(5)
+        server.server_close()
+        os.remove(path)
+        manager.close()
\ No newline at end of file
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+
+from task_manager import TaskManager
+
+def day(offset: int) -> str:
+    return (datetime.now().date() + timedelta(days=offset)).isoformat()
+
+def test_deadline_queries_keep_list_order(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    manager.add_task("Later", due_date=day(-1))
+    manager.add_task("Earlier", due_date=day(-3))
+    manager.add_task("Moved", due_date=day(3))
+    manager.add_task("Soon", due_date=day(1))
+    moved = manager.get_all_tasks()[2]
+    manager.update_task(moved.id, due_date=day(-5))
+    
+    assert [task.task_name for task in manager.get_overdue_tasks()] == ["Later", "Earlier", "Moved"]
+    assert [task.task_name for task in manager.get_upcoming_tasks()] == ["Later", "Earlier", "Moved", "Soon"]
+    
+    reopened = TaskManager(str(tmp_path / "tasks.json"))
+    assert [task.task_name for task in reopened.get_overdue_tasks()] == ["Later", "Earlier", "Moved"]
+
+def test_due_dates_with_an_offset_mix_with_naive_ones(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    past = datetime.now(timezone.utc) - timedelta(days=2)
+    manager.add_task("Naive", due_date=day(-1))
+    aware = manager.add_task("Aware", due_date=past.isoformat())
+    manager.add_task("Naive later", due_date=day(2))
+    
+    assert aware.due_start.tzinfo is None
+    assert aware.is_overdue()
+    assert [task.task_name for task in manager.get_overdue_tasks()] == ["Naive", "Aware"]
+    assert [task.task_name for task in manager.get_upcoming_tasks()] == ["Naive", "Aware", "Naive later"]
\ No newline at end of file
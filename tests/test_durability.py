@@ -0,0 +1,112 @@
+import os
+import shutil
+
+import pytest
+
+import durability
+from durability import DURABILITY_LEVELS, atomic_write, snapshot_file
+from task_manager import TaskManager
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    calls = []
+    real_fsync = os.fsync
+    
+    def counting_fsync(descriptor):
+        calls.append(descriptor)
+        real_fsync(descriptor)
+    
+    monkeypatch.setattr(os, 'fsync', counting_fsync)
+    return calls
+
+def no_link(monkeypatch):
+    def refuse(source, destination):
+        raise OSError("links not supported here")
+    monkeypatch.setattr(os, 'link', refuse)
+
+@pytest.mark.parametrize("level, replaced, synced", [
+    ('none', False, 0), ('flush', True, 0), ('fsync', True, 1), ('fsync+dir', True, 2)
+])
+def test_atomic_write_levels(tmp_path, fsyncs, level, replaced, synced):
+    path = str(tmp_path / "tasks.json")
+    with open(path, 'wb') as file:
+        file.write(b"old")
+    inode = os.stat(path).st_ino
+    
+    atomic_write(path, lambda file: file.write(b"new"), level)
+    with open(path, 'rb') as file:
+        assert file.read() == b"new"
+    assert (os.stat(path).st_ino != inode) == replaced
+    assert len(fsyncs) == synced
+    assert os.listdir(tmp_path) == ["tasks.json"]
+
+def test_default_saves_are_fsynced(tmp_path, fsyncs):
+    assert durability.DEFAULT_DURABILITY == 'fsync'
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    manager.add_task("Report")
+    manager.close()
+    assert fsyncs
+
+def test_linked_snapshot_survives_in_place_saves(tmp_path):
+    path, backup = str(tmp_path / "tasks.json"), str(tmp_path / "tasks.json.backup")
+    atomic_write(path, lambda file: file.write(b"saved"), 'none')
+    assert snapshot_file(path, backup) == 'link'
+    assert os.path.samefile(path, backup)
+    
+    # An in-place save breaks the link first instead of writing through to the backup
+    atomic_write(path, lambda file: file.write(b"later"), 'none')
+    with open(backup, 'rb') as file:
+        assert file.read() == b"saved"
+
+@pytest.mark.parametrize("clone, method", [(False, 'copy'), (True, 'reflink')])
+def test_snapshot_falls_back_without_links(tmp_path, monkeypatch, clone, method):
+    no_link(monkeypatch)
+    
+    class FakeFcntl:
+        # Stands in for FICLONE, which most test filesystems lack
+        @staticmethod
+        def ioctl(descriptor, request, source_descriptor):
+            if not clone:
+                raise OSError("cloning not supported here")
+            assert request == durability.FICLONE
+            with open(source_descriptor, 'rb', closefd=False) as source, \
+                    open(descriptor, 'wb', closefd=False) as destination:
+                shutil.copyfileobj(source, destination)
+    
+    monkeypatch.setattr(durability, 'fcntl', FakeFcntl)
+    path, backup = str(tmp_path / "tasks.json"), str(tmp_path / "tasks.json.backup")
+    atomic_write(path, lambda file: file.write(b"saved"))
+    for level in DURABILITY_LEVELS:
+        assert snapshot_file(path, backup, level) == method
+        assert not os.path.samefile(path, backup)
+        with open(backup, 'rb') as file:
+            assert file.read() == b"saved"
+    assert sorted(os.listdir(tmp_path)) == ["tasks.json", "tasks.json.backup"]
+
+@pytest.mark.parametrize("links", [True, False])
+@pytest.mark.parametrize("storage, file_format", [
+    ("json", "json"), ("json", "ndjson"), ("json", "binary"), ("journal", "json"), ("sqlite", "json")
+])
+def test_restore_round_trips(tmp_path, monkeypatch, storage, file_format, links):
+    if not links:
+        no_link(monkeypatch)
+    filename = str(tmp_path / "tasks.json")
+    manager = TaskManager(filename, storage=storage, file_format=file_format)
+    try:
+        manager.add_task("Report", due_date="2030-01-15", priority="High")
+        manager.complete_task(manager.add_task("Call mom").id)
+        saved = [task.to_dict() for task in manager.get_all_tasks()]
+        backup = manager.backup_tasks()
+        
+        manager.delete_task(saved[0]['id'])
+        manager.add_task("Written after the backup")
+        manager.restore_from_backup(backup)
+        assert [task.to_dict() for task in manager.get_all_tasks()] == saved
+    finally:
+        manager.close()
+    
+    reopened = TaskManager(filename, storage=storage, file_format=file_format)
+    try:
+        assert [task.to_dict() for task in reopened.get_all_tasks()] == saved
+    finally:
+        reopened.close()
\ No newline at end of file
@@ -0,0 +1,45 @@
+import json
+
+from file_handler import JournalFileHandler
+from task_manager import TaskManager
+
+def task(task_id, name):
+    return {'id': task_id, 'task_name': name, 'priority': "Medium", 'completed': False}
+
+def test_torn_tail_is_ignored_and_later_appends_survive(tmp_path):
+    filename = str(tmp_path / "tasks.json")
+    handler = JournalFileHandler(filename)
+    handler.save_tasks([task("a", "Snapshot")])
+    handler.upsert_tasks([task("b", "Acknowledged")])
+    handler.delete_tasks(["a"])
+    torn = json.dumps({'op': 'put', 'task': task("c", "Torn")}).encode('utf-8')
+    with open(handler.journal_filename, 'ab') as file:
+        file.write(torn[:len(torn) // 2])
+    
+    reopened = JournalFileHandler(filename)
+    assert reopened.load_tasks() == [task("b", "Acknowledged")]
+    
+    # The torn record gets terminated, so it cannot swallow the next one
+    reopened.upsert_tasks([task("d", "After crash")])
+    assert [record['id'] for record in reopened.load_tasks()] == ["b", "d"]
+    reopened.compact()
+    assert [record['id'] for record in JournalFileHandler(filename).load_tasks()] == ["b", "d"]
+
+def test_interrupted_compaction_with_torn_tail_replays(tmp_path):
+    filename = str(tmp_path / "tasks.json")
+    manager = TaskManager(filename, storage="journal")
+    kept = manager.add_task("Kept")
+    dropped = manager.add_task("Dropped")
+    manager.delete_task(dropped.id)
+    handler = manager.file_handler
+    # A crash after the live journal was rotated, partway through a record appended before it
+    with open(handler.journal_filename, 'ab') as file:
+        file.write(b'{"op": "put", "task": {"id": "x"')
+    handler.close()
+    (tmp_path / "tasks.json.journal").rename(tmp_path / "tasks.json.journal.old")
+    
+    reopened = TaskManager(filename, storage="journal")
+    assert [task.id for task in reopened.get_all_tasks()] == [kept.id]
+    reopened.add_task("Next")
+    reopened.file_handler.compact()
+    assert [task.task_name for task in TaskManager(filename, storage="journal").get_all_tasks()] == ["Kept", "Next"]
\ No newline at end of file
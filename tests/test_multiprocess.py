@@ -0,0 +1,67 @@
+import multiprocessing
+
+import pytest
+
+import file_lock
+from file_lock import FileLock
+from task_manager import TaskManager
+
+pytestmark = pytest.mark.skipif(file_lock.fcntl is None, reason="flock() needed to exclude processes")
+
+def hold_lock(path, locked, done):
+    with FileLock(path):
+        locked.set()
+        done.wait(10)
+
+def edit_tasks(path, storage, autosave, worker, count, results):
+    manager = TaskManager(path, storage=storage, autosave=autosave)
+    mine = []
+    for number in range(count):
+        manager.sync()
+        mine.append(manager.add_task(f"worker {worker} task {number}").id)
+        if number % 3 == 0:
+            manager.update_task(mine[-1], priority="High")
+        if number % 5 == 4:
+            manager.delete_task(mine.pop(0))
+    manager.close()
+    results.put(mine)
+
+def test_lock_excludes_other_processes(tmp_path):
+    path = str(tmp_path / "tasks.json.lock")
+    locked, done = multiprocessing.Event(), multiprocessing.Event()
+    holder = multiprocessing.Process(target=hold_lock, args=(path, locked, done))
+    holder.start()
+    try:
+        assert locked.wait(10)
+        lock = FileLock(path)
+        assert not lock.acquire(blocking=False)
+        assert not lock.acquire(shared=True, blocking=False)
+        done.set()
+        holder.join(10)
+        assert lock.acquire(blocking=False)
+        lock.release()
+        lock.close()
+    finally:
+        done.set()
+        holder.join(10)
+
+@pytest.mark.parametrize("storage", ["json", "journal", "sqlite"])
+@pytest.mark.parametrize("autosave", [False, True])
+def test_concurrent_processes_keep_every_change(tmp_path, storage, autosave):
+    path = str(tmp_path / "tasks.json")
+    TaskManager(path, storage=storage).close()
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=edit_tasks, args=(path, storage, autosave, worker, 20, results))
+               for worker in range(3)]
+    for process in workers:
+        process.start()
+    expected = sorted(task_id for _ in workers for task_id in results.get(timeout=60))
+    for process in workers:
+        process.join(10)
+        assert process.exitcode == 0
+    
+    final = TaskManager(path, storage=storage)
+    try:
+        assert sorted(task.id for task in final.get_all_tasks()) == expected
+    finally:
+        final.close()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+import nlp_parser
+from exceptions import TaskParsingError
+from nlp_parser import NLPParser
+
+# Inputs with the output of the original parser, dated as if parsed on CORPUS_NOW
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'parser_corpus.jsonl')
+
+class CorpusDateTime(datetime):
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 6, 11, 9, 30)
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+@pytest.fixture(autouse=True)
+def corpus_date(monkeypatch):
+    monkeypatch.setattr(nlp_parser, 'datetime', CorpusDateTime)
+
+@pytest.mark.parametrize("cache_size", [0, 1024, 16])
+def test_parse_task_replays_the_corpus(cache_size):
+    parser = NLPParser(cache_size=cache_size)
+    corpus = load_corpus()
+    # The second pass answers from the cache where the cache is large enough
+    for _ in range(2):
+        for case in corpus:
+            if 'error' in case:
+                with pytest.raises(TaskParsingError):
+                    parser.parse_task(case['input'])
+            else:
+                assert parser.parse_task(case['input']) == case['expected'], case['input']
+    if cache_size:
+        assert parser.cache_info()['hits'] > 0
+
+def test_cached_results_are_copies():
+    parser = NLPParser()
+    parser.parse_task("Call mom tomorrow at 10am")['task_name'] = "changed"
+    assert parser.parse_task("Call mom tomorrow at 10am")['task_name'] == "Call mom"
\ No newline at end of file
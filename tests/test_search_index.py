@@ -0,0 +1,94 @@
+import math
+import random
+import re
+
+import pytest
+
+import search_index
+from search_index import SearchIndex
+from task_manager import Task
+
+WORDS = ['call', 'email', 'review', 'reviewer', 'buy', 'write', 'Report', 'groceries', 'mom', 'ÉTÉ', 'a', 'ab']
+QUERIES = ['', 'a', 'ab', 'e', 'É', 'rev', 'review', 'e b', 'call email', 'zzz', '12', 'X-R', 'ort 1']
+RANKED_QUERIES = ['rev', 'call em', 'a', 'gro mom', 're e', 'reviewer', 'b w r', '1']
+
+def random_name(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randrange(0, 5))]
+    return ' '.join(words) + rng.choice(['', ' 12', ' x-ray', '!', f" {rng.randrange(100)}"])
+
+def scan(tasks, query):
+    return [task.key for task in tasks if query.lower() in task.task_name.lower()]
+
+def ranked_scores(tasks, query):
+    # Brute-force scores of the tasks SearchIndex.search_ranked must return
+    terms = set(re.findall(r'\w+', query.lower()))
+    task_words = [set(re.findall(r'\w+', task.task_name.lower())) for task in tasks]
+    counts = {}
+    for words in task_words:
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+    scores = {}
+    for task, words in zip(tasks, task_words):
+        weights = [[math.log(1 + len(tasks) / counts[word]) * len(term) / len(word)
+                    for word in words if word.startswith(term)] for term in terms]
+        if terms and all(weights):
+            scores[task.key] = sum(max(term_weights) for term_weights in weights)
+    return scores
+
+def check_ranked(index, tasks, query, limit=None):
+    scores = ranked_scores(tasks, query)
+    positions = {task.key: position for position, task in enumerate(tasks)}
+    result = index.search_ranked(query, limit)
+    expected = sorted(scores, key=lambda key: (-round(scores[key], 9), positions[key]))
+    assert result == expected[:limit]
+
+@pytest.fixture
+def small_compaction(monkeypatch):
+    monkeypatch.setattr(search_index, '_COMPACT_FLOOR', 20)
+
+def test_search_matches_a_substring_scan_through_edits(small_compaction):
+    rng = random.Random(7)
+    index = SearchIndex()
+    tasks = []
+    for step in range(3000):
+        roll = rng.random()
+        if roll < 0.5 or not tasks:
+            task = Task(task_name=random_name(rng))
+            tasks.append(task)
+            index.add(task)
+        elif roll < 0.8:
+            task = rng.choice(tasks)
+            task.task_name = random_name(rng)
+            index.add(task)
+        else:
+            task = tasks.pop(rng.randrange(len(tasks)))
+            index.remove(task.key)
+        
+        if step % 250 == 0:
+            for query in QUERIES:
+                expected = scan(tasks, query)
+                assert index.search(query) == expected, query
+                assert index.search(query, 3) == expected[:3], query
+            # Until compaction, word rarity still counts superseded names, so only the matches
+            # are compared here; scoring is checked against a fresh index
+            fresh = SearchIndex()
+            fresh.rebuild(tasks)
+            for query in RANKED_QUERIES:
+                assert set(index.search_ranked(query)) == set(ranked_scores(tasks, query)), query
+                check_ranked(fresh, tasks, query)
+                check_ranked(fresh, tasks, query, 5)
+
+def test_saved_index_answers_like_the_original(tmp_path):
+    rng = random.Random(3)
+    tasks = [Task(task_name=random_name(rng)) for _ in range(500)]
+    index = SearchIndex()
+    index.rebuild(tasks)
+    path = str(tmp_path / "tasks.json.index")
+    index.save(path, [1, 2])
+    
+    assert SearchIndex.load(path, [1, 3]) is None
+    loaded = SearchIndex.load(path, [1, 2])
+    for query in QUERIES:
+        assert loaded.search(query) == scan(tasks, query)
+    for query in RANKED_QUERIES:
+        check_ranked(loaded, tasks, query, 10)
\ No newline at end of file
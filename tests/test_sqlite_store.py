@@ -0,0 +1,42 @@
+import sqlite_store
+from task_manager import TaskManager
+
+def test_external_commits_change_the_signature_without_stat_changes(tmp_path, monkeypatch):
+    # Coarse mtimes: a commit in the same tick that keeps the size leaves the stat data alone
+    monkeypatch.setattr(sqlite_store, 'stat_signature', lambda path: (1, 2, 3, 4))
+    filename = str(tmp_path / "tasks.json")
+    first = TaskManager(filename, storage="sqlite", search_index=True)
+    second = TaskManager(filename, storage="sqlite")
+    try:
+        first.add_task("Write report")
+        assert second.sync()
+        task = second.get_all_tasks()[0]
+        signature = first.file_handler.signature()
+        
+        second.update_task(task.id, task_name="Write summary")
+        assert first.file_handler.signature() != signature
+        assert first.sync()
+        assert [task.task_name for task in first.search_tasks("summary")] == ["Write summary"]
+        first.close()
+        
+        # An index saved for older contents is rebuilt rather than trusted
+        second.delete_task(task.id)
+        reopened = TaskManager(filename, storage="sqlite", search_index=True)
+        assert reopened.search_tasks("summary") == []
+        reopened.close()
+    finally:
+        second.close()
+
+def test_restore_moves_the_change_counter_past_the_backup(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"), storage="sqlite")
+    store = manager.file_handler
+    try:
+        manager.add_task("Write report")
+        backup = store.backup_tasks()
+        manager.add_task("Call mom")
+        changes = store._changes()
+        store.restore_from_backup(backup)
+        assert store._changes() == changes + 1
+        assert [task['task_name'] for task in store.load_tasks()] == ["Write report"]
+    finally:
+        manager.close()
\ No newline at end of file
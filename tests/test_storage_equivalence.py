@@ -0,0 +1,62 @@
+import random
+from datetime import date, timedelta
+
+from task_manager import TaskManager
+
+STORAGES = [("json", False), ("journal", False), ("sqlite", False), ("sqlite", True)]
+PRIORITIES = ["High", "Medium", "Low", "Someday"]
+
+def apply_operations(manager, seed):
+    # The same edits for every backend; tasks are told apart by their unique names
+    rng = random.Random(seed)
+    ids = {}
+    for number in range(400):
+        roll = rng.random()
+        if roll < 0.55 or not ids:
+            due = date.today() + timedelta(days=rng.randrange(-5, 12)) if rng.random() < 0.8 else None
+            due_time = f"{rng.randrange(1, 13)}:{rng.choice(['00', '30'])} {rng.choice(['AM', 'PM'])}" if due and rng.random() < 0.5 else None
+            name = f"task {number} {rng.choice(['call', 'email', 'review'])}"
+            task = manager.add_task(name, due.isoformat() if due else None, due_time, rng.choice(PRIORITIES))
+            ids[name] = task.id
+        elif roll < 0.75:
+            name = rng.choice(sorted(ids))
+            manager.update_task(ids[name], priority=rng.choice(PRIORITIES))
+        elif roll < 0.9:
+            manager.complete_task(ids[rng.choice(sorted(ids))])
+        else:
+            name = rng.choice(sorted(ids))
+            manager.delete_task(ids.pop(name))
+
+def query_results(manager):
+    names = lambda tasks: [task.task_name for task in tasks]
+    return {
+        'all': names(manager.get_all_tasks()),
+        'pending': names(manager.get_pending_tasks()),
+        'completed': names(manager.get_completed_tasks()),
+        'overdue': names(manager.get_overdue_tasks()),
+        'today': names(manager.get_today_tasks()),
+        'upcoming': names(manager.get_upcoming_tasks()),
+        'by priority': {priority: names(manager.get_tasks_by_priority(priority)) for priority in PRIORITIES},
+        'counts': [manager.count_tasks(completed, priority) for completed in (None, False, True)
+                   for priority in [None] + PRIORITIES],
+        'group by': {field: manager.count_tasks_by(field) for field in ('priority', 'completed', 'due_date')},
+        'stats': manager.get_task_stats(),
+        'search': names(manager.search_tasks("review"))
+    }
+
+def test_every_storage_answers_queries_alike(tmp_path):
+    results = []
+    for number, (storage, columnar) in enumerate(STORAGES):
+        filename = str(tmp_path / f"tasks{number}.json")
+        manager = TaskManager(filename, storage=storage, columnar=columnar)
+        apply_operations(manager, seed=5)
+        results.append(query_results(manager))
+        manager.close()
+        
+        reopened = TaskManager(filename, storage=storage, columnar=columnar)
+        assert query_results(reopened) == results[-1], storage
+        reopened.close()
+    
+    for (storage, columnar), result in zip(STORAGES[1:], results[1:]):
+        for query in result:
+            assert result[query] == results[0][query], (storage, columnar, query)
\ No newline at end of file
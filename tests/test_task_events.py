@@ -0,0 +1,33 @@
+from task_events import TASK_COMPLETED, TASK_UPDATED
+from task_manager import TaskManager
+
+def batch_events(manager, edit):
+    events = []
+    manager.subscribe(events.extend, coalesce=True)
+    with manager.batch():
+        edit()
+    return events
+
+def test_completion_undone_in_the_same_batch_is_an_update(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task = manager.add_task("Report")
+    
+    def complete_and_undo():
+        manager.complete_task(task.id)
+        manager.update_task(task.id, completed=False, completed_at=None, task_name="Final report")
+    
+    [event] = batch_events(manager, complete_and_undo)
+    assert event.kind == TASK_UPDATED
+    assert event.changes == {'task_name': ("Report", "Final report")}
+
+def test_edit_after_a_completion_stays_a_completion(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task = manager.add_task("Report")
+    
+    def complete_and_rename():
+        manager.complete_task(task.id)
+        manager.update_task(task.id, task_name="Final report")
+    
+    [event] = batch_events(manager, complete_and_rename)
+    assert event.kind == TASK_COMPLETED
+    assert event.changes['completed'] == (False, True)
\ No newline at end of file
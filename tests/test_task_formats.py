@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from benchmark import sample_task_dicts
+from task_formats import FORMATS, detect_format, iter_records, write_records
+
+ODD_RECORDS = [
+    {'id': 'custom', 'task_name': 'x' * 300, 'priority': 'Ünïcode ☃', 'completed': 1, 'extra': [1, {'a': 2.5}]},
+    {'id': 5, 'task_name': 'nul\x00inside', 'completed': False, 'created_at': 2 ** 70},
+    {'id': 'plain', 'task_name': '\x01', 'due_date': None, 'due_time': None, 'priority': 'Low',
+     'completed': True, 'created_at': None, 'completed_at': None}
+]
+
+@pytest.mark.parametrize("format", FORMATS)
+@pytest.mark.parametrize("count", [0, 1, 2500])
+def test_records_round_trip(tmp_path, format, count):
+    tasks = sample_task_dicts(count) + ODD_RECORDS
+    path = str(tmp_path / "tasks")
+    with open(path, 'wb') as file:
+        write_records(file, tasks, format)
+    
+    assert detect_format(path) == format
+    assert list(iter_records(path)) == tasks
+    assert list(iter_records(path, chunk_size=7)) == tasks
+
+@pytest.mark.parametrize("count", [0, 1, 2500])
+def test_json_matches_json_dump(tmp_path, count):
+    tasks = sample_task_dicts(count)
+    path = tmp_path / "tasks.json"
+    with open(path, 'wb') as file:
+        write_records(file, tasks, 'json')
+    assert path.read_text(encoding='utf-8') == json.dumps(tasks, indent=2, ensure_ascii=False)
\ No newline at end of file
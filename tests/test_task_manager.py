@@ -0,0 +1,12 @@
+from datetime import datetime
+
+from task_manager import TaskManager
+
+def test_update_ignores_fields_that_are_not_editable(tmp_path):
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task = manager.add_task("Report", due_date="2030-01-15")
+    due_start = task.due_start
+    
+    manager.update_task(task.id, due_start=datetime.now(), due_datetime=None, id="other", key=b"", priority="High")
+    assert (task.due_start, task.priority) == (due_start, "High")
+    assert manager.get_task(task.id) is task
\ No newline at end of file
@@ -0,0 +1,110 @@
+import queue
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    # concurrent.futures is slow to import, so the pool is only set up by the first submit()
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+# How often queued callbacks are run while work is outstanding, and while idle
+BUSY_POLL_MS = 15
+IDLE_POLL_MS = 100
+
+class TkExecutor:
+    
+    # Runs blocking work off the Tk event loop. submit() hands a function to a thread pool, and
+    # its result or error comes back through a queue that an after() loop drains on the Tk
+    # thread, the only thread allowed to touch widgets. Other threads use call_soon() to get a
+    # callback run there. ``on_busy`` is told on the Tk thread when work starts and when the
+    # last of it finishes, so the window can show progress meanwhile.
+    
+    def __init__(self, widget, max_workers: int = 2, on_busy: Optional[Callable[[bool], None]] = None):
+        self._widget = widget
+        self._max_workers = max_workers
+        self._pool: Optional['ThreadPoolExecutor'] = None
+        self._callbacks: queue.SimpleQueue = queue.SimpleQueue()
+        self.on_busy = on_busy
+        # Submitted work not reported back yet; only touched on the Tk thread
+        self._outstanding = 0
+        self._closed = False
+        self._after_id = self._widget.after(IDLE_POLL_MS, self._drain)
+    
+    @property
+    def busy(self) -> bool:
+        return self._outstanding > 0
+    
+    def submit(self, work: Callable[..., Any], *args, on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None, background: bool = False) -> 'Future':
+        # Call from the Tk thread. ``work(*args)`` runs on the pool; ``on_done(result)`` or
+        # ``on_error(exception)`` then runs on the Tk thread. An error without on_error is raised
+        # there, where Tk reports it like any other callback error. ``background`` work, such
+        # as polling, does not make the executor busy and is picked up at the idle interval.
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="gui-work")
+        future = self._pool.submit(work, *args)
+        if not background:
+            self._outstanding += 1
+            if self._outstanding == 1:
+                self._notify_busy(True)
+                self._reschedule(BUSY_POLL_MS)
+        future.add_done_callback(
+            lambda done: self._callbacks.put((self._finish, (done, on_done, on_error, background))))
+        return future
+    
+    def call_soon(self, callback: Callable[..., Any], *args):
+        # Safe from any thread: runs ``callback(*args)`` on the Tk thread within a poll interval
+        self._callbacks.put((callback, args))
+    
+    def close(self):
+        # Drops queued callbacks; work already running finishes on its own
+        self._closed = True
+        if self._after_id is not None:
+            try:
+                self._widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+    
+    def _drain(self):
+        self._after_id = None
+        if self._closed:
+            return
+        try:
+            while True:
+                try:
+                    callback, args = self._callbacks.get_nowait()
+                except queue.Empty:
+                    break
+                callback(*args)
+        finally:
+            if not self._closed and self._after_id is None:
+                self._after_id = self._widget.after(BUSY_POLL_MS if self.busy else IDLE_POLL_MS, self._drain)
+    
+    def _reschedule(self, delay_ms: int):
+        # Brings the next drain forward when work has just been submitted
+        if self._after_id is not None:
+            self._widget.after_cancel(self._after_id)
+        self._after_id = self._widget.after(delay_ms, self._drain)
+    
+    def _finish(self, future: 'Future', on_done: Optional[Callable[[Any], None]],
+                on_error: Optional[Callable[[Exception], None]], background: bool):
+        if not background:
+            self._outstanding -= 1
+            if not self._outstanding:
+                self._notify_busy(False)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if on_done is not None:
+                on_done(future.result())
+        elif on_error is not None:
+            on_error(error)
+        else:
+            raise error
+    
+    def _notify_busy(self, busy: bool):
+        if self.on_busy is not None:
+            self.on_busy(busy)
\ No newline at end of file
@@ -0,0 +1,318 @@
+import json
+import os
+import socket
+import socketserver
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+from exceptions import FileOperationError, TaskNotFoundError, TaskParsingError
+
+# Command line for scripts: python -m todo_cli add "Call mom tomorrow at 10am". Every command
+# runs against a local daemon when one is listening on the task file's socket (see serve),
+# which keeps the tasks loaded between calls; otherwise the task file is loaded for just this
+# command. TaskManager is only imported on that local path, so talking to the daemon stays cheap.
+
+FILTERS = ('all', 'pending', 'completed', 'overdue', 'today')
+
+# Largest request line the daemon reads (imports send every line of their source)
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+# How long a client waits for the daemon to accept a connection
+CONNECT_TIMEOUT = 1.0
+# How long the daemon waits on a stalled client, which holds up every other one meanwhile
+REQUEST_TIMEOUT = 5.0
+
+def default_socket(filename: str) -> str:
+    return f"{os.path.abspath(filename)}.sock"
+
+def execute(manager, request: Dict[str, Any]) -> Any:
+    # Runs one request against ``manager``; the result is plain JSON data
+    command = request['command']
+    if command == 'add':
+        return manager.add_task_from_text(request['text']).to_dict()
+    if command == 'list':
+        getters = {
+            'all': manager.get_all_tasks,
+            'pending': manager.get_pending_tasks,
+            'completed': manager.get_completed_tasks,
+            'overdue': manager.get_overdue_tasks,
+            'today': manager.get_today_tasks
+        }
+        getter = getters.get(request.get('filter', 'all'))
+        if getter is None:
+            raise ValueError(f"Unknown filter: {request['filter']}")
+        return [task.to_dict() for task in getter()]
+    if command == 'complete':
+        return manager.complete_task(request['task_id']).to_dict()
+    if command == 'search':
+        if request.get('ranked'):
+            tasks = manager.search_tasks_ranked(request['query'], request.get('limit'))
+        else:
+            tasks = manager.search_tasks(request['query'], request.get('limit'))
+        return [task.to_dict() for task in tasks]
+    if command == 'stats':
+        return manager.get_task_stats()
+    if command == 'import':
+        tasks, errors = manager.add_tasks_from_text(request['lines'], request.get('processes'))
+        return {'added': len(tasks), 'errors': [list(error) for error in errors]}
+    raise ValueError(f"Unknown command: {command}")
+
+def respond(manager, request: Dict[str, Any]) -> Dict[str, Any]:
+    # {'result': ...} or {'error': message}, the daemon's wire format
+    try:
+        return {'result': execute(manager, request)}
+    except (TaskNotFoundError, TaskParsingError, FileOperationError, ValueError) as e:
+        return {'error': str(e)}
+    except KeyError as e:
+        return {'error': f"Request is missing {e}"}
+
+def run_local(request: Dict[str, Any], filename: str, storage: str, file_format: str) -> Dict[str, Any]:
+    from task_manager import TaskManager
+    
+    try:
+        manager = TaskManager(filename, storage=storage, file_format=file_format)
+    except (FileOperationError, ValueError) as e:
+        return {'error': str(e)}
+    try:
+        return respond(manager, request)
+    finally:
+        manager.close()
+
+def send_request(path: str, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # The daemon's response, or None when no daemon is listening on ``path``. Once connected,
+    # a lost daemon is an error rather than a fallback, since the command may have run.
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(path):
+        return None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(CONNECT_TIMEOUT)
+        try:
+            connection.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError, socket.timeout):
+            return None
+        connection.settimeout(None)
+        connection.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with connection.makefile('rb') as stream:
+            line = stream.readline()
+    if not line:
+        return {'error': "The daemon closed the connection without answering"}
+    return json.loads(line)
+
+class TaskRequestHandler(socketserver.StreamRequestHandler):
+    
+    # One JSON request line in, one JSON response line out. Reads and writes give up after the
+    # server's request_timeout, since the daemon serves one client at a time.
+    
+    def setup(self):
+        self.timeout = self.server.request_timeout
+        super().setup()
+    
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline(MAX_REQUEST_BYTES))
+        except socket.timeout:
+            response = {'error': f"No request received within {self.timeout:g} seconds"}
+        except ValueError:
+            response = {'error': "Malformed request"}
+        else:
+            response = self.server.serve_request(request)
+        try:
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+        except OSError:
+            # The client left or stopped reading; the request has run either way
+            pass
+
+class TaskDaemon(socketserver.UnixStreamServer):
+    
+    # Keeps one TaskManager loaded and serves requests one at a time, so it needs no locking
+    # of its own. Before each request it merges what other processes (the GUI, local runs of
+    # this CLI) saved meanwhile. Writes go through autosave: the reply does not wait for the
+    # save, which reaches the task file within the autosave latency and at shutdown.
+    
+    def __init__(self, path: str, manager, idle_timeout: Optional[float] = None,
+                 request_timeout: float = REQUEST_TIMEOUT):
+        self.manager = manager
+        self.stopping = False
+        self.request_timeout = request_timeout
+        super().__init__(path, TaskRequestHandler)
+        # handle_request() gives up after this long without a connection
+        self.timeout = idle_timeout
+    
+    def server_bind(self):
+        # Owner-only socket: anyone who can connect can edit the tasks
+        umask = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(umask)
+    
+    def serve_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(request, dict):
+            return {'error': "Malformed request"}
+        command = request.get('command')
+        if command == 'ping':
+            return {'result': os.getpid()}
+        if command == 'shutdown':
+            self.stopping = True
+            return {'result': None}
+        try:
+            self.manager.sync()
+        except FileOperationError as e:
+            return {'error': str(e)}
+        return respond(self.manager, request)
+    
+    def handle_timeout(self):
+        self.stopping = True
+    
+    def serve_until_stopped(self):
+        while not self.stopping:
+            self.handle_request()
+
+def serve(path: str, filename: str, storage: str, file_format: str, idle_timeout: Optional[float] = None):
+    # Runs the daemon in the foreground until a shutdown request, the idle timeout, SIGTERM
+    # or Ctrl-C; queued saves are flushed on the way out
+    import signal
+    from task_manager import TaskManager
+    
+    if send_request(path, {'command': 'ping'}) is not None:
+        raise FileOperationError(f"A daemon is already listening on {path}")
+    if os.path.exists(path):
+        # Left behind by a daemon that did not shut down cleanly
+        os.remove(path)
+    
+    # Bound before the manager starts its worker threads, since the umask is process-wide
+    server = TaskDaemon(path, None, idle_timeout)
+    try:
+        server.manager = TaskManager(filename, storage=storage, file_format=file_format,
+                                     autosave=True, search_index=True)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        print(f"Serving {filename} on {path} (pid {os.getpid()})", flush=True)
+        try:
+            server.serve_until_stopped()
+        except KeyboardInterrupt:
+            pass
+    finally:
+        server.server_close()
+        os.remove(path)
+        if server.manager is not None:
+            server.manager.close()
+
+def print_tasks(tasks: List[Dict[str, Any]]):
+    for task in tasks:
+        due = " ".join(part for part in (task['due_date'], task['due_time']) if part)
+        mark = "x" if task['completed'] else " "
+        print(f"{task['id']}  [{mark}] {task['priority']:<6} {due:<16} {task['task_name']}")
+
+def print_result(command: str, result: Any):
+    if command in ('add', 'complete'):
+        print_tasks([result])
+    elif command in ('list', 'search'):
+        print_tasks(result)
+    elif command == 'stats':
+        completion_rate = result['completed'] / max(result['total'], 1) * 100
+        print(f"Total Tasks: {result['total']}")
+        print(f"Pending Tasks: {result['pending']}")
+        print(f"Completed Tasks: {result['completed']}")
+        print(f"Overdue Tasks: {result['overdue']}")
+        print(f"Due Today: {result['due_today']}")
+        print(f"Completion Rate: {completion_rate:.1f}%")
+    elif command == 'import':
+        for number, line, error in result['errors']:
+            print(f"line {number}: {error}: {line}", file=sys.stderr)
+        print(f"Added {result['added']} tasks")
+
+def read_lines(source: str) -> Iterable[str]:
+    if source == '-':
+        return sys.stdin.read().splitlines()
+    try:
+        with open(source, 'r', encoding='utf-8') as file:
+            return file.read().splitlines()
+    except OSError as e:
+        raise FileOperationError(f"Failed to read {source}: {str(e)}")
+
+def build_request(args) -> Dict[str, Any]:
+    if args.command == 'add':
+        return {'command': 'add', 'text': " ".join(args.text)}
+    if args.command == 'list':
+        return {'command': 'list', 'filter': args.filter}
+    if args.command == 'complete':
+        return {'command': 'complete', 'task_id': args.task_id}
+    if args.command == 'search':
+        return {'command': 'search', 'query': args.query, 'ranked': args.ranked, 'limit': args.limit}
+    if args.command == 'stats':
+        return {'command': 'stats'}
+    # Lines are read here, so a daemon never opens paths relative to another directory
+    return {'command': 'import', 'lines': read_lines(args.source), 'processes': args.processes}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="python -m todo_cli", description="Smart To-Do List from the command line")
+    parser.add_argument("--file", default="tasks.json", help="Task file (default: tasks.json)")
+    parser.add_argument("--storage", default="json", help="Storage backend: json, journal or sqlite")
+    parser.add_argument("--format", default="json", help="Record format written by json storage")
+    parser.add_argument("--socket", help="Daemon socket (default: the task file's path plus .sock)")
+    parser.add_argument("--no-daemon", action="store_true", help="Load the task file even if a daemon is running")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    add = subparsers.add_parser("add", help="Add a task from natural language")
+    add.add_argument("text", nargs="+")
+    
+    list_parser = subparsers.add_parser("list", help="List tasks")
+    list_parser.add_argument("--filter", choices=FILTERS, default="all")
+    
+    complete = subparsers.add_parser("complete", help="Mark a task as completed")
+    complete.add_argument("task_id")
+    
+    search = subparsers.add_parser("search", help="Find tasks by name")
+    search.add_argument("query")
+    search.add_argument("--ranked", action="store_true", help="Match word prefixes, best matches first")
+    search.add_argument("--limit", type=int)
+    
+    subparsers.add_parser("stats", help="Print task statistics")
+    
+    import_parser = subparsers.add_parser("import", help="Add one task per line of a file ('-' for stdin)")
+    import_parser.add_argument("source")
+    import_parser.add_argument("--processes", type=int)
+    
+    daemon = subparsers.add_parser("daemon", help="Keep the tasks loaded and serve commands over a Unix socket")
+    daemon.add_argument("--idle-timeout", type=float, help="Exit after this many seconds without a command")
+    daemon.add_argument("--stop", action="store_true", help="Stop the running daemon")
+    
+    args = parser.parse_args(argv)
+    path = args.socket or default_socket(args.file)
+    
+    if args.command == 'daemon':
+        if args.stop:
+            if send_request(path, {'command': 'shutdown'}) is None:
+                print(f"No daemon is listening on {path}", file=sys.stderr)
+                return 1
+            return 0
+        if not hasattr(socket, 'AF_UNIX'):
+            print("Error: Unix sockets are not available on this platform", file=sys.stderr)
+            return 1
+        try:
+            serve(path, args.file, args.storage, args.format, args.idle_timeout)
+        except (FileOperationError, ValueError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+    
+    try:
+        request = build_request(args)
+    except FileOperationError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    response = None if args.no_daemon else send_request(path, request)
+    if response is None:
+        response = run_local(request, args.file, args.storage, args.format)
+    
+    if 'error' in response:
+        print(f"Error: {response['error']}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(response['result'], indent=2, ensure_ascii=False))
+    else:
+        print_result(args.command, response['result'])
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file